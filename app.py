@@ -1,14 +1,30 @@
 # app.py
 # --- FINAL version: Robust Flask Server for GJ Terminal ---
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request, g
+from markupsafe import escape
 import sqlite3
 import os
+import re
+import json
+import base64
+import time
+import hashlib
+import functools
+import threading
+import datetime
+from collections import OrderedDict, deque
+
+import db
+import metrics
+from database_setup import JOB_SORT_EXPRESSIONS, DETAIL_COLUMNS, SEARCH_RANK_WEIGHTS, read_data_version, read_meta, changed_jobs_since
+from cutoff_trends import load_trend
 
 # --- Find project files ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'jobs.db')
 STATUS_FLAG_FILE = os.path.join(BASE_DIR, 'update_in_progress.flag')
+SCOUT_METRICS_FILE = os.path.join(BASE_DIR, 'scout_metrics.prom')  # Written by data_scout.py
 
 app = Flask(__name__)
 # Disable caching for development to ensure updates are seen immediately
@@ -17,59 +33,404 @@ app.config['TEMPLATES_AUTO_RELOAD'] = True
 
 # --- Database Connection ---
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row # Access columns by name
-    return conn
+    """Pooled read-only connection for the current request, returned to the pool at teardown."""
+    if 'db' not in g: g.db = db.get_pool(DB_PATH).acquire()
+    return g.db
+
+@app.teardown_appcontext
+def release_db_connection(exc):
+    conn = g.pop('db', None)
+    if conn is not None: db.get_pool(DB_PATH).release(conn)
+
+# --- Request Timing ---
+# Every request lands in a per-route latency histogram (route template, not the raw path, so
+# /details/<int:job_id> is one series). Set GJ_METRICS_JSONL to also log each request as JSON.
+if os.environ.get('GJ_METRICS_JSONL'): metrics.registry.open_jsonl(os.environ['GJ_METRICS_JSONL'], process='app', pid=os.getpid())
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_timing(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.observe('http_request_seconds', time.perf_counter() - started, "Request latency by route (for /events: until the stream starts).",
+                        route=request.url_rule.rule if request.url_rule else 'unmatched', method=request.method, status=response.status_code)
+    return response
+
+# --- Versioned Response Cache ---
+# Job data only changes when a writer bumps meta.data_version, so rendered pages and JSON are
+# cached for the current version (the cache empties itself when it moves) and browsers
+# revalidate with ETag / Last-Modified to get a bodiless 304.
+RESPONSE_CACHE_SIZE = 256
+
+class VersionedLRU:
+    """Bounded, thread-safe LRU of rendered responses for a single data version."""
+    def __init__(self, size: int):
+        self.size = size; self.version = None; self.entries = OrderedDict(); self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, version: int, key):
+        with self.lock:
+            if version != self.version: self.version = version; self.entries.clear()
+            entry = self.entries.get(key)
+            if entry is None: self.misses += 1; return None
+            self.entries.move_to_end(key); self.hits += 1
+            return entry
+
+    def put(self, version: int, key, entry):
+        with self.lock:
+            if version != self.version or self.size <= 0: return
+            self.entries[key] = entry; self.entries.move_to_end(key)
+            while len(self.entries) > self.size: self.entries.popitem(last=False)
+
+response_cache = VersionedLRU(RESPONSE_CACHE_SIZE)
+
+def versioned(view):
+    """Serves a GET view from `response_cache` and answers conditional requests with 304.
+    Only 200 responses are cached; errors always go through the view."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version, updated_at = read_data_version(get_db_connection())
+        key = (request.full_path, os.path.exists(STATUS_FLAG_FILE))  # The dashboard renders the update flag too
+        entry = response_cache.get(version, key)
+        metrics.inc('response_cache_lookups_total', 1, "Rendered-response cache lookups.", result='miss' if entry is None else 'hit')
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200: return response
+            body = response.get_data()
+            entry = (body, response.content_type, hashlib.sha1(body).hexdigest()[:20])
+            response_cache.put(version, key, entry)
+        body, content_type, etag = entry
+        response = app.response_class(body, content_type=content_type)
+        response.set_etag(etag); response.last_modified = datetime.datetime.fromtimestamp(updated_at, datetime.timezone.utc)
+        response.cache_control.no_cache = True  # Cache, but always revalidate
+        return response.make_conditional(request)
+    return wrapper
+
+# --- Full-Text Search (FTS5 index built by database_setup.py) ---
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+SEARCH_CACHE_SIZE = 512  # Ranked result lists kept per data version, keyed by (FTS query, limit)
+SEARCH_CANDIDATES = 500  # Newest heading matches bm25 scores per query; bounds the cost of common terms
+SEARCH_HEADING_COLUMNS = ('exam_name', 'post_name', 'conducting_body')  # The heavily weighted columns
+SNIPPET_TOKENS = 12
+SEARCH_TEXT_COLUMNS = ('exam_name', 'post_name', 'conducting_body', 'eligibility', 'specs', 'pattern')
+search_cache = VersionedLRU(SEARCH_CACHE_SIZE)  # Search-as-you-type repeats queries; results only change with the data
+
+def search_terms(q: str) -> list:
+    """Words of `q` as (term, is_prefix), search-as-you-type style: only the last word is a
+    prefix, and only from two characters on. FTS5 materializes the full doclist of every
+    prefix term, so keeping the finished words exact keeps common queries in budget."""
+    words = re.findall(r'\w+', q.lower())
+    return [(word, n == len(words) - 1 and len(word) > 1) for n, word in enumerate(words)]
+
+def fts_query(q: str):
+    """Turns free text into an FTS5 query of quoted (prefix) terms, or None if there are no words."""
+    terms = search_terms(q)
+    return ' '.join(f'"{term}"' + ('*' if is_prefix else '') for term, is_prefix in terms) if terms else None
+
+def highlight_snippet(texts: list, terms: list) -> str:
+    """HTML-escaped excerpt of the best matching text with matched words wrapped in <mark>.
+
+    Built in Python from the stored FTS columns: asking FTS5 for snippet() needs a second
+    MATCH pass over the whole doclist, which costs more than the ranking itself.
+    """
+    is_hit = lambda word: any(word.startswith(term) if is_prefix else word == term for term, is_prefix in terms)
+    best = None
+    for text in texts:
+        words = list(re.finditer(r'\w+', text or ''))
+        hits = [n for n, word in enumerate(words) if is_hit(word.group().lower())]
+        if hits and (best is None or len(hits) > len(best[2])): best = (text, words, hits)
+    if best is None: return str(escape(next((text for text in texts if text), '')[:80]))
+    text, words, hits = best
+    start = max(0, min(hits[0] - 2, len(words) - SNIPPET_TOKENS)); end = min(len(words), start + SNIPPET_TOKENS)
+    out, position = [], words[start].start()
+    for n in range(start, end):
+        word = words[n]
+        out.append(str(escape(text[position:word.start()])))
+        out.append(f"<mark>{escape(word.group())}</mark>" if n in hits else str(escape(word.group())))
+        position = word.end()
+    if end == len(words): out.append(str(escape(text[position:])))
+    return ('…' if start > 0 else '') + ''.join(out).strip() + ('…' if end < len(words) else '')
+
+@metrics.timed()
+def search_jobs(conn: sqlite3.Connection, q: str, limit: int = SEARCH_LIMIT) -> list:
+    """Prefix search over jobs, specs and patterns with highlighted snippets, in three passes
+    that each fill what is left of `limit`:
+      1. jobs whose exam name is the query (an index seek)
+      2. matches in the exam/post name or body, bm25-ranked among the newest SEARCH_CANDIDATES
+      3. matches only in eligibility, specs or pattern, newest first
+    Every pass stops after a bounded number of rows, so the first search for a term found in
+    half the catalogue costs about what a rare one does. bm25 would have to scan a term's whole
+    doclist for its IDF, which is what made common terms slow, so pass 3 does not rank.
+    """
+    match = fts_query(q)
+    if not match: return []
+    ids = [row['id'] for row in conn.execute(f"SELECT id FROM jobs WHERE {JOB_SORT_EXPRESSIONS['exam_name']} = ? ORDER BY id DESC LIMIT ?", (q.strip(), limit))]
+    passes = ((f'''SELECT id FROM (SELECT rowid AS id, bm25(job_search, {', '.join(map(str, SEARCH_RANK_WEIGHTS))}) AS score FROM job_search
+                                 WHERE job_search MATCH ? ORDER BY rowid DESC LIMIT {SEARCH_CANDIDATES}) ORDER BY score LIMIT ?''',
+               f"{{{' '.join(SEARCH_HEADING_COLUMNS)}}} : ({match})"),
+              ("SELECT rowid AS id FROM job_search WHERE job_search MATCH ? ORDER BY rowid DESC LIMIT ?", match))
+    for sql, pass_match in passes:
+        if len(ids) >= limit: break
+        seen = set(ids)
+        ids += [row['id'] for row in conn.execute(sql, (pass_match, limit + len(seen))) if row['id'] not in seen][:limit - len(ids)]
+    if not ids: return []
+    docs = {row['rowid']: row for row in conn.execute(f"SELECT rowid, {', '.join(SEARCH_TEXT_COLUMNS)} FROM job_search WHERE rowid IN ({', '.join('?' * len(ids))})", ids)}
+    terms = search_terms(q)
+    return [{
+        'id': job_id, 'post_name': docs[job_id]['post_name'], 'exam_name': docs[job_id]['exam_name'], 'conducting_body': docs[job_id]['conducting_body'],
+        'snippet': highlight_snippet([docs[job_id][column] for column in SEARCH_TEXT_COLUMNS], terms),
+    } for job_id in ids if job_id in docs]
+
+# --- Job Listing (keyset pagination, filters, sorting) ---
+JOB_LIST_COLUMNS = ['id', 'post_name', 'exam_name', 'conducting_body', 'group', 'gazetted_status', 'pay_level', 'salary', 'eligibility', 'age_limit', 'pet_status']
+JOB_FILTER_COLUMNS = {'id': 'id', 'conducting_body': 'conducting_body', 'group': '"group"', 'gazetted_status': 'gazetted_status'}
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(sort: str, order: str, last_value, last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort, order, last_value, last_id]).encode()).decode()
+
+def decode_cursor(cursor: str, sort: str, order: str):
+    """Returns (last_value, last_id); the cursor must come from a listing with the same sort."""
+    try: cursor_sort, cursor_order, last_value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError): raise ValueError("Invalid cursor.")
+    if (cursor_sort, cursor_order) != (sort, order): raise ValueError("Cursor does not match the requested sort order.")
+    return last_value, last_id
+
+@metrics.timed()
+def query_jobs(conn: sqlite3.Connection, args) -> dict:
+    """One page of the jobs table for `args` (a request.args-like mapping). Raises ValueError on bad input.
+
+    Pages are keyset-paginated on (sort key, id): the cursor holds the last row's key, so
+    every page is an index seek no matter how deep the client has scrolled.
+    """
+    sort = args.get('sort', 'id'); order = args.get('order', 'asc')
+    if sort not in JOB_SORT_EXPRESSIONS: raise ValueError(f"Unknown sort '{sort}'.")
+    if order not in ('asc', 'desc'): raise ValueError("order must be 'asc' or 'desc'.")
+    try: limit = min(max(int(args.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError: raise ValueError("limit must be an integer.")
+
+    where, params = [], []
+    for arg, column in JOB_FILTER_COLUMNS.items():
+        values = args.getlist(arg) if hasattr(args, 'getlist') else ([args[arg]] if arg in args else [])
+        if values: where.append(f"{column} IN ({', '.join('?' * len(values))})"); params.extend(values)
+    for arg, op in (('pay_level_min', '>='), ('pay_level_max', '<=')):
+        if args.get(arg) not in (None, ''):
+            try: params.append(int(args[arg]))
+            except ValueError: raise ValueError(f"{arg} must be an integer.")
+            where.append(f"pay_level {op} ?")
+    match = fts_query(args.get('q', ''))
+    if match:
+        where.append("id IN (SELECT rowid FROM job_search WHERE job_search MATCH ?)"); params.append(match)
+
+    expression = JOB_SORT_EXPRESSIONS[sort]
+    cmp = '>' if order == 'asc' else '<'
+    if args.get('cursor'):
+        last_value, last_id = decode_cursor(args['cursor'], sort, order)
+        if sort == 'id': where.append(f"id {cmp} ?"); params.append(last_id)
+        else:
+            # Written as a range + tie-break (not a row value) so SQLite seeks the expression index
+            where.append(f"{expression} {cmp}= ? AND ({expression} {cmp} ? OR id {cmp} ?)"); params.extend([last_value, last_value, last_id])
+
+    direction = 'ASC' if order == 'asc' else 'DESC'
+    columns = ', '.join(f'"{column}"' for column in JOB_LIST_COLUMNS)
+    sql = (f"SELECT {columns}, {expression.replace(' COLLATE NOCASE', '')} AS sort_key FROM jobs"
+           + (f" WHERE {' AND '.join(where)}" if where else "")
+           + f" ORDER BY {expression} {direction}, id {direction} LIMIT ?")
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    has_more = len(rows) > limit; rows = rows[:limit]
+    return {
+        'jobs': [{column: row[column] for column in JOB_LIST_COLUMNS} for row in rows],
+        'next_cursor': encode_cursor(sort, order, rows[-1]['sort_key'], rows[-1]['id']) if has_more else None,
+        'sort': sort, 'order': order,
+    }
 
 # --- Main Page Route ---
 @app.route('/')
+@versioned
 def index():
     # Check if the data scout is currently running
     is_updating = os.path.exists(STATUS_FLAG_FILE)
     
     conn = get_db_connection()
-    # Fetch summary data for the main table
-    jobs = conn.execute('SELECT id, post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status FROM jobs ORDER BY id').fetchall()
-    conn.close()
+    # Only the first page is rendered; the table fetches the rest from /api/jobs as it scrolls
+    page = query_jobs(conn, {})
     
-    return render_template('index.html', jobs=jobs, is_updating=is_updating)
+    return render_template('index.html', jobs=page['jobs'], next_cursor=page['next_cursor'], is_updating=is_updating, max_page_size=MAX_PAGE_SIZE)
+
+# --- Jobs JSON API ---
+@app.route('/api/jobs')
+@versioned
+def api_jobs():
+    """Paginated job listing: ?sort=&order=&limit=&cursor=&conducting_body=&group=&gazetted_status=&pay_level_min=&pay_level_max=&q="""
+    conn = get_db_connection()
+    try: page = query_jobs(conn, request.args)
+    except ValueError as e: return jsonify({'error': str(e)}), 400
+    return jsonify(page)
+
+# --- Search JSON API ---
+@app.route('/api/search')
+def api_search():
+    """Ranked prefix search: ?q=&limit=. Snippets are HTML-escaped with <mark> highlights."""
+    q = request.args.get('q', '')
+    try: limit = min(max(int(request.args.get('limit', SEARCH_LIMIT)), 1), MAX_SEARCH_LIMIT)
+    except ValueError: return jsonify({'error': "limit must be an integer."}), 400
+    start = time.perf_counter()
+    conn = get_db_connection()
+    version, _ = read_data_version(conn); key = (fts_query(q), limit)
+    results = search_cache.get(version, key)
+    if results is None: results = search_jobs(conn, q, limit); search_cache.put(version, key, results)
+    return jsonify({'query': q, 'results': results, 'took_ms': round((time.perf_counter() - start) * 1000, 2)})
+
+# --- Job Details (one round trip) ---
+def _json_columns(table: str) -> str:
+    pairs = ', '.join(f"'{column}', {column}" for column in DETAIL_COLUMNS[table])
+    return f"(SELECT json_object({pairs}) FROM {table} WHERE job_id = j.id)"
+
+# The job row plus its specs, pattern and cutoffs as JSON columns; cutoffs come out of the
+# (job_id, category_rank) index already in display order.
+DETAILS_QUERY = f"""
+    SELECT j.*, {_json_columns('job_specs')} AS job_spec_json, {_json_columns('exam_pattern')} AS exam_pattern_json,
+        (SELECT json_group_array(json_object('category', category, 'score', score, 'year', year))
+         FROM (SELECT category, score, year FROM job_cutoffs WHERE job_id = j.id ORDER BY category_rank, id)) AS cutoffs_json
+    FROM jobs j WHERE j.id = ?"""
+
+@metrics.timed()
+def load_job_details(conn: sqlite3.Connection, job_id: int):
+    """Returns {'job', 'job_spec', 'exam_pattern', 'cutoffs'} for `job_id` from a single query, or None."""
+    row = conn.execute(DETAILS_QUERY, (job_id,)).fetchone()
+    if row is None: return None
+    job = {key: row[key] for key in row.keys() if not key.endswith('_json')}
+    return {
+        'job': job,
+        'job_spec': json.loads(row['job_spec_json']) if row['job_spec_json'] else None,
+        'exam_pattern': json.loads(row['exam_pattern_json']) if row['exam_pattern_json'] else None,
+        'cutoffs': json.loads(row['cutoffs_json']),
+    }
 
 # --- Details Page Route ---
 @app.route('/details/<int:job_id>')
+@versioned
 def details(job_id):
-    conn = get_db_connection()
-    
-    # Fetch main job details
-    job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
-    if not job: 
-        conn.close()
+    details = load_job_details(get_db_connection(), job_id)
+    if not details: 
         return "Job not found", 404
-    
-    # Fetch related data from other tables
-    job_spec = conn.execute('SELECT * FROM job_specs WHERE job_id = ?', (job_id,)).fetchone()
-    exam_pattern = conn.execute('SELECT * FROM exam_pattern WHERE job_id = ?', (job_id,)).fetchone()
-    
-    # Fetch and sort cutoffs logically
-    job_cutoffs = conn.execute('''
-        SELECT category, score, year FROM job_cutoffs WHERE job_id = ?
-        ORDER BY CASE 
-            WHEN category LIKE '%UR%' OR category LIKE '%General%' THEN 1 
-            WHEN category LIKE '%EWS%' THEN 2 
-            WHEN category LIKE '%OBC%' THEN 3 
-            WHEN category LIKE '%SC%' THEN 4 
-            WHEN category LIKE '%ST%' THEN 5 
-            ELSE 6 
-        END
-    ''', (job_id,)).fetchall()
-    
-    conn.close()
-    
-    return render_template('details.html', job=job, job_spec=job_spec, exam_pattern=exam_pattern, cutoffs=job_cutoffs)
+    return render_template('details.html', **details)
+
+# --- Details JSON API ---
+@app.route('/api/details/<int:job_id>')
+@versioned
+def api_details(job_id):
+    """The details page's data: job, job_spec, exam_pattern and cutoffs (in category order)."""
+    details = load_job_details(get_db_connection(), job_id)
+    if not details: return jsonify({'error': "Job not found"}), 404
+    return jsonify(details)
+
+# --- Cutoff Trends ---
+@app.route('/api/cutoffs/<int:job_id>/trend')
+@versioned
+def api_cutoff_trend(job_id):
+    """Per-category cutoff trends, read from the aggregates the scout maintains on write."""
+    conn = get_db_connection()
+    if not conn.execute('SELECT 1 FROM jobs WHERE id = ?', (job_id,)).fetchone(): return jsonify({'error': "Job not found"}), 404
+    return jsonify({'job_id': job_id, 'categories': load_trend(conn, job_id)})
+
+# --- Live Updates (Server-Sent Events) ---
+# One watcher thread per process checks the status flag and the meta table every
+# WATCH_INTERVAL and fans changes out to all /events clients, which sleep on a shared
+# Condition in between: open tabs cost nothing while nothing happens.
+WATCH_INTERVAL = 1.0
+SSE_HEARTBEAT_SECONDS = 15  # Comment frames that keep proxies open and reveal dead clients
+EVENT_BACKLOG = 256
+MAX_EVENT_JOB_IDS = 500     # Bigger changes are sent as job_ids: null (reload the list)
+
+class EventHub:
+    """Shared watcher plus a numbered broadcast of 'status', 'progress' and 'data' events."""
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.events = deque(maxlen=EVENT_BACKLOG); self.seq = 0
+        self.state = {}  # Latest data per event type
+        self.thread = None; self.clients = 0
+
+    def start(self):
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._watch, name='event-watcher', daemon=True); self.thread.start()
+
+    def publish(self, event: str, data: dict):
+        with self.condition:
+            self.seq += 1; self.events.append((self.seq, event, data)); self.state[event] = data
+            self.condition.notify_all()
+
+    def poll(self, last: dict):
+        """One watcher tick: publishes whatever changed since the previous tick (`last` holds that state)."""
+        updating = os.path.exists(STATUS_FLAG_FILE)
+        if updating != last.get('updating'): last['updating'] = updating; self.publish('status', {'updating': updating})
+        pool = db.get_pool(DB_PATH); conn = pool.acquire()
+        try:
+            meta = read_meta(conn, 'data_version', 'scout_progress')
+            version = int(meta.get('data_version', 0))
+            if 'version' in last and version != last['version']:
+                job_ids = changed_jobs_since(conn, last['version'], version)
+                self.publish('data', {'version': version, 'job_ids': job_ids if job_ids is None or len(job_ids) <= MAX_EVENT_JOB_IDS else None})
+            last['version'] = version
+            progress = meta.get('scout_progress')
+            if progress and progress != last.get('progress'): last['progress'] = progress; self.publish('progress', json.loads(progress))
+        finally: pool.release(conn)
+
+    def _watch(self):
+        last = {}
+        while True:
+            try: self.poll(last)
+            except Exception as e: print(f"⚠️ Event watcher: {e}")
+            time.sleep(WATCH_INTERVAL)
+
+    def stream(self):
+        """SSE frames for one client: the current status, then every event as it is published."""
+        with self.condition:
+            self.clients += 1; seq = self.seq
+            initial = [(seq, event, self.state[event]) for event in ('status', 'progress') if event in self.state]
+        try:
+            yield 'retry: 3000\n\n'
+            pending = initial
+            while True:
+                for number, event, data in pending: yield f"id: {number}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+                with self.condition:
+                    self.condition.wait_for(lambda: self.seq > seq, timeout=SSE_HEARTBEAT_SECONDS)
+                    pending = [item for item in self.events if item[0] > seq]
+                    if pending and pending[0][0] > seq + 1:  # Fell behind the backlog: ask for a full reload
+                        pending = [(self.seq, 'data', {'version': None, 'job_ids': None})]
+                    seq = self.seq
+                if not pending: yield ': ping\n\n'
+        finally:
+            with self.condition: self.clients -= 1
+
+event_hub = EventHub()
+
+@app.route('/events')
+def events():
+    """Server-Sent Events: status (scout running), progress (batch N of M) and data (changed job ids)."""
+    event_hub.start()
+    return Response(event_hub.stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# --- Metrics ---
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text format: this process's request/query metrics, then the scout's last snapshot."""
+    text = metrics.registry.render()
+    try:
+        with open(SCOUT_METRICS_FILE, encoding='utf-8') as f: text += f.read()
+    except OSError: pass  # The scout has not run yet
+    return Response(text, content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # --- Status Endpoint for the Green Dot ---
 @app.route('/update_status')
 def update_status():
-    """API endpoint for the frontend to check if an update is running."""
+    """API endpoint to check if an update is running (the dashboard listens on /events instead)."""
     is_updating = os.path.exists(STATUS_FLAG_FILE)
     return jsonify({'updating': is_updating})
 
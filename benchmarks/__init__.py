@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# Offline benchmarks for GJ Terminal. Run modules from the project root, e.g.
+#   python -m benchmarks.bench_dispatch
@@ -0,0 +1,81 @@
+# benchmarks/bench_batching.py
+# --- Fixed 5-exam full prompts vs needs-grouped, token-budgeted batches against the fake model ---
+#
+#   python -m benchmarks.bench_batching --jobs 500 --cutoffs-only 0.8
+#   python -m benchmarks.bench_batching --jobs 200 --max-answer-exams 3   # model cuts long answers off
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from unittest import mock
+
+import data_scout
+from database_setup import ensure_schema, DETAIL_COLUMNS
+from benchmarks.fake_model import FakeModel, canned_exam
+
+def build_mixed_db(path: str, n_jobs: int, cutoffs_only: float) -> sqlite3.Connection:
+    """The first `cutoffs_only` share of jobs is fresh and complete except for cutoffs; the rest need everything."""
+    conn = sqlite3.connect(path); conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    now = datetime.datetime.now().isoformat(); exam = canned_exam('')
+    n_fresh = int(n_jobs * cutoffs_only)
+    main = list(data_scout.JOB_DETAIL_DEFAULTS)
+    conn.executemany(f"INSERT INTO jobs (post_name, exam_name, conducting_body, {', '.join(main)}, last_updated) VALUES (?, ?, ?{', ?' * len(main)}, ?)",
+                     [(f"Post {i}", f"Bench Exam {i}", "UPSC") + ((tuple(exam[f] for f in main) + (now,)) if i < n_fresh else (None,) * (len(main) + 1)) for i in range(n_jobs)])
+    for table in ('job_specs', 'exam_pattern'):
+        fields = DETAIL_COLUMNS[table]
+        conn.execute(f"INSERT INTO {table} (job_id) SELECT id FROM jobs")
+        conn.execute(f"UPDATE {table} SET {', '.join(f + ' = ?' for f in fields)}, last_updated = ? WHERE job_id <= ?", tuple(exam[table][f] for f in fields) + (now, n_fresh))
+    conn.commit()
+    return conn
+
+def run_once(mode: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_mixed_db(os.path.join(tmp, 'bench.db'), args.jobs, args.cutoffs_only)
+        client = FakeModel(latency=args.latency, jitter=args.latency / 5, latency_per_exam=args.latency_per_exam, max_answer_exams=args.max_answer_exams)
+        limiter = data_scout.RateLimiter(args.rpm, args.tpm)
+        if mode == 'fixed':
+            # The old behaviour: always 5 exams, every section asked for
+            planner = data_scout.BatchPlanner(min_size=5, max_size=5)
+            patch = mock.patch.object(data_scout, 'needed_sections', lambda needs: data_scout.SECTIONS)
+        else: planner = data_scout.BatchPlanner(); patch = contextlib.nullcontext()
+        fields = {}
+        original_stage = data_scout.UpsertWriter.stage
+        def stage(writer, *a, **kw):
+            result = original_stage(writer, *a, **kw); fields['updated'] = writer.fields_updated; return result
+        start = time.perf_counter()
+        with patch, mock.patch.object(data_scout.UpsertWriter, 'stage', stage), contextlib.redirect_stdout(io.StringIO()):
+            ok = data_scout.update_existing_jobs(conn, client=client, limiter=limiter, max_workers=args.workers, planner=planner)
+        elapsed = time.perf_counter() - start
+        done = conn.execute("SELECT COUNT(*) FROM scout_queue WHERE task = 'update' AND status = 'done'").fetchone()[0]
+        conn.close()
+    return {'mode': mode, 'seconds': elapsed, 'ok': ok, 'done': done, 'calls': planner.calls, 'unusable': planner.failures,
+            'sent': planner.tokens_sent, 'received': planner.tokens_received, 'fields': fields.get('updated', 0), 'final_budget': planner.describe()}
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed vs adaptive, needs-grouped update batches against the fake model.")
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--cutoffs-only', type=float, default=0.8, help="Share of jobs that only lack cutoffs.")
+    parser.add_argument('--latency', type=float, default=0.05, help="Fake model seconds per call.")
+    parser.add_argument('--latency-per-exam', type=float, default=0.01, help="Extra fake seconds per exam answered.")
+    parser.add_argument('--max-answer-exams', type=int, default=0, help="Fake model truncates answers covering more exams (0 = never).")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rpm', type=float, default=60_000)
+    parser.add_argument('--tpm', type=float, default=100_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.jobs} jobs, {args.cutoffs_only:.0%} needing only cutoffs, fake latency {args.latency}s + {args.latency_per_exam}s/exam"
+          + (f", answers cut off above {args.max_answer_exams} exams" if args.max_answer_exams else "") + "\n")
+    for mode in ('fixed', 'adaptive'):
+        r = run_once(mode, args)
+        per_field = f"{(r['sent'] + r['received']) / r['fields']:,.0f}" if r['fields'] else "-"
+        print(f"{mode:<9} {r['seconds']:6.2f}s  calls={r['calls']:<4} unusable={r['unusable']:<3} done={r['done']}/{args.jobs}  "
+              f"tokens sent={r['sent']:,} received={r['received']:,}  fields={r['fields']}  tokens/field={per_field}  ok={r['ok']}  final budget {r['final_budget']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_details.py
+# --- Four-query details page (LIKE-based cutoff ordering) vs the single-query loader ---
+#
+#   python -m benchmarks.bench_details --jobs 20000
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import app
+import db
+from benchmarks.bench_search import build_search_db
+from database_setup import cutoff_category_rank
+
+CATEGORIES = ['UR', 'General', 'EWS', 'OBC', 'OBC-NCL', 'SC', 'ST', 'PwBD', 'Ex-Servicemen']
+
+def legacy_details(conn, job_id: int):
+    """The original details() queries: the job, its specs, its pattern and CASE-ordered cutoffs."""
+    job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+    if not job: return None
+    job_spec = conn.execute('SELECT * FROM job_specs WHERE job_id = ?', (job_id,)).fetchone()
+    exam_pattern = conn.execute('SELECT * FROM exam_pattern WHERE job_id = ?', (job_id,)).fetchone()
+    cutoffs = conn.execute('''
+        SELECT category, score, year FROM job_cutoffs WHERE job_id = ?
+        ORDER BY CASE
+            WHEN category LIKE '%UR%' OR category LIKE '%General%' THEN 1
+            WHEN category LIKE '%EWS%' THEN 2
+            WHEN category LIKE '%OBC%' THEN 3
+            WHEN category LIKE '%SC%' THEN 4
+            WHEN category LIKE '%ST%' THEN 5
+            ELSE 6
+        END
+    ''', (job_id,)).fetchall()
+    return {'job': dict(job), 'job_spec': dict(job_spec) if job_spec else None, 'exam_pattern': dict(exam_pattern) if exam_pattern else None, 'cutoffs': [dict(c) for c in cutoffs]}
+
+def add_cutoffs(conn, n_jobs: int, seed: int = 0):
+    rng = random.Random(seed); rows = []
+    for job_id in range(1, n_jobs + 1):
+        for year in ('2023', '2024'):
+            for category in rng.sample(CATEGORIES, rng.randrange(4, 8)):
+                rows.append((job_id, category, f"{rng.uniform(40, 100):.1f}", year, cutoff_category_rank(category)))
+    conn.executemany('INSERT INTO job_cutoffs (job_id, category, score, year, category_rank) VALUES (?, ?, ?, ?, ?)', rows)
+    conn.commit()
+
+def time_loader(loader, conn, job_ids) -> list:
+    timings = []
+    for job_id in job_ids:
+        t = time.perf_counter(); loader(conn, job_id); timings.append((time.perf_counter() - t) * 1e6)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Details page loaders: four queries vs one.")
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--lookups', type=int, default=5_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        conn = build_search_db(path, args.jobs); add_cutoffs(conn, args.jobs); conn.close()
+        conn = db.connect(path, readonly=True)
+        job_ids = [random.Random(1).randrange(1, args.jobs + 1) for _ in range(args.lookups)]
+
+        # Same content; tie order aside, the stored rank must reproduce the CASE ordering
+        for job_id in job_ids[:200]:
+            old, new = legacy_details(conn, job_id), app.load_job_details(conn, job_id)
+            assert [cutoff_category_rank(c['category']) for c in old['cutoffs']] == [cutoff_category_rank(c['category']) for c in new['cutoffs']]
+            assert sorted(map(str, old['cutoffs'])) == sorted(map(str, new['cutoffs'])) and old['job'] == new['job']
+
+        print(f"{args.jobs} jobs, {args.lookups} random lookups\n")
+        print(f"{'loader':<14} {'p50 us':>8} {'p95 us':>8} {'mean us':>8}")
+        results = {}
+        for name, loader in (('four queries', legacy_details), ('single query', app.load_job_details)):
+            time_loader(loader, conn, job_ids[:500])  # Warm the page cache
+            timings = results[name] = time_loader(loader, conn, job_ids)
+            print(f"{name:<14} {statistics.median(timings):8.1f} {statistics.quantiles(timings, n=20)[-1]:8.1f} {statistics.fmean(timings):8.1f}")
+        conn.close()
+        print(f"\n🚀 Single query: {statistics.fmean(results['four queries']) / statistics.fmean(results['single query']):.2f}x faster")
+
+if __name__ == '__main__':
+    main()
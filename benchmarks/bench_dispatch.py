@@ -0,0 +1,64 @@
+# benchmarks/bench_dispatch.py
+# --- Serial vs concurrent phase 1 dispatch against the fake model ---
+#
+#   python -m benchmarks.bench_dispatch --jobs 200 --latency 1.0 --workers 1 4 8
+
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+import data_scout
+from database_setup import ensure_schema
+from benchmarks.fake_model import FakeModel
+
+def build_stale_db(path: str, n_jobs: int) -> sqlite3.Connection:
+    """A DB where every job needs a full refresh (empty specs/pattern, no cutoffs)."""
+    conn = sqlite3.connect(path); conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    conn.executemany('INSERT INTO jobs (post_name, exam_name, conducting_body) VALUES (?, ?, ?)', [(f"Post {i}", f"Bench Exam {i}", "UPSC") for i in range(n_jobs)])
+    conn.execute('INSERT INTO job_specs (job_id) SELECT id FROM jobs')
+    conn.execute('INSERT INTO exam_pattern (job_id) SELECT id FROM jobs')
+    conn.commit()
+    return conn
+
+def run_once(n_jobs: int, workers: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_stale_db(os.path.join(tmp, 'bench.db'), n_jobs)
+        client = FakeModel(latency=args.latency, jitter=args.latency / 5, error_rate=args.error_rate, max_concurrent=args.server_concurrency)
+        limiter = data_scout.RateLimiter(args.rpm, args.tpm)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = data_scout.update_existing_jobs(conn, client=client, limiter=limiter, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        updated = conn.execute('SELECT COUNT(DISTINCT job_id) FROM job_cutoffs').fetchone()[0]
+        conn.close()
+    return {'workers': workers, 'seconds': elapsed, 'ok': ok, 'jobs_updated': updated, 'calls': client.calls, 'throttled': client.throttled}
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs concurrent phase 1 dispatch against the fake model.")
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=1.0, help="Fake model seconds per call.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of calls answered with 429.")
+    parser.add_argument('--server-concurrency', type=int, default=0, help="Fake server throttles above this many in-flight calls (0 = unlimited).")
+    parser.add_argument('--rpm', type=float, default=600)
+    parser.add_argument('--tpm', type=float, default=10_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+    data_scout.BACKOFF_BASE_SECONDS = 0.2  # Keep injected-429 runs short
+
+    batches = -(-args.jobs // data_scout.BatchPlanner().batch_size(data_scout.SECTIONS))
+    print(f"{args.jobs} jobs in {batches} batches, fake latency {args.latency}s, limiter {args.rpm:g} req/min")
+    print(f"(old serial loop also slept 30s between batches: +{(batches - 1) * 30}s on top of the workers=1 row)\n")
+    baseline = None
+    for workers in args.workers:
+        result = run_once(args.jobs, workers, args)
+        baseline = baseline or result['seconds']
+        print(f"workers={workers:<3} {result['seconds']:7.2f}s  {args.jobs / result['seconds']:7.1f} jobs/s  x{baseline / result['seconds']:.1f}  "
+              f"updated={result['jobs_updated']} calls={result['calls']} throttled={result['throttled']} ok={result['ok']}")
+
+if __name__ == '__main__':
+    main()
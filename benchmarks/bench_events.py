@@ -0,0 +1,92 @@
+# benchmarks/bench_events.py
+# --- Thousands of idle /events clients: idle cost and fan-out latency vs 2-second polling ---
+#
+#   python -m benchmarks.bench_events --clients 2000
+
+import argparse
+import logging
+import os
+import selectors
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+import app
+from benchmarks.bench_search import build_search_db
+from database_setup import bump_data_version
+
+POLL_INTERVAL = 2.0  # The dashboard's old setInterval(checkUpdateStatus, 2000)
+
+def open_clients(port: int, count: int, chunk: int = 100) -> list:
+    """Opens `count` /events streams, a chunk at a time, and waits for each one's first frame."""
+    clients = []
+    for start in range(0, count, chunk):
+        opened = []
+        for _ in range(min(chunk, count - start)):
+            sock = socket.create_connection(('127.0.0.1', port))
+            sock.sendall(b"GET /events HTTP/1.1\r\nHost: bench\r\nAccept: text/event-stream\r\n\r\n"); opened.append(sock)
+        wait_for_frames(opened, b'retry:', timeout=30)
+        clients.extend(opened)
+    return clients
+
+def wait_for_frames(clients: list, marker: bytes, timeout: float) -> list:
+    """Reads until every client has received `marker`; returns each client's arrival time."""
+    selector = selectors.DefaultSelector(); buffers = {}; arrived = {}
+    for sock in clients: selector.register(sock, selectors.EVENT_READ); buffers[sock] = b''
+    deadline = time.perf_counter() + timeout
+    while len(arrived) < len(clients) and time.perf_counter() < deadline:
+        for key, _ in selector.select(timeout=0.5):
+            sock = key.fileobj; buffers[sock] += sock.recv(65536)
+            if marker in buffers[sock]: arrived[sock] = time.perf_counter(); selector.unregister(sock)
+    selector.close()
+    if len(arrived) < len(clients): raise RuntimeError(f"{len(clients) - len(arrived)} clients never received {marker!r}")
+    return [arrived[sock] for sock in clients]
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle SSE connections vs polling /update_status.")
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--idle', type=float, default=5.0, help="Seconds to measure the idle cost.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        build_search_db(path, 1000).close()
+        app.DB_PATH = path; app.STATUS_FLAG_FILE = os.path.join(tmp, 'update_in_progress.flag')
+
+        # Polling baseline: what the same number of tabs would cost at one request per 2s each
+        client = app.app.test_client(); start = time.process_time()
+        for _ in range(1000): client.get('/update_status')
+        poll_cost = (time.process_time() - start) / 1000
+        poll_rate = args.clients / POLL_INTERVAL
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)  # One access-log line per stream otherwise
+        server = make_server('127.0.0.1', 0, app.app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        start = time.perf_counter()
+        clients = open_clients(server.server_port, args.clients)
+        print(f"Opened {len(clients)} /events streams in {time.perf_counter() - start:.1f}s ({threading.active_count()} threads)\n")
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        time.sleep(args.idle)
+        idle_cpu = (time.process_time() - cpu) / (time.perf_counter() - wall)
+
+        open(app.STATUS_FLAG_FILE, 'w').close(); start = time.perf_counter()
+        status_latency = max(wait_for_frames(clients, b'event: status', timeout=30)) - start
+        writer = sqlite3.connect(path); bump_data_version(writer, [1, 2, 3]); writer.commit(); start = time.perf_counter()
+        data_latency = max(wait_for_frames(clients, b'event: data', timeout=30)) - start
+
+        print(f"{'':<28} {'SSE':>12} {'2s polling':>12}")
+        print(f"{'requests/s while idle':<28} {0:>12} {poll_rate:>12.0f}")
+        print(f"{'CPU while idle':<28} {idle_cpu:>11.1%} {poll_rate * poll_cost:>11.1%}")
+        print(f"{'status change seen by all':<28} {status_latency:>11.2f}s {POLL_INTERVAL:>11.2f}s")
+        print(f"{'data change seen by all':<28} {data_latency:>11.2f}s {'(reload)':>12}")
+        print(f"\n(SSE latency includes the {app.WATCH_INTERVAL:g}s watcher interval; polling figures are worst case, CPU from {poll_cost * 1e6:.0f} us per /update_status)")
+        for sock in clients: sock.close()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
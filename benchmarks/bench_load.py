@@ -0,0 +1,92 @@
+# benchmarks/bench_load.py
+# --- Dashboard throughput while the scout is writing: per-request connections vs pooled WAL + response cache ---
+#
+#   python -m benchmarks.bench_load --jobs 20000 --threads 8 --seconds 5
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+import app
+import db
+from database_setup import bump_data_version
+from benchmarks.bench_search import build_search_db
+
+MODES = {
+    # The original setup: rollback journal, a fresh untuned connection per request
+    'before': {'journal_mode': 'DELETE', 'pool': {'size': 0, 'tuned': False}, 'response_cache': 0},
+    # Shared layer: WAL + read pragmas, pooled connections with warm statement caches, versioned response cache
+    'after': {'journal_mode': 'WAL', 'pool': {}, 'response_cache': app.RESPONSE_CACHE_SIZE},
+}
+
+def request_mix(n_jobs: int, rng: random.Random) -> str:
+    return rng.choice([
+        '/', '/api/jobs?sort=post_name', '/api/jobs?sort=pay_level&order=desc&conducting_body=UPSC',
+        f'/api/search?q={rng.choice(["eng", "upsc", "statistics officer", "tier 2"])}', f'/details/{rng.randrange(1, n_jobs + 1)}',
+    ])
+
+def scout_writer(path: str, mode: str, n_jobs: int, stop: threading.Event, stats: dict):
+    """Simulates a scout run: batches of row updates committed back to back."""
+    rng = random.Random(1)
+    conn = db.connect(path) if mode == 'after' else sqlite3.connect(path, timeout=30)
+    while not stop.is_set():
+        ids = [rng.randrange(1, n_jobs + 1) for _ in range(50)]
+        conn.executemany("UPDATE jobs SET salary = ?, last_updated = CURRENT_TIMESTAMP WHERE id = ?", [(f"₹{rng.randrange(25, 90)},000+", i) for i in ids])
+        bump_data_version(conn, sorted(set(ids)))  # As UpsertWriter.flush does, so cached pages are invalidated per batch
+        time.sleep(0.005)  # Batch still open while the next exams are staged
+        conn.commit(); stats['batches'] += 1
+        time.sleep(0.005)
+    conn.close()
+
+def reader(n_jobs: int, seed: int, stop: threading.Event, latencies: list, errors: list):
+    client = app.app.test_client(); rng = random.Random(seed)
+    while not stop.is_set():
+        url = request_mix(n_jobs, rng)
+        start = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 500: errors.append(url)
+
+def run_mode(path: str, mode: str, n_jobs: int, threads: int, seconds: float) -> dict:
+    conn = sqlite3.connect(path); conn.execute(f"PRAGMA journal_mode = {MODES[mode]['journal_mode']}"); conn.close()
+    db.configure_pool(path, **MODES[mode]['pool'])
+    app.response_cache = app.VersionedLRU(MODES[mode]['response_cache'])
+    stop = threading.Event(); latencies, errors, writer_stats = [], [], {'batches': 0}
+    workers = [threading.Thread(target=scout_writer, args=(path, mode, n_jobs, stop, writer_stats))]
+    workers += [threading.Thread(target=reader, args=(n_jobs, seed, stop, latencies, errors)) for seed in range(threads)]
+    for worker in workers: worker.start()
+    time.sleep(seconds); stop.set()
+    for worker in workers: worker.join()
+    latencies.sort()
+    return {
+        'req_per_s': len(latencies) / seconds, 'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] * 1000, 'errors': len(errors), 'write_batches': writer_stats['batches'],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard req/s under a concurrent scout write load.")
+    parser.add_argument('--jobs', type=int, default=20_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        build_search_db(path, args.jobs).close()
+        app.DB_PATH = path
+        print(f"{args.jobs} jobs, {args.threads} reader threads, {args.seconds:.0f}s per mode, scout writing throughout\n")
+        print(f"{'mode':<8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'5xx':>5} {'writes':>7}")
+        results = {}
+        for mode in MODES:
+            results[mode] = r = run_mode(path, mode, args.jobs, args.threads, args.seconds)
+            print(f"{mode:<8} {r['req_per_s']:>8.0f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['errors']:>5} {r['write_batches']:>7}")
+        db.get_pool(path).close()
+        print(f"\n🚀 After: {results['after']['req_per_s'] / results['before']['req_per_s']:.2f}x requests/s")
+
+if __name__ == '__main__':
+    main()
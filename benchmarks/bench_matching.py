@@ -0,0 +1,80 @@
+# benchmarks/bench_matching.py
+# --- Exam-name matching at catalogue scale: linear difflib scans vs NameIndex.match_many ---
+#
+#   python -m benchmarks.bench_matching --names 10000 --sample 300
+
+import argparse
+import difflib
+import random
+import time
+from collections import Counter
+
+from benchmarks.bench_search import BODIES, FIELDS, POSTS
+from name_index import NameIndex, match_many
+
+KINDS = ['Exam', 'Recruitment', 'Selection Test', 'Entrance', 'CBT']
+
+def legacy_find_best_match(exam_name_db: str, names_in_api: list):
+    """The original find_best_match() tiers, returning (index, reason)."""
+    for i, name in enumerate(names_in_api):
+        if exam_name_db.lower() == name.lower(): return i, 'exact'
+    match = difflib.get_close_matches(exam_name_db, names_in_api, n=1, cutoff=0.8)
+    if match: return names_in_api.index(match[0]), 'fuzzy'
+    possible = [i for i, name in enumerate(names_in_api) if exam_name_db.lower() in name.lower()]
+    return (possible[0], 'substring') if len(possible) == 1 else (None, 'none')
+
+def legacy_is_new(name: str, existing_exams: list) -> bool:
+    """The original phase 2 loop over every existing exam name."""
+    for existing in existing_exams:
+        if name.lower() == existing.lower(): return False
+    return True
+
+def build_names(n: int, rng: random.Random) -> list:
+    names = set()
+    while len(names) < n:
+        names.add(f"{rng.choice(BODIES)} {rng.choice(FIELDS)} {rng.choice(POSTS)} {rng.choice(KINDS)} {rng.randrange(2000, 2030)} Grade {rng.choice('ABCDEFGH')}{rng.randrange(1, 9)}")
+    return sorted(names)
+
+def model_spelling(name: str, rng: random.Random) -> str:
+    """How an answer might spell an exam we asked about: verbatim, re-cased, with typos, shortened or unrelated."""
+    typo = lambda text: (lambda i: text[:i] + rng.choice('abcdefghijklmnopqrstuvwxyz') + text[i + 1:])(rng.randrange(len(text)))
+    roll = rng.random()
+    if roll < 0.35: return name
+    if roll < 0.5: return name.upper()
+    if roll < 0.7: return typo(typo(name))
+    if roll < 0.8: return name + ' (Notification)'
+    if roll < 0.9: return name.rsplit(' ', 2)[0]
+    return f"Unrelated Posting {rng.random():.8f}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Linear difflib matching vs the indexed matcher.")
+    parser.add_argument('--names', type=int, default=10_000)
+    parser.add_argument('--sample', type=int, default=300, help="Names checked against the (slow) linear matcher.")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    names = build_names(args.names, rng)
+    candidates = [model_spelling(name, rng) for name in names]; rng.shuffle(candidates)
+    sample = rng.sample(names, min(args.sample, len(names)))
+
+    start = time.perf_counter(); index = NameIndex(candidates); build = time.perf_counter() - start
+    start = time.perf_counter(); matches = match_many(names, candidates); indexed = time.perf_counter() - start
+    print(f"{len(names)} names x {len(candidates)} candidates")
+    print(f"NameIndex build {build:.2f}s, match_many (incl. build) {indexed:.2f}s -> {indexed / len(names) * 1000:.2f} ms/name")
+    print(f"  reasons: {dict(Counter(match['reason'] for match in matches))}")
+
+    by_name = dict(zip(names, matches))
+    start = time.perf_counter(); legacy = {name: legacy_find_best_match(name, candidates) for name in sample}; linear = (time.perf_counter() - start) / len(sample)
+    agree = sum(legacy[name] == (by_name[name]['index'], by_name[name]['reason']) for name in sample)
+    print(f"Linear scan {linear * 1000:.2f} ms/name -> ~{linear * len(names):.0f}s for all {len(names)} names ({linear * len(names) / indexed:.0f}x slower)")
+    print(f"  agreement on {len(sample)} sampled names: {agree}/{len(sample)}")
+
+    # Phase 2 "is this posting new?" check
+    start = time.perf_counter(); legacy_new = [legacy_is_new(candidate, names) for candidate in candidates[:args.sample]]; linear_new = (time.perf_counter() - start) / args.sample
+    existing = NameIndex(names)
+    start = time.perf_counter(); indexed_new = [existing.find_exact(candidate) is None for candidate in candidates]; lookup = (time.perf_counter() - start) / len(candidates)
+    print(f"\nNew-posting check: {linear_new * 1e6:.0f} us/candidate linear vs {lookup * 1e6:.2f} us indexed; agreement {sum(a == b for a, b in zip(legacy_new, indexed_new))}/{len(legacy_new)}")
+    if agree != len(sample): print("⚠️ Indexed matcher disagrees with the linear one!")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_planner.py
+# --- Per-job check_update_needs() vs set-based plan_update_needs() ---
+#
+#   python -m benchmarks.bench_planner --jobs 50000
+
+import argparse
+import contextlib
+import datetime
+import io
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import data_scout
+from database_setup import ensure_schema
+
+# Mostly real values, plus every placeholder spelling is_valid_data() rejects
+FIELD_VALUES = ["Real value"] * 24 + ["N/A", " tba ", "Information not available", "", "\tNone\n", None]
+
+def build_synthetic_db(path: str, n_jobs: int, seed: int = 0) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    now = datetime.datetime.now()
+    timestamps = [None, '', (now - datetime.timedelta(days=30)).isoformat(), now.isoformat()]
+    pick = lambda: rng.choice(FIELD_VALUES)
+    conn = sqlite3.connect(path); conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    conn.executemany(
+        'INSERT INTO jobs (id, post_name, exam_name, official_website, application_fee, application_start, application_end, exam_date, vacancies, vacancies_year, last_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        [(i, f"Post {i}", f"Synthetic Exam {i}", pick(), pick(), pick(), pick(), pick(), pick(), pick(), rng.choice(timestamps)) for i in range(1, n_jobs + 1)])
+    # Roughly 10% of jobs miss their specs/pattern rows entirely
+    conn.executemany('INSERT INTO job_specs (job_id, nationality, attempts, last_updated) VALUES (?, ?, ?, ?)',
+                     [(i, pick(), pick(), rng.choice(timestamps)) for i in range(1, n_jobs + 1) if rng.random() > 0.1])
+    conn.executemany('INSERT INTO exam_pattern (job_id, stages, marking_scheme, last_updated) VALUES (?, ?, ?, ?)',
+                     [(i, pick(), pick(), rng.choice(timestamps)) for i in range(1, n_jobs + 1) if rng.random() > 0.1])
+    conn.executemany('INSERT INTO job_cutoffs (job_id, category, score, year) VALUES (?, ?, ?, ?)',
+                     [(i, cat, f"{rng.uniform(40, 100):.1f}", '2024') for i in range(1, n_jobs + 1) if rng.random() > 0.3 for cat in ('UR', 'OBC', 'SC', 'ST', 'EWS')])
+    conn.commit()
+    return conn
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-job vs set-based update planning.")
+    parser.add_argument('--jobs', type=int, default=50_000)
+    args = parser.parse_args()
+    threshold_date = (datetime.datetime.now() - datetime.timedelta(days=data_scout.UPDATE_THRESHOLD_DAYS)).isoformat()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_synthetic_db(os.path.join(tmp, 'bench.db'), args.jobs)
+        cursor = conn.cursor()
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            job_ids = [row['id'] for row in cursor.execute("SELECT id FROM jobs").fetchall()]
+            per_job = {job_id: data_scout.check_update_needs(cursor, job_id, threshold_date) for job_id in job_ids}
+        per_job_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        planned, reasons = data_scout.plan_update_needs(cursor, threshold_date)
+        planned_seconds = time.perf_counter() - start
+        conn.close()
+
+    mismatches = [job_id for job_id in per_job if per_job[job_id] != planned.get(job_id)]
+    needing = sum(1 for needs in planned.values() if any(needs.values()))
+    print(f"{args.jobs} jobs, {needing} need updates")
+    print(f"check_update_needs x{args.jobs}: {per_job_seconds * 1000:9.1f} ms  ({4 * args.jobs} queries)")
+    print(f"plan_update_needs:         {planned_seconds * 1000:9.1f} ms  (1 query)  x{per_job_seconds / planned_seconds:.1f} faster")
+    print(f"results identical: {not mismatches}" + (f" ({len(mismatches)} mismatches, e.g. job {mismatches[0]})" if mismatches else ""))
+
+if __name__ == '__main__':
+    main()
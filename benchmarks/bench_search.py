@@ -0,0 +1,88 @@
+# benchmarks/bench_search.py
+# --- /api/search latency on a large synthetic catalogue (budget: single-digit ms) ---
+#
+#   python -m benchmarks.bench_search --jobs 100000
+#
+# "ranked" is search_jobs() itself, as the first request for a query after a data change
+# pays it. "repeat" is the endpoint serving the same query again from the
+# per-data-version search cache. Before timing, exact exam-name queries (an early, the middle
+# and the newest job) must return that job first. Exits with status 1 if either p95 is over --budget-ms.
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+import app
+import db
+from database_setup import ensure_schema
+
+BODIES = ['UPSC', 'SSC', 'IBPS', 'SBI', 'RBI', 'RRB', 'ISRO', 'DRDO', 'LIC', 'NABARD', 'CDS', 'State PSC']
+POSTS = ['Officer', 'Assistant', 'Inspector', 'Scientist', 'Engineer', 'Clerk', 'Auditor', 'Stenographer', 'Manager', 'Analyst', 'Constable', 'Teacher']
+FIELDS = ['Civil', 'Mechanical', 'Electrical', 'Computer Science', 'Statistics', 'Economics', 'Agriculture', 'Law', 'Commerce', 'Forestry']
+QUALS = ['Any Graduation', 'B.Tech/B.E', 'Post Graduation', '10+2 (PCM)', 'CA/ICWA', 'M.Sc', 'LLB', 'Diploma']
+STAGES = ['Prelims, Mains, Interview', 'CBT, Skill Test', 'Written Test, Interview', 'Tier 1, Tier 2, Document Verification', 'Physical Test, Written Exam']
+QUERIES = ['upsc', 'ssc cgl', 'eng', 'computer sci', 'tier 2', 'b.tech', 'statistics officer', 'interview', 'agri', 'scientist isro', 'law', 'mains']
+
+def build_search_db(path: str, n_jobs: int, seed: int = 0) -> sqlite3.Connection:
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path); conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    jobs, specs, patterns = [], [], []
+    for i in range(1, n_jobs + 1):
+        body, post, field = rng.choice(BODIES), rng.choice(POSTS), rng.choice(FIELDS)
+        jobs.append((i, f"{field} {post}", f"{body} {field} {post} Exam {i}", body, rng.choice(QUALS), f"₹{rng.randrange(25, 90)},000+"))
+        specs.append((i, 'Indian', f"{rng.choice(QUALS)} in {field}", '21-32'))
+        patterns.append((i, rng.choice(STAGES), 'MCQ + Descriptive', '-1/3 negative marking'))
+    conn.executemany('INSERT INTO jobs (id, post_name, exam_name, conducting_body, eligibility, salary) VALUES (?, ?, ?, ?, ?, ?)', jobs)
+    conn.executemany('INSERT INTO job_specs (job_id, nationality, edu_qual, age_limits) VALUES (?, ?, ?, ?)', specs)
+    conn.executemany('INSERT INTO exam_pattern (job_id, stages, q_type, marking_scheme) VALUES (?, ?, ?, ?)', patterns)
+    conn.commit()
+    conn.execute("INSERT INTO job_search (job_search) VALUES ('optimize')"); conn.commit()
+    return conn
+
+def main():
+    parser = argparse.ArgumentParser(description="FTS5 search latency on a synthetic catalogue.")
+    parser.add_argument('--jobs', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--budget-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        build_search_db(os.path.join(tmp, 'bench.db'), args.jobs).close()
+        print(f"Built {args.jobs} jobs + FTS index in {time.perf_counter() - start:.1f}s\n")
+        app.DB_PATH = os.path.join(tmp, 'bench.db')
+        client = app.app.test_client()
+
+        conn = db.connect(app.DB_PATH, readonly=True)
+        for job_id in sorted({min(1001, args.jobs), max(1, args.jobs // 2), args.jobs}):  # Not job 1: '1' is a common token ('Tier 1')
+            exam_name = conn.execute("SELECT exam_name FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            top = app.search_jobs(conn, exam_name)
+            assert top and top[0]['id'] == job_id, f"'{exam_name}' ranked {[hit['id'] for hit in top[:5]]} first, not job {job_id}"
+        print("✅ Exact exam-name queries rank their job first\n")
+
+        worst_ranked = worst_repeat = 0.0
+        print(f"{'query':<20} {'matches':>8} {'ranked p50':>11} {'ranked p95':>11} {'repeat p95':>11}")
+        for q in QUERIES:
+            matches = conn.execute("SELECT COUNT(*) FROM job_search WHERE job_search MATCH ?", (app.fts_query(q),)).fetchone()[0]
+            timings = []
+            for _ in range(args.repeat):
+                t = time.perf_counter(); app.search_jobs(conn, q); timings.append((time.perf_counter() - t) * 1000)
+            endpoint = []
+            for _ in range(args.repeat):
+                t = time.perf_counter(); client.get('/api/search', query_string={'q': q}); endpoint.append((time.perf_counter() - t) * 1000)
+            ranked_p95, repeat_p95 = statistics.quantiles(timings, n=20)[-1], statistics.quantiles(endpoint[1:], n=20)[-1]  # endpoint[0] fills the cache
+            worst_ranked, worst_repeat = max(worst_ranked, ranked_p95), max(worst_repeat, repeat_p95)
+            print(f"{q:<20} {matches:>8} {statistics.median(timings):11.2f} {ranked_p95:11.2f} {repeat_p95:11.2f}")
+        conn.close(); print()
+        for name, worst in (('ranked', worst_ranked), ('repeat', worst_repeat)):
+            print(f"worst {name} p95 {worst:.2f} ms -> {'within' if worst < args.budget_ms else 'OVER'} the {args.budget_ms:g} ms budget")
+        if max(worst_ranked, worst_repeat) >= args.budget_ms: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_streaming.py
+# --- Whole-answer json.loads vs streamed, per-item parsing of model answers ---
+#
+#   python -m benchmarks.bench_streaming --jobs 200 --latency 0.3 --latency-per-exam 0.2
+#
+# 1. Recorded answers (benchmarks/fixtures/model_responses.json): exams kept and batches
+#    discarded by the old parse vs JsonArrayStream.
+# 2. The same answers replayed through ask_gemini_batch at a fixed chunk rate: time until the
+#    first exam is usable, streamed vs waiting for the whole text.
+# 3. Phase 1 end to end against the fake model: time to the first committed job and in total.
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+import data_scout
+from json_stream import parse_array
+from benchmarks.fake_model import FakeModel, ReplayModel, FIXTURES
+from benchmarks.bench_dispatch import build_stale_db
+
+def legacy_parse(text: str):
+    """The old ask_gemini_batch check: the text must start with '[' and load as one JSON list."""
+    if not text or not text.strip().startswith('['): return None
+    try: data = json.loads(text)
+    except json.JSONDecodeError: return None
+    return data if isinstance(data, list) else None
+
+def fixture_table(fixtures: list):
+    print(f"{'fixture':<16} {'exams':>5}  {'legacy':>8}  {'stream':>6}  note")
+    totals = {'exams': 0, 'legacy': 0, 'stream': 0, 'legacy_discarded': 0, 'stream_discarded': 0, 'batches': 0}
+    for fixture in fixtures:
+        legacy = legacy_parse(fixture['text']); items, _ = parse_array(fixture['text'])
+        kept_legacy = len(legacy) if legacy is not None else 0
+        print(f"{fixture['name']:<16} {len(fixture['exams']):>5}  {kept_legacy if legacy is not None else 'discard':>8}  {len(items):>6}  {fixture['note']}")
+        if not fixture['exams']: continue  # Nothing to lose in an empty answer
+        totals['batches'] += 1; totals['exams'] += len(fixture['exams'])
+        totals['legacy'] += kept_legacy; totals['stream'] += len(items)
+        totals['legacy_discarded'] += not kept_legacy; totals['stream_discarded'] += not items
+    print(f"\nexams kept: legacy {totals['legacy']}/{totals['exams']}, stream {totals['stream']}/{totals['exams']}; "
+          f"batches discarded: legacy {totals['legacy_discarded']}/{totals['batches']}, stream {totals['stream_discarded']}/{totals['batches']}\n")
+
+def first_item_latency(fixtures: list, chunk_chars: int, chunk_seconds: float):
+    """Median seconds from the request to the first usable exam, and to the end of the call."""
+    results = {}
+    for stream in (False, True):
+        firsts, totals = [], []
+        for fixture in fixtures:
+            if not fixture['exams']: continue
+            client = ReplayModel([fixture['text']], chunk_chars, chunk_seconds); first = []
+            start = time.perf_counter()
+            with mock.patch.object(data_scout, 'STREAM_RESPONSES', stream), contextlib.redirect_stdout(io.StringIO()):
+                items = data_scout.ask_gemini_batch(fixture['exams'], client=client, on_item=lambda item: first or first.append(time.perf_counter() - start))
+            totals.append(time.perf_counter() - start)
+            if not stream and items: first.append(totals[-1])  # Nothing is usable before the whole text arrives
+            if first: firsts.append(first[0])
+        results[stream] = (sorted(firsts)[len(firsts) // 2] if firsts else float('nan'), sorted(totals)[len(totals) // 2], len(firsts))
+    for stream, (first, total, usable) in results.items():
+        print(f"{'streamed' if stream else 'whole text':<11} first exam {first * 1000:7.1f} ms   call {total * 1000:7.1f} ms   answers with a usable exam {usable}")
+    print()
+
+def end_to_end(args):
+    for stream in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = build_stale_db(os.path.join(tmp, 'bench.db'), args.jobs)
+            client = FakeModel(latency=args.latency, jitter=0, latency_per_exam=args.latency_per_exam)
+            limiter = data_scout.RateLimiter(60_000, 100_000_000)
+            writes = []; original_complete = data_scout.complete_task
+            def complete_task(*a, **kw):
+                writes.append(time.perf_counter()); return original_complete(*a, **kw)
+            start = time.perf_counter()
+            with mock.patch.object(data_scout, 'STREAM_RESPONSES', stream), mock.patch.object(data_scout, 'complete_task', complete_task), contextlib.redirect_stdout(io.StringIO()):
+                data_scout.update_existing_jobs(conn, client=client, limiter=limiter, max_workers=args.workers)
+            elapsed = time.perf_counter() - start
+            done = conn.execute("SELECT COUNT(*) FROM scout_queue WHERE status = 'done'").fetchone()[0]
+            conn.close()
+        print(f"{'streamed' if stream else 'whole text':<11} first write {(writes[0] - start) * 1000 if writes else float('nan'):7.1f} ms   "
+              f"median write {(sorted(writes)[len(writes) // 2] - start) * 1000 if writes else float('nan'):7.1f} ms   total {elapsed:6.2f}s   done {done}/{args.jobs}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Whole-answer vs streamed, per-item parsing of model answers.")
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.3, help="Fake model seconds to the first token.")
+    parser.add_argument('--latency-per-exam', type=float, default=0.2, help="Fake model seconds to generate each exam.")
+    parser.add_argument('--chunk-chars', type=int, default=64, help="Replay chunk size (characters).")
+    parser.add_argument('--chunk-seconds', type=float, default=0.01, help="Replay delay per chunk.")
+    args = parser.parse_args()
+
+    with open(FIXTURES, encoding='utf-8') as f: fixtures = json.load(f)
+    print("--- Recorded answers: exams kept ---")
+    fixture_table(fixtures)
+    print(f"--- Recorded answers replayed at {args.chunk_chars} chars / {args.chunk_seconds * 1000:g} ms ---")
+    first_item_latency(fixtures, args.chunk_chars, args.chunk_seconds)
+    print(f"--- Phase 1, {args.jobs} jobs, fake model {args.latency}s + {args.latency_per_exam}s/exam, {args.workers} workers ---")
+    end_to_end(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_trends.py
+# --- Cutoff trends: computed per request from TEXT job_cutoffs vs read from the maintained aggregates ---
+#
+#   python -m benchmarks.bench_trends --size 100k
+#
+# 1. Read path: the per-request way (every cutoff row of the job, scores/years parsed from
+#    text, series built in Python) vs load_trend() on cutoff_trends (one range scan, points as JSON).
+# 2. Write path: UpsertWriter flush per 25-job cutoff batch with and without record_cutoffs().
+
+import argparse
+import random
+import statistics
+import time
+from unittest import mock
+
+import db
+import data_scout
+import cutoff_trends
+from cutoff_trends import parse_cutoff_score, parse_cutoff_year
+from benchmarks.generate_db import cached_db, SIZES
+
+def per_request_trend(conn, job_id: int) -> list:
+    """What a trend endpoint without aggregates has to do on every call."""
+    series = {}
+    for row in conn.execute("SELECT category, score, year, category_rank FROM job_cutoffs WHERE job_id = ? ORDER BY id", (job_id,)):
+        score, year = parse_cutoff_score(row['score']), parse_cutoff_year(row['year'])
+        if score is not None and year is not None: series.setdefault((row['category_rank'], row['category']), {})[year] = score
+    out = []
+    for (rank, category), by_year in sorted(series.items()):
+        years = sorted(by_year); points = []
+        for year in years:
+            window = [by_year[y] for y in years if year - cutoff_trends.TREND_WINDOW_YEARS < y <= year]
+            points.append({'year': year, 'score': by_year[year], 'yoy_delta': round(by_year[year] - by_year[year - 1], 2) if year - 1 in by_year else None, 'moving_avg': round(sum(window) / len(window), 2)})
+        scores = [p['score'] for p in points]
+        out.append({'category': category, 'years': len(years), 'latest_score': scores[-1], 'min_score': min(scores), 'max_score': max(scores), 'mean_score': round(sum(scores) / len(scores), 2), 'points': points})
+    return out
+
+def time_reads(loader, conn, job_ids) -> list:
+    timings = []
+    for job_id in job_ids:
+        start = time.perf_counter(); loader(conn, job_id); timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+def time_writes(path: str, n_jobs: int, batches: int, with_history: bool) -> list:
+    rng = random.Random(3); conn = db.connect(path); threshold_date = data_scout.update_threshold_date()
+    writer = data_scout.UpsertWriter(); needs = {'main': False, 'specs': False, 'pattern': False, 'cutoffs': True}; timings = []
+    patch = mock.patch.object(data_scout, 'record_cutoffs', lambda conn, rows: 0) if not with_history else mock.patch.object(data_scout, 'record_cutoffs', data_scout.record_cutoffs)
+    with patch:
+        for _ in range(batches):
+            batch = rng.sample(range(1, n_jobs + 1), 25)
+            start = time.perf_counter()
+            current = writer.load_current(conn, batch)
+            for job_id in batch:
+                cutoffs = [{'category': category, 'score': f"{rng.uniform(40, 100):.2f}"} for category in ('UR', 'EWS', 'OBC', 'SC', 'ST')]
+                writer.stage(current, job_id, {'year': '2025', 'cutoffs': cutoffs}, needs, threshold_date)
+            writer.flush(conn)
+            timings.append((time.perf_counter() - start) * 1000)
+            conn.rollback()
+    conn.close()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Cutoff trends: per-request computation vs maintained aggregates.")
+    parser.add_argument('--size', default='100k', help=f"Generated DB size: {', '.join(SIZES)} or a job count.")
+    parser.add_argument('--lookups', type=int, default=5_000)
+    parser.add_argument('--batches', type=int, default=200)
+    args = parser.parse_args()
+
+    path = cached_db(args.size); conn = db.connect(path, readonly=True)
+    n_jobs = conn.execute("SELECT MAX(id) FROM jobs").fetchone()[0]
+    rng = random.Random(1); job_ids = [rng.randrange(1, n_jobs + 1) for _ in range(args.lookups)]
+
+    # Same series either way (the generated DB has one version per cutoff, so history == job_cutoffs);
+    # Python and SQLite may round a half cent differently
+    close = lambda a, b: (a is None and b is None) or (a is not None and b is not None and abs(a - b) <= 0.011)
+    for job_id in job_ids[:200]:
+        old, new = per_request_trend(conn, job_id), cutoff_trends.load_trend(conn, job_id)
+        assert [s['category'] for s in old] == [s['category'] for s in new], job_id
+        for a, b in zip(old, new):
+            assert [p['year'] for p in a['points']] == [p['year'] for p in b['points']], job_id
+            assert all(close(p[key], q[key]) for p, q in zip(a['points'], b['points']) for key in ('score', 'yoy_delta', 'moving_avg')), job_id
+
+    print(f"{n_jobs:,} jobs, {args.lookups} random trend lookups\n")
+    print(f"{'read path':<22} {'p50 us':>8} {'p95 us':>8} {'mean us':>8}")
+    results = {}
+    for name, loader in (('computed per request', per_request_trend), ('aggregates', cutoff_trends.load_trend)):
+        time_reads(loader, conn, job_ids[:500])  # Warm the page cache
+        timings = results[name] = time_reads(loader, conn, job_ids)
+        print(f"{name:<22} {statistics.median(timings):8.1f} {statistics.quantiles(timings, n=20)[-1]:8.1f} {statistics.fmean(timings):8.1f}")
+    conn.close()
+    print(f"\n🚀 Aggregates: {statistics.fmean(results['computed per request']) / statistics.fmean(results['aggregates']):.2f}x faster reads\n")
+
+    print(f"{'write path (25 jobs)':<22} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, with_history in (('job_cutoffs only', False), ('+ history/trends', True)):
+        timings = time_writes(path, n_jobs, args.batches, with_history)
+        print(f"{name:<22} {statistics.median(timings):8.2f} {statistics.quantiles(timings, n=20)[-1]:8.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/fake_model.py
+# --- Local stand-in for the Gemini client so the scout can be exercised offline ---
+# Plug either model into the real scout with --model, e.g.
+#   python data_scout.py --model 'benchmarks.fake_model:FakeModel?latency=0.5&error_rate=0.05'
+#   python data_scout.py --model benchmarks.fake_model:ReplayModel.from_fixtures
+
+import json
+import os
+import random
+import re
+import threading
+import time
+from typing import Iterator, List
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'model_responses.json')
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeAPIError(Exception):
+    """Mimics google.api_core errors, which carry the HTTP status in `.code`."""
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+def canned_exam(exam_name: str) -> dict:
+    """A complete, realistic-looking answer for one exam."""
+    return {
+        "exam_name": exam_name,
+        "application_start": "2025-02-01", "application_end": "2025-03-01", "exam_date": "2025-05-25",
+        "official_website": "https://example.gov.in", "application_fee": "₹100 (Gen/OBC), Nil (SC/ST/Female)",
+        "vacancies": "Approx 1000", "vacancies_year": "2025", "year": "2024",
+        "job_specs": {"nationality": "Indian", "age_limits": "21-32", "age_relax": "OBC +3, SC/ST +5", "edu_qual": "Any Graduation", "attempts": "6 (Gen)", "physical_std": "N/A"},
+        "exam_pattern": {"stages": "Prelims, Mains, Interview", "num_papers": "2 + 9", "q_type": "MCQ + Descriptive", "duration": "2 hours each", "marking_scheme": "-1/3 negative"},
+        "cutoffs": [{"category": "UR", "score": "88.2"}, {"category": "EWS", "score": "82.8"}, {"category": "OBC", "score": "87.3"}, {"category": "SC", "score": "74.8"}, {"category": "ST", "score": "69.4"}],
+    }
+
+class FakeModel:
+    """Drop-in for `genai.GenerativeModel` exposing `generate_content(prompt, stream=False)`.
+
+    Sleeps `latency` (+/- `jitter`) seconds per call and answers with canned JSON for
+    every exam named in the prompt, keeping only the keys the prompt mentions. `error_rate`
+    injects 429s, and `max_concurrent` makes the fake server itself throttle callers that
+    exceed it. `latency_per_exam` adds generation time per answered exam, and answers for
+    more than `max_answer_exams` exams are cut off mid-JSON like a hit output limit. With
+    `stream=True` the answer arrives as one chunk per exam, each after its generation time.
+    """
+    model_name = 'fake'  # Keeps fake answers apart from Gemini's in the response cache
+
+    def __init__(self, latency: float = 1.0, jitter: float = 0.2, error_rate: float = 0.0, max_concurrent: int = 0, seed: int = 0,
+                 latency_per_exam: float = 0.0, max_answer_exams: int = 0):
+        self.latency = latency; self.jitter = jitter; self.error_rate = error_rate; self.max_concurrent = max_concurrent
+        self.latency_per_exam = latency_per_exam; self.max_answer_exams = max_answer_exams
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0; self.throttled = 0
+
+    @staticmethod
+    def exam_names_from_prompt(prompt: str) -> List[str]:
+        match = re.search(r"exams: (.*)\n", prompt)
+        return [name.strip() for name in match.group(1).split(',')] if match else []
+
+    @staticmethod
+    def answer(exam_name: str, prompt: str) -> dict:
+        return {key: value for key, value in canned_exam(exam_name).items() if key == 'exam_name' or re.search(rf"\b{key}\b", prompt)}
+
+    def answer_chunks(self, prompt: str, names: List[str]) -> List[str]:
+        """The answer split after each exam object, cut off past `max_answer_exams` exams."""
+        chunks = ['['] + [json.dumps(self.answer(name, prompt)) + (', ' if n < len(names) - 1 else '') for n, name in enumerate(names)] + [']']
+        if self.max_answer_exams and len(names) > self.max_answer_exams:
+            keep = len(''.join(chunks)) * self.max_answer_exams // len(names); out = []
+            for chunk in chunks:
+                if keep <= 0: break
+                out.append(chunk[:keep]); keep -= len(chunk)
+            chunks = out
+        return chunks
+
+    def _stream(self, chunks: List[str]) -> Iterator[FakeResponse]:
+        try:
+            for n, chunk in enumerate(chunks):
+                if 0 < n < len(chunks) - 1: time.sleep(self.latency_per_exam)
+                yield FakeResponse(chunk)
+        finally:
+            with self.lock: self.in_flight -= 1
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        with self.lock:
+            self.calls += 1; self.in_flight += 1
+            overloaded = self.max_concurrent and self.in_flight > self.max_concurrent
+            failed = overloaded or self.random.random() < self.error_rate
+            names = self.exam_names_from_prompt(prompt)
+            first_token = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            if failed: self.throttled += 1
+        try:
+            time.sleep(first_token if not failed else first_token / 10)
+            if failed: raise FakeAPIError(429, "Resource has been exhausted (e.g. check quota).")
+            chunks = self.answer_chunks(prompt, names)
+        except BaseException:
+            with self.lock: self.in_flight -= 1
+            raise
+        if stream: return self._stream(chunks)  # Releases its in-flight slot once fully read
+        try:
+            time.sleep(self.latency_per_exam * len(names))
+            return FakeResponse(''.join(chunks))
+        finally:
+            with self.lock: self.in_flight -= 1
+
+class ReplayModel:
+    """Answers every call with the next recorded response text (cycling), streamed in
+    `chunk_chars`-sized chunks `chunk_seconds` apart, or all at once after the same total time."""
+    model_name = 'replay'
+
+    def __init__(self, texts: List[str], chunk_chars: int = 64, chunk_seconds: float = 0.0):
+        self.texts = texts; self.chunk_chars = chunk_chars; self.chunk_seconds = chunk_seconds
+        self.lock = threading.Lock(); self.calls = 0
+
+    @classmethod
+    def from_fixtures(cls, path: str = FIXTURES, **options) -> 'ReplayModel':
+        """Replays the recorded answers in benchmarks/fixtures (or any JSON list of {"text": ...})."""
+        with open(path, encoding='utf-8') as f: return cls([fixture['text'] for fixture in json.load(f)], **options)
+
+    def _stream(self, text: str) -> Iterator[FakeResponse]:
+        for start in range(0, len(text), self.chunk_chars):
+            time.sleep(self.chunk_seconds); yield FakeResponse(text[start:start + self.chunk_chars])
+
+    def generate_content(self, prompt: str, stream: bool = False):
+        with self.lock: text = self.texts[self.calls % len(self.texts)]; self.calls += 1
+        if stream: return self._stream(text)
+        time.sleep(self.chunk_seconds * -(-len(text) // self.chunk_chars))
+        return FakeResponse(text)
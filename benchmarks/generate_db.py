@@ -0,0 +1,134 @@
+# benchmarks/generate_db.py
+# --- Synthetic jobs.db at benchmark scale (1k / 100k / 1M jobs) on the database_setup.py schema ---
+#
+#   python -m benchmarks.generate_db --size 100k --out /tmp/jobs-100k.db
+#
+# Jobs carry every dashboard column; about 60% were refreshed by the scout recently and the rest
+# are stale or never filled in, so the planner sees a realistic mix of needs. Cutoffs cover
+# 1-5 recent years and 4-7 categories per job: category gaps follow the usual UR > EWS/OBC >
+# SC > ST ordering, scores drift from year to year, and a few rows carry the free-text scores
+# and category spellings the model really returns ("142.5 marks", "Not released", "OBC-NCL").
+# Rows are bulk-loaded with indexes and search triggers dropped, then ensure_schema() rebuilds them
+# and the cutoff history/trend tables are backfilled from job_cutoffs.
+
+import argparse
+import datetime
+import os
+import random
+import sqlite3
+import time
+
+from database_setup import ensure_schema, cutoff_category_rank, SEARCH_COLUMNS, SEARCH_DOC_SELECT, SEARCH_TRIGGERS
+from cutoff_trends import backfill
+from benchmarks.bench_search import BODIES, POSTS, FIELDS, QUALS, STAGES
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+GENERATOR_VERSION = 3  # Bump when the generated data changes so cached DBs are rebuilt
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+
+CUTOFF_YEARS = (2020, 2021, 2022, 2023, 2024)
+# Category spellings -> points below the UR cutoff (as a share of the job's scale)
+CATEGORY_GAPS = [(('UR', 'General'), 0.0), (('EWS',), 0.03), (('OBC', 'OBC-NCL'), 0.04), (('SC',), 0.13), (('ST',), 0.18), (('PwBD',), 0.25), (('Ex-Servicemen',), 0.2)]
+MESSY_SCORES = ['Not released', 'N/A', 'TBA']
+GROUPS = [('A', 'Gazetted', (10, 14)), ('B', 'Gazetted', (7, 9)), ('B', 'Non-Gazetted', (6, 8)), ('C', 'Non-Gazetted', (2, 5))]
+PLACEHOLDERS = ['N/A', 'TBA', 'Information not available', '']
+
+def cutoff_rows(job_id: int, rng: random.Random) -> list:
+    scale = rng.choice((100, 200, 300, 600))  # Percentile vs raw-marks cutoffs
+    ur = rng.uniform(0.45, 0.92) * scale
+    groups = CATEGORY_GAPS[:1] + rng.sample(CATEGORY_GAPS[1:], rng.randrange(3, len(CATEGORY_GAPS)))
+    categories = [(rng.choice(spellings), gap) for spellings, gap in groups]
+    rows = []
+    for year in CUTOFF_YEARS[-rng.randrange(1, len(CUTOFF_YEARS) + 1):]:
+        ur = min(scale, max(scale * 0.2, ur * rng.uniform(0.94, 1.07)))  # Year-to-year drift
+        for category, gap in categories:
+            score = ur * (1 - gap * rng.uniform(0.8, 1.2))
+            roll = rng.random()
+            text = rng.choice(MESSY_SCORES) if roll < 0.01 else f"{score:.1f} marks" if roll < 0.04 else f"{score:.2f}"
+            rows.append((job_id, category, text, str(year), cutoff_category_rank(category)))
+    return rows
+
+def job_rows(job_id: int, rng: random.Random, now: datetime.datetime) -> tuple:
+    body, post, field = rng.choice(BODIES), rng.choice(POSTS), rng.choice(FIELDS)
+    group, gazetted, (low, high) = rng.choice(GROUPS); pay_level = rng.randint(low, high)
+    fresh = rng.random() < 0.6
+    age = rng.choice([None, 3, 30, 400])  # Days since the last scout refresh (None: never)
+    last_updated = (now - datetime.timedelta(days=rng.uniform(0, 5) if fresh else age)).isoformat() if fresh or age else None
+    filled = lambda value: value if fresh or rng.random() < 0.5 else rng.choice(PLACEHOLDERS)
+    start = now + datetime.timedelta(days=rng.randrange(-200, 200))
+    job = (job_id, f"{field} {post}", f"{body} {field} {post} Exam {job_id}", body, group, gazetted, pay_level,
+           f"₹{18_000 + pay_level * rng.randrange(4_000, 6_000):,}+", f"{rng.choice(QUALS)} in {field}", f"{rng.choice((18, 21))}-{rng.choice((27, 30, 32, 35))}",
+           rng.choice(('No PET', 'PET Required')),
+           filled(start.date().isoformat()), filled((start + datetime.timedelta(days=30)).date().isoformat()), filled((start + datetime.timedelta(days=90)).date().isoformat()),
+           filled(f"https://{body.lower().replace(' ', '')}.gov.in"), filled(f"₹{rng.choice((0, 100, 175, 500, 850))} (Gen/OBC), Nil (SC/ST/Female)"),
+           filled(f"Approx {rng.randrange(10, 5000)}"), filled(str(rng.choice(CUTOFF_YEARS[-2:]))), last_updated)
+    spec = (job_id, filled('Indian'), filled(job[10]), filled('OBC +3, SC/ST +5, PwBD +10'), filled(f"{rng.choice(QUALS)} in {field}"), filled(rng.choice(('6 (Gen)', 'Unlimited', '4'))), filled('N/A'), last_updated)
+    pattern = (job_id, filled(rng.choice(STAGES)), filled(str(rng.randrange(1, 10))), filled('MCQ + Descriptive'), filled(f"{rng.choice((1, 2, 3))} hours"), filled('-1/3 negative marking'), last_updated)
+    return job, spec if rng.random() > 0.05 else None, pattern if rng.random() > 0.05 else None, cutoff_rows(job_id, rng) if fresh or rng.random() < 0.3 else []
+
+def generate(path: str, n_jobs: int, seed: int = 0, chunk: int = 20_000) -> sqlite3.Connection:
+    """Builds a fresh DB at `path` (replacing any file there) and returns a connection to it."""
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix): os.remove(path + suffix)
+    rng = random.Random(seed); now = datetime.datetime.now()
+    conn = sqlite3.connect(path); conn.row_factory = sqlite3.Row
+    ensure_schema(conn)
+    conn.execute("PRAGMA journal_mode = OFF"); conn.execute("PRAGMA synchronous = OFF")
+    # Bulk load without per-row index/FTS maintenance; ensure_schema() below recreates both
+    for name in SEARCH_TRIGGERS: conn.execute(f"DROP TRIGGER {name}")
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'").fetchall(): conn.execute(f"DROP INDEX {name}")
+    for first in range(1, n_jobs + 1, chunk):
+        jobs, specs, patterns, cutoffs = [], [], [], []
+        for job_id in range(first, min(first + chunk, n_jobs + 1)):
+            job, spec, pattern, rows = job_rows(job_id, rng, now)
+            jobs.append(job); cutoffs.extend(rows)
+            if spec: specs.append(spec)
+            if pattern: patterns.append(pattern)
+        conn.executemany('''INSERT INTO jobs (id, post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status,
+                            application_start, application_end, exam_date, official_website, application_fee, vacancies, vacancies_year, last_updated)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', jobs)
+        conn.executemany('INSERT INTO job_specs (job_id, nationality, age_limits, age_relax, edu_qual, attempts, physical_std, last_updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', specs)
+        conn.executemany('INSERT INTO exam_pattern (job_id, stages, num_papers, q_type, duration, marking_scheme, last_updated) VALUES (?, ?, ?, ?, ?, ?, ?)', patterns)
+        conn.executemany('INSERT INTO job_cutoffs (job_id, category, score, year, category_rank) VALUES (?, ?, ?, ?, ?)', cutoffs)
+        conn.commit()
+    conn.execute(f"INSERT INTO job_search (rowid, {', '.join(SEARCH_COLUMNS)}) {SEARCH_DOC_SELECT}")
+    conn.execute("INSERT INTO job_search (job_search) VALUES ('optimize')")
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('generator', ?)", (f"v{GENERATOR_VERSION}:{n_jobs}:{seed}",))
+    conn.commit()
+    ensure_schema(conn)
+    backfill(conn); conn.commit()  # Cutoff history + trend aggregates for the bulk-loaded rows
+    conn.execute("PRAGMA journal_mode = WAL"); conn.execute("ANALYZE"); conn.commit()
+    return conn
+
+def cached_db(size: str, seed: int = 0, cache_dir: str = CACHE_DIR) -> str:
+    """Path of a generated DB for `size` (a SIZES key or a job count), built once and reused while GENERATOR_VERSION matches."""
+    n_jobs = SIZES[size] if size in SIZES else int(size)
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"jobs-{size}-s{seed}.db")
+    if os.path.exists(path):
+        conn = sqlite3.connect(path)
+        try: stamp = conn.execute("SELECT value FROM meta WHERE key = 'generator'").fetchone()
+        except sqlite3.Error: stamp = None
+        finally: conn.close()
+        if stamp and stamp[0] == f"v{GENERATOR_VERSION}:{n_jobs}:{seed}": return path
+    start = time.perf_counter()
+    print(f"🏗️ Generating {n_jobs:,} jobs into {path} ...")
+    generate(path, n_jobs, seed).close()
+    print(f"   done in {time.perf_counter() - start:.1f}s")
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic jobs.db for benchmarks.")
+    parser.add_argument('--size', default='1k', help=f"One of {', '.join(SIZES)} or a job count.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Output path (default: the benchmark cache in benchmarks/.data/).")
+    args = parser.parse_args()
+    if not args.out: cached_db(args.size, args.seed); return
+    n_jobs = SIZES[args.size] if args.size in SIZES else int(args.size)
+    start = time.perf_counter(); conn = generate(args.out, n_jobs, args.seed)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in ('jobs', 'job_specs', 'exam_pattern', 'job_cutoffs')}
+    conn.close()
+    print(f"✅ {args.out}: {', '.join(f'{n:,} {table}' for table, n in counts.items())} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
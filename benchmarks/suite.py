@@ -0,0 +1,173 @@
+# benchmarks/suite.py
+# --- Scenario benchmarks on generated jobs.db files, written as JSON for commit-to-commit comparison ---
+#
+#   python -m benchmarks.suite --sizes 1k 100k                     # -> benchmarks/results/<time>-<commit>.json
+#   python -m benchmarks.suite --sizes 1k --compare benchmarks/results/<earlier>.json
+#   python -m benchmarks.suite --only scout --model 'benchmarks.fake_model:FakeModel?latency=0.2'
+#
+# Scenarios: planner (plan_update_needs), writer (UpsertWriter load/stage/flush, rolled back),
+# index, details and trend (the routes, response cache off), search (/api/search) and scout
+# (phase 1 end to end against a pluggable fake model on its own stale DB). Generated DBs are
+# cached in benchmarks/.data/ (see generate_db.py). With --compare, median/mean timings that got
+# slower by more than --tolerance are flagged and the exit status is 1 (p95s are only reported).
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import app
+import db
+import data_scout
+from benchmarks.bench_dispatch import build_stale_db
+from benchmarks.bench_search import QUERIES
+from benchmarks.fake_model import canned_exam
+from benchmarks.generate_db import cached_db, SIZES
+
+SUITE_VERSION = 1
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_MODEL = 'benchmarks.fake_model:FakeModel?latency=0.05&jitter=0&latency_per_exam=0.005'
+
+def timings_ms(fn, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter(); fn(); samples.append((time.perf_counter() - start) * 1000)
+    return {'p50_ms': round(statistics.median(samples), 3), 'p95_ms': round(statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0], 3)}
+
+def use_db(path: str):
+    """Points the app at `path` with a fresh pool and the response/search caches off, so every request renders."""
+    app.DB_PATH = path; db.configure_pool(path); app.response_cache = app.VersionedLRU(0); app.search_cache = app.VersionedLRU(0)
+
+# --- Scenarios: (path, n_jobs, args) -> metrics ---
+def scenario_planner(path: str, n_jobs: int, args) -> dict:
+    conn = db.connect(path, readonly=True); threshold_date = data_scout.update_threshold_date(); planned = {}
+    def plan(): planned['needs'] = data_scout.plan_update_needs(conn.cursor(), threshold_date)[0]
+    result = timings_ms(plan, max(3, args.repeat // 10)); conn.close()
+    return {**result, 'jobs_needing_update': sum(1 for needs in planned['needs'].values() if any(needs.values()))}
+
+def scenario_writer(path: str, n_jobs: int, args) -> dict:
+    """Diffs and writes canned answers for --writer-jobs random jobs in 25-job batches; every batch is rolled back."""
+    rng = random.Random(1); conn = db.connect(path); threshold_date = data_scout.update_threshold_date()
+    writer = data_scout.UpsertWriter(); needs = {section: True for section in data_scout.SECTIONS}
+    job_ids = rng.sample(range(1, n_jobs + 1), min(args.writer_jobs, n_jobs)); per_job = []
+    for first in range(0, len(job_ids), 25):
+        batch = job_ids[first:first + 25]; answers = {}
+        for job_id in batch:
+            answer = canned_exam(f"Exam {job_id}"); answer['cutoffs'] = [{**cutoff, 'score': f"{rng.uniform(40, 100):.2f}"} for cutoff in answer['cutoffs']]
+            answers[job_id] = answer
+        start = time.perf_counter()
+        current = writer.load_current(conn, batch)
+        for job_id in batch: writer.stage(current, job_id, answers[job_id], needs, threshold_date)
+        writer.flush(conn)
+        per_job.append((time.perf_counter() - start) * 1e6 / len(batch))
+        conn.rollback()
+    conn.close()
+    return {'per_job_p50_us': round(statistics.median(per_job), 1), 'per_job_mean_us': round(statistics.fmean(per_job), 1),
+            'rows_written': sum(s['written'] for s in writer.stats.values()), 'rows_unchanged': sum(s['unchanged'] for s in writer.stats.values())}
+
+def scenario_index(path: str, n_jobs: int, args) -> dict:
+    use_db(path); client = app.app.test_client(); client.get('/')
+    return timings_ms(lambda: client.get('/'), args.repeat)
+
+def scenario_details(path: str, n_jobs: int, args) -> dict:
+    use_db(path); client = app.app.test_client(); rng = random.Random(2)
+    return timings_ms(lambda: client.get(f'/details/{rng.randrange(1, n_jobs + 1)}'), args.repeat)
+
+def scenario_trend(path: str, n_jobs: int, args) -> dict:
+    use_db(path); client = app.app.test_client(); rng = random.Random(4)
+    return timings_ms(lambda: client.get(f'/api/cutoffs/{rng.randrange(1, n_jobs + 1)}/trend'), args.repeat)
+
+def scenario_search(path: str, n_jobs: int, args) -> dict:
+    use_db(path); client = app.app.test_client(); queries = iter(QUERIES * args.repeat)
+    return timings_ms(lambda: client.get('/api/search', query_string={'q': next(queries)}), args.repeat)
+
+def scenario_scout(path: str, n_jobs: int, args) -> dict:
+    """Phase 1 over --scout-jobs jobs that all need a full refresh (independent of the generated size)."""
+    client = data_scout.load_model(args.model)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build_stale_db(os.path.join(tmp, 'scout.db'), args.scout_jobs)
+        planner = data_scout.BatchPlanner()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_scout.update_existing_jobs(conn, client=client, limiter=data_scout.RateLimiter(60_000, 100_000_000), max_workers=args.workers, planner=planner)
+        seconds = time.perf_counter() - start
+        done = conn.execute("SELECT COUNT(*) FROM scout_queue WHERE status = 'done'").fetchone()[0]
+        conn.close()
+    return {'seconds': round(seconds, 3), 'jobs_per_s': round(done / seconds, 1), 'done': done, 'calls': planner.calls, 'unusable': planner.failures}
+
+SCENARIOS = {'planner': scenario_planner, 'writer': scenario_writer, 'index': scenario_index, 'details': scenario_details, 'trend': scenario_trend, 'search': scenario_search, 'scout': scenario_scout}
+SIZE_INDEPENDENT = {'scout'}
+
+# --- Results ---
+def git_revision() -> dict:
+    run = lambda *cmd: subprocess.run(['git', *cmd], capture_output=True, text=True, cwd=os.path.dirname(RESULTS_DIR)).stdout.strip()
+    try: return {'commit': run('rev-parse', 'HEAD') or None, 'dirty': bool(run('status', '--porcelain', '--untracked-files=no'))}
+    except OSError: return {'commit': None, 'dirty': None}
+
+def lower_is_better(metric: str) -> bool:
+    return metric.endswith(('_ms', '_us', '_s', 'seconds')) and not metric.endswith('_per_s')
+
+def compare(base: dict, current: dict, tolerance: float) -> int:
+    """Prints every shared timing with its change and returns how many regressed past `tolerance`."""
+    regressions = 0
+    print(f"\n--- vs {(base.get('commit') or 'unknown')[:10]} ({base.get('created', '?')}) ---")
+    for key, metrics_now in current['results'].items():
+        for metric, value in metrics_now.items():
+            old = base.get('results', {}).get(key, {}).get(metric)
+            if not isinstance(old, (int, float)) or not isinstance(value, (int, float)) or not old: continue
+            timed = lower_is_better(metric) or metric.endswith('_per_s')
+            change = (value - old) / old; worse = change if lower_is_better(metric) else -change
+            flag = '' if not timed else (' ⚠️ slower' if 'p95' in metric else ' ⚠️ regression') if worse > tolerance else ' ✅ faster' if worse < -tolerance else ''
+            regressions += bool(timed and worse > tolerance and 'p95' not in metric)  # Tails are reported, not gated: too noisy
+            print(f"{key:<18} {metric:<20} {old:>12g} -> {value:<12g} {change:+7.1%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Scenario benchmarks on generated DBs, saved as JSON.")
+    parser.add_argument('--sizes', nargs='+', default=['1k', '100k'], help=f"Generated DB sizes: {', '.join(SIZES)} or job counts.")
+    parser.add_argument('--only', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeat', type=int, default=200, help="Requests per route scenario.")
+    parser.add_argument('--writer-jobs', type=int, default=2000)
+    parser.add_argument('--scout-jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--model', default=DEFAULT_MODEL, help="Model for the scout scenario ('package.module:factory[?key=value&...]').")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Results file (default: benchmarks/results/<time>-<commit>.json).")
+    parser.add_argument('--compare', help="Earlier results file to diff against.")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Slowdown flagged as a regression (0.15 = 15%%).")
+    args = parser.parse_args()
+
+    report = {'suite_version': SUITE_VERSION, **git_revision(), 'created': datetime.datetime.now().isoformat(timespec='seconds'),
+              'python': platform.python_version(), 'sqlite': sqlite3.sqlite_version, 'platform': platform.platform(), 'options': vars(args), 'results': {}}
+    for name in [name for name in args.only if name in SIZE_INDEPENDENT]:
+        print(f"▶️ {name} ({args.scout_jobs} jobs)")
+        report['results'][f"{name}@{args.scout_jobs}"] = result = SCENARIOS[name](None, args.scout_jobs, args); print(f"   {result}")
+    for size in args.sizes:
+        path = cached_db(size, args.seed)
+        with contextlib.closing(sqlite3.connect(path)) as conn: n_jobs = conn.execute("SELECT MAX(id) FROM jobs").fetchone()[0]
+        for name in [name for name in args.only if name not in SIZE_INDEPENDENT]:
+            print(f"▶️ {name} @ {size}")
+            report['results'][f"{name}@{size}"] = result = SCENARIOS[name](path, n_jobs, args); print(f"   {result}")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{(report['commit'] or 'nogit')[:7]}{'-dirty' if report['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as f: json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {out}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f: base = json.load(f)
+        regressions = compare(base, report, args.tolerance)
+        print(f"\n{regressions} regression(s) beyond {args.tolerance:.0%}")
+        if regressions: sys.exit(1)
+
+if __name__ == '__main__':
+    main()
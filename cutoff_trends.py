@@ -0,0 +1,145 @@
+# cutoff_trends.py
+# --- Append-only cutoff history and the per-job, per-category trend aggregates built from it ---
+# job_cutoffs only holds what the latest answer said; the scout replaces a job's rows on every
+# refresh. Each new or changed cutoff is also appended to cutoff_history as the next version of
+# its (job, category, year), with the score and year parsed to numbers once. In the same
+# transaction each (job, category) series that got a new version is re-aggregated:
+#   cutoff_trend_points  one row per year: latest score, year-over-year delta, moving average
+#   cutoff_trends        one row per series: span of years, latest/min/max/mean, latest delta,
+#                        and a JSON copy of its points so a trend read is a single range scan
+# A series has a handful of years, so an update reads its stored points (not the history),
+# recomputes them in Python and rewrites a few rows, however long the history grows. Tables are created by database_setup.
+
+import datetime
+import json
+import math
+import re
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TREND_WINDOW_YEARS = 3  # Moving average over this year and the two before it (years on record)
+TREND_DECIMALS = 2  # Rounding of deltas and averages
+JOBS_PER_STATEMENT = 500  # Job ids per IN (...) list
+
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?')
+_YEAR = re.compile(r'(?<!\d)(?:19|20)\d{2}(?!\d)')
+
+def parse_cutoff_score(text) -> Optional[float]:
+    """First number in a cutoff score ('142.5 marks', '88.20%', '1,050') or None ('Not released')."""
+    if isinstance(text, (int, float)) and not isinstance(text, bool): return float(text)
+    match = _NUMBER.search(str(text or '').replace(',', ''))
+    return float(match.group()) if match else None
+
+def parse_cutoff_year(text) -> Optional[int]:
+    """The (first) year a cutoff's year text names ('2023', '2023-24', 'CSE 2022') or None."""
+    if isinstance(text, int) and not isinstance(text, bool): return text
+    match = _YEAR.search(str(text or ''))
+    return int(match.group()) if match else None
+
+# Latest numeric score per (job, category, year) in history order, for full rebuilds
+_LATEST_SCORES = '''
+    SELECT job_id, category, year, score FROM (
+        SELECT job_id, category, year, score, ROW_NUMBER() OVER (PARTITION BY job_id, category, year ORDER BY id DESC) AS newest
+        FROM cutoff_history WHERE score IS NOT NULL AND year IS NOT NULL{where})
+    WHERE newest = 1'''
+# Versions and the newest category_rank per (job, category), read off idx_cutoff_history_key
+_SERIES_HISTORY = '''
+    SELECT job_id, category, COUNT(*), (SELECT category_rank FROM cutoff_history n WHERE n.job_id = h.job_id AND n.category = h.category ORDER BY id DESC LIMIT 1)
+    FROM cutoff_history h WHERE 1{where} GROUP BY job_id, category'''
+
+TREND_COLUMNS = ('category', 'category_rank', 'years', 'first_year', 'last_year', 'latest_score', 'latest_delta', 'moving_avg',
+                 'min_score', 'min_year', 'max_score', 'max_year', 'mean_score', 'versions', 'updated_at')
+POINT_COLUMNS = ('year', 'score', 'yoy_delta', 'moving_avg')
+
+def series_rows(job_id: int, category: str, by_year: Dict[int, float], category_rank, versions: int, updated_at: str) -> Tuple[list, tuple]:
+    """The cutoff_trend_points rows and the cutoff_trends row (its points copied in as JSON) of one series ({year: score})."""
+    years = sorted(by_year); points = []
+    for year in years:
+        window = [by_year[y] for y in years if year - TREND_WINDOW_YEARS < y <= year]
+        delta = round(by_year[year] - by_year[year - 1], TREND_DECIMALS) if year - 1 in by_year else None
+        points.append((job_id, category, year, by_year[year], delta, round(math.fsum(window) / len(window), TREND_DECIMALS)))
+    low = min(years, key=lambda year: (by_year[year], year)); high = max(years, key=lambda year: (by_year[year], year))
+    scores = list(by_year.values()); last = points[-1]  # fsum: the same mean whatever order the scores arrived in
+    return points, (job_id, category, category_rank, len(years), years[0], years[-1], last[3], last[4], last[5],
+                    by_year[low], low, by_year[high], high, round(math.fsum(scores) / len(scores), TREND_DECIMALS), versions, updated_at,
+                    json.dumps([dict(zip(POINT_COLUMNS, point[2:])) for point in points], separators=(',', ':')))
+
+def _write_series(conn: sqlite3.Connection, series: List[Tuple[list, tuple]]):
+    conn.executemany("INSERT INTO cutoff_trend_points (job_id, category, year, score, yoy_delta, moving_avg) VALUES (?, ?, ?, ?, ?, ?)", [point for points, _ in series for point in points])
+    conn.executemany('''INSERT INTO cutoff_trends (job_id, category, category_rank, years, first_year, last_year, latest_score, latest_delta, moving_avg,
+                          min_score, min_year, max_score, max_year, mean_score, versions, updated_at, points) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     [trend for _, trend in series])
+
+def refresh_trends(conn: sqlite3.Connection, job_ids: Optional[Iterable[int]] = None):
+    """Rebuilds the aggregates of every series of `job_ids` from history (None: all jobs), after
+    bulk loads that bypass record_cutoffs() or to repair them. The caller commits."""
+    now = datetime.datetime.now().isoformat()
+    if job_ids is not None: job_ids = sorted(set(job_ids))
+    for chunk in [None] if job_ids is None else [job_ids[first:first + JOBS_PER_STATEMENT] for first in range(0, len(job_ids), JOBS_PER_STATEMENT)]:
+        where, params = ('', []) if chunk is None else (f" AND job_id IN ({', '.join('?' * len(chunk))})", chunk)
+        for table in ('cutoff_trend_points', 'cutoff_trends'): conn.execute(f"DELETE FROM {table} WHERE 1{where}", params)
+        by_series: Dict[Tuple[int, str], Dict[int, float]] = {}
+        for job_id, category, year, score in conn.execute(_LATEST_SCORES.format(where=where), params): by_series.setdefault((job_id, category), {})[year] = score
+        history = {(row[0], row[1]): (row[2], row[3]) for row in conn.execute(_SERIES_HISTORY.format(where=where), params)}
+        _write_series(conn, [series_rows(job_id, category, by_year, history[job_id, category][1], history[job_id, category][0], now) for (job_id, category), by_year in by_series.items()])
+
+def record_cutoffs(conn: sqlite3.Connection, rows: List[tuple], recorded_at: Optional[str] = None) -> int:
+    """Appends (job_id, category, score, year, category_rank) rows, as job_cutoffs stores them, to
+    the history (skipping any equal to their key's latest version) and updates the aggregates of
+    just the (job, category) series that got a new version: their few stored points plus the new
+    scores are re-aggregated in Python and written back. Returns the number of versions added.
+    The caller commits."""
+    if not rows: return 0
+    recorded_at = recorded_at or datetime.datetime.now().isoformat()
+    job_ids = sorted({row[0] for row in rows}); in_jobs = lambda chunk: f"job_id IN ({', '.join('?' * len(chunk))})"
+    chunks = [job_ids[first:first + JOBS_PER_STATEMENT] for first in range(0, len(job_ids), JOBS_PER_STATEMENT)]
+    latest: Dict[Tuple[Any, ...], Tuple[int, Any]] = {}; versions: Dict[Tuple[Any, ...], int] = {}
+    for chunk in chunks:
+        for row in conn.execute(f"SELECT job_id, category, year_text, version, score_text FROM cutoff_history WHERE {in_jobs(chunk)} ORDER BY version", chunk):
+            latest[(row[0], row[1], row[2])] = (row[3], row[4]); versions[row[0], row[1]] = versions.get((row[0], row[1]), 0) + 1
+    history = []; touched: Dict[Tuple[int, str], list] = {}  # (job, category) -> [versions added, newest rank, {year: newest score}]
+    for job_id, category, score, year, category_rank in rows:
+        key = (job_id, str(category), str(year)); version, previous = latest.get(key, (0, None))
+        if version and str(previous) == str(score): continue
+        latest[key] = (version + 1, score); year_number, score_number = parse_cutoff_year(year), parse_cutoff_score(score)
+        history.append(key + (str(score) if score is not None else None, year_number, score_number, category_rank, version + 1, recorded_at))
+        series = touched.setdefault(key[:2], [0, None, {}]); series[0] += 1; series[1] = category_rank
+        if year_number is not None and score_number is not None: series[2][year_number] = score_number
+    if not history: return 0
+    conn.executemany("INSERT INTO cutoff_history (job_id, category, year_text, score_text, year, score, category_rank, version, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", history)
+
+    # The touched series' stored points (a primary-key prefix scan) plus their new scores
+    points: Dict[Tuple[int, str], Dict[int, float]] = {}
+    for chunk in chunks:
+        for job_id, category, year, score in conn.execute(f"SELECT job_id, category, year, score FROM cutoff_trend_points WHERE {in_jobs(chunk)}", chunk):
+            if (job_id, category) in touched: points.setdefault((job_id, category), {})[year] = score
+    changed = []
+    for (job_id, category), (added, category_rank, scores) in touched.items():
+        by_year = {**points.get((job_id, category), {}), **scores}
+        if by_year: changed.append(series_rows(job_id, category, by_year, category_rank, versions.get((job_id, category), 0) + added, recorded_at))  # Else: no numeric score yet
+    keys = [trend[:2] for _, trend in changed]
+    for table in ('cutoff_trend_points', 'cutoff_trends'): conn.executemany(f"DELETE FROM {table} WHERE job_id = ? AND category = ?", keys)
+    _write_series(conn, changed)
+    return len(history)
+
+def backfill(conn: sqlite3.Connection) -> int:
+    """Seeds history with every job_cutoffs row it lacks (as version 1) and rebuilds all aggregates.
+    Used when the tables are first created and after bulk loads that bypass record_cutoffs()."""
+    conn.create_function('parse_cutoff_score', 1, parse_cutoff_score, deterministic=True)
+    conn.create_function('parse_cutoff_year', 1, parse_cutoff_year, deterministic=True)
+    added = conn.execute('''
+        INSERT INTO cutoff_history (job_id, category, year_text, score_text, year, score, category_rank, version, recorded_at)
+        SELECT c.job_id, IFNULL(c.category, 'N/A'), IFNULL(c.year, 'N/A'), c.score, parse_cutoff_year(c.year), parse_cutoff_score(c.score), c.category_rank, 1, ?
+        FROM job_cutoffs c WHERE c.job_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM cutoff_history h WHERE h.job_id = c.job_id AND h.category = IFNULL(c.category, 'N/A') AND h.year_text = IFNULL(c.year, 'N/A'))
+        ORDER BY c.id''', (datetime.datetime.now().isoformat(),)).rowcount
+    refresh_trends(conn)
+    return added
+
+def load_trend(conn: sqlite3.Connection, job_id: int) -> List[Dict[str, Any]]:
+    """The job's series in details-page category order, each with its yearly points (oldest first).
+    One primary-key range scan of cutoff_trends: the points are stored there as JSON."""
+    series = [{**dict(zip(TREND_COLUMNS, row[:-1])), 'points': json.loads(row[-1])}
+              for row in conn.execute(f"SELECT {', '.join(TREND_COLUMNS)}, points FROM cutoff_trends WHERE job_id = ?", (job_id,))]
+    series.sort(key=lambda trend: (trend['category_rank'] is not None, trend['category_rank'] or 0, trend['category']))  # SQL order: NULL ranks first
+    return series
@@ -2,116 +2,403 @@
 # --- FINAL version with corrected indentation and robust error handling ---
 
 import sqlite3
-import google.generativeai as genai
 import os
 import json
 import time
 import datetime
-import difflib
-from typing import List, Dict, Any, Optional
+import random
+import argparse
+import threading
+import socket
+import uuid
+import queue
+import cProfile
+import pstats
+import importlib
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator
+
+import db
+import metrics
+from database_setup import ensure_schema, bump_data_version, write_meta, cutoff_category_rank, DETAIL_COLUMNS
+from response_cache import ResponseCache, make_cache_key
+from name_index import NameIndex, match_many
+from json_stream import JsonArrayStream
+from cutoff_trends import record_cutoffs
 
 # --- Configuration ---
-# REPLACE WITH YOUR ACTUAL API KEY
-API_KEY = "PASTE_YOUR_GEMINI_API_KEY_HERE"
-genai.configure(api_key=API_KEY)
+# REPLACE WITH YOUR ACTUAL API KEY (or set GEMINI_API_KEY)
+API_KEY = os.environ.get('GEMINI_API_KEY', "PASTE_YOUR_GEMINI_API_KEY_HERE")
 
 # Using the stable endpoint for the Pro model as discussed
-model = genai.GenerativeModel(
-    'gemini-1.5-pro-latest',
-    generation_config={"response_mime_type": "application/json"}
-)
-BATCH_SIZE = 5
+MODEL_NAME = 'gemini-1.5-pro-latest'
 UPDATE_THRESHOLD_DAYS = 7
 
+# --- Batch Planning Configuration ---
+# Update batches are packed by estimated output tokens instead of a fixed exam count. Exams that
+# need the same sections share a batch whose prompt asks only for those sections, so a
+# cutoffs-only batch carries several times more exams than a full refresh. BatchPlanner scales
+# the budget down on unparseable/incomplete or slow answers and back up while batches succeed.
+SECTION_OUTPUT_TOKENS = {'main': 200, 'specs': 200, 'pattern': 150, 'cutoffs': 250}
+BATCH_OUTPUT_TOKENS = 4000  # Five full-refresh exams, the old fixed BATCH_SIZE
+MIN_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 25
+MIN_BUDGET_SCALE = 0.125
+MAX_BUDGET_SCALE = 2.0
+TARGET_BATCH_SECONDS = 60.0
+DISCOVERY_PROMPT_TOKENS = 1500  # Existing exam names listed in the phase 2 prompt (newest first)
+DISCOVERY_MAX_NEW = 5
+
+# --- Dispatcher / Rate Limit Configuration ---
+# Several batches are kept in flight at once; the token bucket keeps us inside the API quota
+# and 429/5xx responses trigger a shared exponential backoff instead of a fixed pause.
+MAX_CONCURRENT_BATCHES = 4
+REQUESTS_PER_MINUTE = 10
+TOKENS_PER_MINUTE = 250_000
+MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+MAX_CONSECUTIVE_ERRORS = 2
+STREAM_RESPONSES = True  # Parse answers while they generate so exams are written as they arrive
+BATCH_DONE = object()  # Queued after a batch's last streamed item
+
+# --- Work Queue Configuration ---
+LEASE_SECONDS = 600
+MAX_TASK_ATTEMPTS = 3
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# --- Response Cache Configuration ---
+# Bump PROMPT_VERSION whenever build_prompt() changes so stale answers are not reused.
+PROMPT_VERSION = 2
+CACHE_TTL_HOURS = 48
+DISCOVERY_CACHE_TTL_HOURS = 3  # "What's new" goes stale fast: only long enough to resume a crashed run
+CACHE_MAX_MB = 64
+
 # --- Find the database and define the status flag file ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'jobs.db')
 STATUS_FLAG_FILE = os.path.join(BASE_DIR, 'update_in_progress.flag')
+CACHE_DB_PATH = os.path.join(BASE_DIR, 'scout_cache.db')
+# Spans go to JSON-lines; the Prometheus snapshot is appended to the dashboard's /metrics
+METRICS_JSONL_PATH = os.path.join(BASE_DIR, 'scout_metrics.jsonl')
+METRICS_PROM_PATH = os.path.join(BASE_DIR, 'scout_metrics.prom')
+METRICS_PREFIX = 'gjt_scout_'
+PROFILE_PATH = os.path.join(BASE_DIR, 'scout.prof')
+PROFILE_TOP = 25
 
 def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    # WAL lets the dashboard keep reading while the scout writes; other scout workers may hold the write lock briefly
+    return db.connect(DB_PATH)
+
+# --- Model ---
+# google.generativeai is imported and configured on the first real call, not at import time, so
+# the planner, writer and benchmarks run offline. set_model() / --model plug in any object with
+# generate_content(prompt, stream=...) instead (e.g. benchmarks.fake_model:FakeModel).
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """The model used when no `client` is passed: the plugged-in one, else Gemini (configured once)."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=API_KEY)
+            _model = genai.GenerativeModel(MODEL_NAME, generation_config={"response_mime_type": "application/json"})
+        return _model
+
+def set_model(client):
+    global _model
+    with _model_lock: _model = client
+
+def load_model(spec: str):
+    """Builds a model from 'package.module:factory[?key=value&...]'; values are passed as keyword
+    arguments (parsed as JSON where possible, e.g. latency=0.2). 'gemini' means the default (None)."""
+    if spec == 'gemini': return None
+    target, _, query = spec.partition('?')
+    module_name, _, attr = target.partition(':')
+    if not attr: raise ValueError(f"Model spec '{spec}' should look like 'package.module:factory'")
+    def value(text: str):
+        try: return json.loads(text)
+        except ValueError: return text
+    options = {key: value(text) for key, text in urllib.parse.parse_qsl(query)}
+    factory = importlib.import_module(module_name)
+    for name in attr.split('.'): factory = getattr(factory, name)  # e.g. ReplayModel.from_fixtures
+    return factory(**options)
+
+def model_name_of(client) -> str:
+    """Name used in cache keys; never instantiates the default model (so --cache-only stays offline)."""
+    return str(getattr(client or _model, 'model_name', None) or MODEL_NAME).removeprefix('models/')
+
+# --- Rate Limiting ---
+
+class RetryableModelError(Exception):
+    """Raised for API errors worth retrying (rate limited or server side)."""
+
+def is_retryable_error(exc: Exception) -> bool:
+    """True for 429/5xx style errors from the model client."""
+    code = getattr(exc, 'code', None)
+    if isinstance(code, int) and code in RETRYABLE_STATUS_CODES: return True
+    message = str(exc).lower()
+    return '429' in message or 'resource has been exhausted' in message or 'quota' in message
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used for TPM budgeting."""
+    return max(1, len(text) // 4)
+
+class RateLimiter:
+    """Thread-safe dual token bucket (requests/minute + tokens/minute) with AIMD backoff.
+
+    `acquire()` blocks until both buckets can cover the request. `on_throttled()` pauses
+    every caller for the backoff delay and halves the effective rate; `on_success()`
+    slowly restores it.
+    """
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE, tokens_per_minute: float = TOKENS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.request_allowance = float(requests_per_minute)
+        self.token_allowance = float(tokens_per_minute)
+        self.rate_scale = 1.0
+        self.blocked_until = 0.0
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def describe(self) -> str:
+        return f"{self.requests_per_minute:g} req/min, {self.tokens_per_minute:g} tokens/min"
+
+    def _refill(self, now: float):
+        elapsed_minutes = (now - self.last_refill) / 60.0
+        self.last_refill = now
+        self.request_allowance = min(self.requests_per_minute, self.request_allowance + elapsed_minutes * self.requests_per_minute * self.rate_scale)
+        self.token_allowance = min(self.tokens_per_minute, self.token_allowance + elapsed_minutes * self.tokens_per_minute * self.rate_scale)
+
+    def acquire(self, tokens: int = 1):
+        """Blocks until one request carrying `tokens` tokens fits in both buckets."""
+        tokens = min(tokens, self.tokens_per_minute)  # Oversized prompts must not wait forever
+        while True:
+            with self.lock:
+                now = time.monotonic(); self._refill(now)
+                if now >= self.blocked_until and self.request_allowance >= 1 and self.token_allowance >= tokens:
+                    self.request_allowance -= 1; self.token_allowance -= tokens
+                    return
+                request_wait = max(0.0, 1 - self.request_allowance) * 60.0 / (self.requests_per_minute * self.rate_scale)
+                token_wait = max(0.0, tokens - self.token_allowance) * 60.0 / (self.tokens_per_minute * self.rate_scale)
+                wait = max(self.blocked_until - now, request_wait, token_wait, 0.01)
+            time.sleep(wait)
+
+    def on_throttled(self, delay: float):
+        """Pauses all callers for `delay` seconds and halves the effective rate."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.rate_scale = max(0.1, self.rate_scale / 2)
+
+    def on_success(self):
+        with self.lock: self.rate_scale = min(1.0, self.rate_scale + 0.1)
+
+def call_with_backoff(fn: Callable[[], Any], limiter: Optional[RateLimiter] = None, max_retries: int = MAX_RETRIES) -> Any:
+    """Calls `fn`, retrying RetryableModelError with jittered exponential backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            result = fn()
+            if limiter: limiter.on_success()
+            return result
+        except RetryableModelError as e:
+            if attempt == max_retries: print(f"   ❌ Giving up after {max_retries} retries: {e}"); return None
+            delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt) * random.uniform(0.8, 1.2)
+            print(f"   ⏳ Throttled ({e}). Backing off {delay:.1f}s (retry {attempt + 1}/{max_retries})")
+            if limiter: limiter.on_throttled(delay)
+            else: time.sleep(delay)
+    return None
+
+# --- Batch Planning ---
+SECTIONS = tuple(SECTION_OUTPUT_TOKENS)
+
+def needed_sections(needs: Dict[str, bool]) -> Tuple[str, ...]:
+    return tuple(section for section in SECTIONS if needs.get(section))
+
+def estimate_output_tokens(sections: Tuple[str, ...], n_exams: int) -> int:
+    return n_exams * sum(SECTION_OUTPUT_TOKENS[section] for section in sections or SECTIONS)
+
+def response_usage(response: Any, prompt: str, text: str) -> Tuple[int, int]:
+    """(tokens sent, tokens received) from the response's usage metadata, estimated when it has none."""
+    usage = getattr(response, 'usage_metadata', None)
+    sent, received = getattr(usage, 'prompt_token_count', None), getattr(usage, 'candidates_token_count', None)
+    return (sent if isinstance(sent, int) else estimate_tokens(prompt), received if isinstance(received, int) else estimate_tokens(text))
+
+class BatchPlanner:
+    """Thread-safe batch sizing plus a ledger of what each model call cost.
+
+    `batch_size(sections)` is how many exams needing `sections` fit the current output budget.
+    `observe()` runs after every model call: an answer that fails to parse or covers under half
+    the batch halves the budget (once per size: batches already above the current size were
+    sent before the last cut), one slower than `target_seconds` trims it by a fifth, and any
+    other answer grows it a little (the same AIMD shape as RateLimiter). Each cut also halves
+    that growth step, so a budget that keeps overshooting probes upward less and less often.
+    """
+    def __init__(self, output_budget: int = BATCH_OUTPUT_TOKENS, target_seconds: float = TARGET_BATCH_SECONDS, min_size: int = MIN_BATCH_SIZE, max_size: int = MAX_BATCH_SIZE):
+        self.output_budget = output_budget; self.target_seconds = target_seconds
+        self.min_size = min_size; self.max_size = max_size
+        self.budget_scale = 1.0; self.growth = 0.05
+        self.calls = 0; self.failures = 0; self.tokens_sent = 0; self.tokens_received = 0
+        self.lock = threading.Lock()
+
+    def describe(self) -> str:
+        return f"~{self.output_budget * self.budget_scale:,.0f} output tokens"
+
+    def _size(self, sections: Optional[Tuple[str, ...]]) -> int:
+        return max(self.min_size, min(self.max_size, int(self.output_budget * self.budget_scale // estimate_output_tokens(sections, 1))))
+
+    def batch_size(self, sections: Tuple[str, ...]) -> int:
+        with self.lock: return self._size(sections)
+
+    def observe(self, asked: int, answered: Optional[int], seconds: float, sent: int, received: int, sections: Optional[Tuple[str, ...]] = None):
+        """Records one model call. `answered` is the number of items parsed, None if the answer was unusable."""
+        with self.lock:
+            self.calls += 1; self.tokens_sent += sent; self.tokens_received += received
+            if answered is None or answered * 2 < asked:
+                self.failures += 1
+                if asked <= self._size(sections): self.budget_scale = max(MIN_BUDGET_SCALE, self.budget_scale / 2); self.growth = max(0.005, self.growth / 2)
+            elif seconds > self.target_seconds: self.budget_scale = max(MIN_BUDGET_SCALE, self.budget_scale * 0.8)
+            else: self.budget_scale = min(MAX_BUDGET_SCALE, self.budget_scale + self.growth)
+
+    def usage(self, fields_updated: int) -> str:
+        with self.lock: sent, received, calls, failures = self.tokens_sent, self.tokens_received, self.calls, self.failures
+        per_field = f"{(sent + received) / fields_updated:,.0f} tokens per field updated" if fields_updated else "no fields updated yet"
+        return f"{sent:,} tokens sent / {received:,} received in {calls} calls ({failures} unusable), {fields_updated} fields updated: {per_field}"
+
+def pack_names(names: List[str], token_budget: int) -> List[str]:
+    """The leading names whose ', '-joined list fits in `token_budget` (always at least one)."""
+    budget_chars = token_budget * 4; used = 0
+    for n, name in enumerate(names):
+        used += len(name) + 2
+        if used > budget_chars and n: return names[:n]
+    return list(names)
 
 # --- Helper Functions ---
 
-def find_best_match(exam_name_db: str, results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    """Finds the best matching result from the API response list."""
+def result_names(results: List[Dict[str, Any]]) -> List[str]:
+    return [item.get('exam_name', '') if isinstance(item, dict) else '' for item in results]
+
+@metrics.timed()
+def find_best_match(exam_name_db: str, results: List[Dict[str, Any]], verbose: bool = True, index: Optional[NameIndex] = None) -> Optional[Dict[str, Any]]:
+    """Finds the best matching result from the API response list: exact (case-insensitive),
+    then fuzzy (difflib ratio >= 0.8), then a unique substring. Pass a NameIndex built over
+    `results` to reuse it across lookups."""
     if not results: return None
-    names_in_api = [item.get('exam_name', '') for item in results]
-    
-    # 1. Exact match (case-insensitive)
-    for item in results:
-        if exam_name_db.lower() == item.get('exam_name', '').lower(): return item
-        
-    # 2. Fuzzy match
-    match = difflib.get_close_matches(exam_name_db, names_in_api, n=1, cutoff=0.8)
-    if match:
-        for item in results:
-            if item.get('exam_name', '') == match[0]:
-                print(f"   (Fuzzy matched '{exam_name_db}' -> '{match[0]}')")
-                return item
-                
-    # 3. Substring match
-    possible_matches = []
-    for item in results:
-        api_name_lower = item.get('exam_name', '').lower()
-        db_name_lower = exam_name_db.lower()
-        if db_name_lower in api_name_lower: possible_matches.append(item)
-        
-    if len(possible_matches) == 1:
-         print(f"   (Unique substring match: '{exam_name_db}' -> '{possible_matches[0].get('exam_name', '')}')")
-         return possible_matches[0]
-         
-    print(f"   No reliable match found for '{exam_name_db}' in API results.")
-    return None
+    match = (index or NameIndex(result_names(results))).match(exam_name_db)
+    if match['reason'] == 'fuzzy' and verbose: print(f"   (Fuzzy matched '{exam_name_db}' -> '{match['candidate']}')")
+    if match['reason'] == 'substring' and verbose: print(f"   (Unique substring match: '{exam_name_db}' -> '{match['candidate']}')")
+    if match['index'] is None:
+        if verbose: print(f"   No reliable match found for '{exam_name_db}' in API results.")
+        return None
+    return results[match['index']]
 
-def ask_gemini_batch(exam_names: List[str], find_new=False) -> Optional[List[Dict[str, Any]]]:
-    """Sends a batch prompt to Gemini, expects JSON list."""
-    print("   Sending request to Gemini...")
+# What each section asks the model for, and how that part of the example answer looks
+SECTION_FIELDS = {
+    'main': 'application_start, application_end, exam_date, application_fee, official_website, vacancies (string, e.g., "Approx 1050" or "To be announced"), vacancies_year (string, e.g., "2025")',
+    'specs': f'"job_specs" object with {", ".join(DETAIL_COLUMNS["job_specs"])}',
+    'pattern': f'"exam_pattern" object with {", ".join(DETAIL_COLUMNS["exam_pattern"])}',
+    'cutoffs': '"cutoffs" array with category/score, plus the "year" of those cutoffs',
+}
+SECTION_EXAMPLES = {
+    'main': '"exam_date": "2025-05-25", "vacancies": "Approx 1100", "vacancies_year": "2024"',
+    'specs': '"job_specs": {"nationality": "Indian", "attempts": "6 (Gen)", ...}',
+    'pattern': '"exam_pattern": {"stages": "Prelims, Mains, Interview", ...}',
+    'cutoffs': '"cutoffs": [{"category": "UR", "score": "95.5"}], "year": "2023"',
+}
+
+def build_prompt(exam_names: List[str], find_new=False, sections: Optional[Tuple[str, ...]] = None) -> str:
+    """Builds the phase 1 (details) or phase 2 (discovery) prompt for a batch.
+
+    Phase 1 asks only for `sections` (default: all of them)."""
     if find_new:
         prompt = f"""
         Act as a government job notification expert. Search reliable sources for RECENTLY announced or upcoming major Indian government job exams that are LIKELY NOT in this list: {', '.join(exam_names)}.
-        For each NEW exam you find (up to 5), provide the core details. Return ONLY a single, valid JSON array. Each object MUST contain keys: post_name, exam_name, conducting_body, group, gazetted_status, pay_level, salary, eligibility, age_limit, pet_status.
+        For each NEW exam you find (up to {DISCOVERY_MAX_NEW}), provide the core details. Return ONLY a single, valid JSON array. Each object MUST contain keys: post_name, exam_name, conducting_body, group, gazetted_status, pay_level, salary, eligibility, age_limit, pet_status.
         Example: [{{"post_name": "Stenographer Grade C", "exam_name": "SSC Stenographer Exam", ...}}]
         If no new relevant exams are found, return an empty array [].
         """
     else:
+        sections = sections or SECTIONS
+        example = '{"exam_name": "UPSC CSE", ' + ', '.join(SECTION_EXAMPLES[section] for section in sections) + '}'
         prompt = f"""
         For EACH of these Indian government exams: {', '.join(exam_names)}
-        Provide complete, accurate details (nationality, age_limits, age_relax, edu_qual, attempts, physical_std, stages, num_papers, q_type, duration, marking_scheme, application_start, application_end, exam_date, application_fee, official_website,
-        vacancies (string, e.g., "Approx 1050" or "To be announced"),
-        vacancies_year (string, e.g., "2025"),
-        cutoffs array with category/score, year).
+        Provide ONLY these accurate details: {'; '.join(SECTION_FIELDS[section] for section in sections)}.
         Prioritize official sources. Return ONLY a single, valid JSON array. Each object MUST contain the key "exam_name" matching the input exactly. Use "Information not available" for missing fields.
-        Example: {{"exam_name": "UPSC CSE", ..., "vacancies": "Approx 1100", "vacancies_year": "2024", "cutoffs": [{{"category": "UR", "score": "95.5"}}], "year": "2023"}}
+        Example: {example}
         """
-    try:
-        response = model.generate_content(prompt)
-        print(f"   Raw Snippet: {response.text[:200]}...")
-        if not response.text or not response.text.strip().startswith('['):
-             print(f"   ❌ ERROR: Received non-JSON or empty response: {response.text[:100]}")
-             return None
-        data = json.loads(response.text)
-        if isinstance(data, list):
-            print(f"   Received valid JSON list ({len(data)} items).")
-            return data
-        else:
-            print(f"   ❌ ERROR: Expected JSON list, got {type(data)}")
-            return None
-    except json.JSONDecodeError as e:
-        print(f"   ❌ JSON Parsing Error: {e}.")
-        return None
-    except Exception as e:
-        print(f"   ❌ Gemini API Error: {e}")
+    return prompt
+
+def response_chunks(response: Any) -> Iterator[str]:
+    """Text of each chunk of a streamed response, or the whole text of a plain one."""
+    for chunk in (response if STREAM_RESPONSES else [response]):
+        try: text = chunk.text
+        except ValueError: continue  # Chunks without text parts (e.g. the final safety/usage chunk)
+        if text: yield text
+
+def ask_gemini_batch(exam_names: List[str], find_new=False, client=None, limiter: Optional[RateLimiter] = None, sections: Optional[Tuple[str, ...]] = None, planner: Optional[BatchPlanner] = None,
+                     on_item: Optional[Callable[[Any], None]] = None) -> Optional[List[Dict[str, Any]]]:
+    """Sends a batch prompt to Gemini, expects JSON list.
+
+    `client` defaults to get_model() (anything with `generate_content`).
+    The answer is streamed through a JsonArrayStream: each element is handed to `on_item` as
+    soon as it is complete, and malformed or cut-off elements are skipped without losing the
+    rest. Returns the elements parsed, or None if the answer held no usable array.
+    Raises RetryableModelError on 429/5xx (before anything was parsed) so callers can back off.
+    Every answered call is reported to `planner` (items parsed, latency, tokens).
+    """
+    prompt = build_prompt(exam_names, find_new, sections)
+    if limiter: limiter.acquire(estimate_tokens(prompt) + estimate_output_tokens(sections, DISCOVERY_MAX_NEW if find_new else len(exam_names)))
+    print("   Sending request to Gemini...")
+    started = time.monotonic(); response = None; parser = JsonArrayStream(); items = []; text = []
+    with metrics.span('ask_gemini_batch', kind='discover' if find_new else 'update') as span:
+        try:
+            response = (client or get_model()).generate_content(prompt, stream=STREAM_RESPONSES)
+            for chunk in response_chunks(response):
+                text.append(chunk)
+                for item in parser.feed(chunk):
+                    items.append(item)
+                    if on_item: on_item(item)
+        except Exception as e:
+            if is_retryable_error(e) and not items: raise RetryableModelError(str(e)) from e
+            print(f"   ❌ Gemini API Error: {e}" + (f" (keeping the {len(items)} items already received)" if items else ""))
+            if not items: return None
+        finally:
+            span.set(exams=len(exam_names), prompt_bytes=len(prompt.encode('utf-8')), bytes=sum(len(chunk.encode('utf-8')) for chunk in text), items=len(items), skipped=parser.skipped)
+            if planner and response is not None:
+                # Discovery may rightly find nothing, so only unusable answers count against it
+                answered = len(items) if items or parser.complete else None
+                planner.observe(0 if find_new else len(exam_names), answered, time.monotonic() - started, *response_usage(response, prompt, ''.join(text)), sections)
+    raw = ''.join(text)
+    print(f"   Raw Snippet: {raw[:200]}...")
+    if not parser.started:
+        print(f"   ❌ ERROR: Received non-JSON or empty response: {raw[:100]}")
         return None
+    if parser.skipped or not parser.complete:
+        print(f"   ⚠️ Salvaged {len(items)} items ({parser.skipped} malformed skipped{', answer cut off' if not parser.complete else ''}).")
+        return items or None
+    print(f"   Received valid JSON list ({len(items)} items).")
+    return items
+
+PLACEHOLDER_VALUES = ('', 'n/a', 'not available', 'information not available', 'tba', 'none')
 
 def is_valid_data(value: Optional[str]) -> bool:
     """Helper to check if a string is not empty, None, or a placeholder."""
-    return value is not None and value.strip().lower() not in ['', 'n/a', 'not available', 'information not available', 'tba', 'none']
+    return value is not None and value.strip().lower() not in PLACEHOLDER_VALUES
+
+def sql_is_placeholder(column: str) -> str:
+    """SQL twin of `not is_valid_data(column)`, so placeholder detection runs inside SQLite."""
+    values = ", ".join(f"'{v}'" for v in PLACEHOLDER_VALUES)
+    return f"({column} IS NULL OR trim({column}, ' ' || char(9, 10, 11, 12, 13)) COLLATE NOCASE IN ({values}))"
 
+def sql_is_stale(column: str) -> str:
+    """SQL twin of `not ts or ts < threshold` (threshold bound as :threshold)."""
+    return f"({column} IS NULL OR {column} = '' OR {column} < :threshold)"
+
+@metrics.timed()
 def check_update_needs(cursor, job_id: int, threshold_date: str) -> Dict[str, bool]:
-    """Checks which specific sections/fields need updating for a job."""
+    """Checks which specific sections/fields need updating for a job (per-job reference for plan_update_needs)."""
     needs = {'main': False, 'specs': False, 'pattern': False, 'cutoffs': False}
     reason = []
     
@@ -148,133 +435,568 @@ def check_update_needs(cursor, job_id: int, threshold_date: str) -> Dict[str, bo
     if any(needs.values()): print(f"   Job ID {job_id} needs update. Reasons: {', '.join(reason)}")
     return needs
 
+# One row per job: every reason flag is computed by SQLite and packed into a bitmask, and LEFT JOINs
+# stand in for the per-job lookups. The ordered (reason, section) pairs mirror check_update_needs().
+PLAN_REASONS = [
+    ("main ts old", 'main', sql_is_stale('j.last_updated')),
+    ("website", 'main', sql_is_placeholder('j.official_website')),
+    ("fee", 'main', sql_is_placeholder('j.application_fee')),
+    ("dates", 'main', f"({sql_is_placeholder('j.application_start')} OR {sql_is_placeholder('j.application_end')} OR {sql_is_placeholder('j.exam_date')})"),
+    ("vacancies", 'main', f"({sql_is_placeholder('j.vacancies')} OR {sql_is_placeholder('j.vacancies_year')})"),
+    ("specs ts old", 'specs', f"(s.id IS NULL OR {sql_is_stale('s.last_updated')})"),
+    ("specs fields", 'specs', f"(s.id IS NULL OR {sql_is_placeholder('s.nationality')} OR {sql_is_placeholder('s.attempts')})"),
+    ("pattern ts old", 'pattern', f"(p.id IS NULL OR {sql_is_stale('p.last_updated')})"),
+    ("pattern fields", 'pattern', f"(p.id IS NULL OR {sql_is_placeholder('p.stages')} OR {sql_is_placeholder('p.marking_scheme')})"),
+]
+PLAN_QUERY = (
+    "SELECT j.id, " + " | ".join(f"({expr} << {n})" for n, (_, _, expr) in enumerate(PLAN_REASONS)) + " AS reason_mask,"
+    " c.job_id IS NULL AS no_cutoffs"
+    " FROM jobs j"
+    " LEFT JOIN job_specs s ON s.job_id = j.id"
+    " LEFT JOIN exam_pattern p ON p.job_id = j.id"
+    " LEFT JOIN (SELECT DISTINCT job_id FROM job_cutoffs) c ON c.job_id = j.id"
+)
+
+def _decode_plan(reason_mask: int, no_cutoffs: bool) -> Tuple[Dict[str, bool], List[str]]:
+    needs = {'main': False, 'specs': False, 'pattern': False, 'cutoffs': False}
+    reason = []
+    for n, (label, section, _) in enumerate(PLAN_REASONS):
+        if reason_mask >> n & 1: needs[section] = True; reason.append(label)
+    if no_cutoffs: needs['cutoffs'] = True; reason.append("cutoffs")
+    elif needs['main'] or needs['specs'] or needs['pattern']: needs['cutoffs'] = True; reason.append("re-check cutoffs")
+    return needs, reason
+
+@metrics.timed()
+def plan_update_needs(cursor, threshold_date: str) -> Tuple[Dict[int, Dict[str, bool]], Dict[int, List[str]]]:
+    """Set-based check_update_needs() for every job in a single statement.
+
+    Returns (needs, reasons): needs[job_id] has the usual {'main','specs','pattern','cutoffs'}
+    flags and reasons[job_id] the same reason labels the per-job check prints.
+    """
+    needs_by_job, reasons_by_job, decoded = {}, {}, {}
+    for job_id, reason_mask, no_cutoffs in cursor.execute(PLAN_QUERY, {'threshold': threshold_date}):
+        key = (reason_mask, no_cutoffs)
+        if key not in decoded: decoded[key] = _decode_plan(reason_mask, no_cutoffs)
+        needs, reason = decoded[key]
+        needs_by_job[job_id] = dict(needs); reasons_by_job[job_id] = list(reason)
+    return needs_by_job, reasons_by_job
+
+# --- Run Queue (resumable, safe for several scout processes) ---
+def update_threshold_date() -> str:
+    return (datetime.datetime.now() - datetime.timedelta(days=UPDATE_THRESHOLD_DAYS)).isoformat()
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def start_or_resume_run(conn: sqlite3.Connection, threshold_date: str) -> Tuple[str, bool]:
+    """Joins the newest unfinished run, or opens a new one and enqueues its planned tasks.
+
+    Runs under BEGIN IMMEDIATE so concurrent scout processes agree on a single run.
+    Returns (run_id, resumed).
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT id FROM scout_runs WHERE status = 'running' ORDER BY started_at DESC LIMIT 1").fetchone()
+        if row: conn.commit(); return row['id'], True
+
+        now = datetime.datetime.now()
+        run_id = f"{now.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        conn.execute("INSERT INTO scout_runs (id, status, started_at) VALUES (?, 'running', ?)", (run_id, now.isoformat()))
+        jobs_update_needs, update_reasons = plan_update_needs(conn.cursor(), threshold_date)
+        tasks = []
+        for job_id, needs in jobs_update_needs.items():
+            if not any(needs.values()): continue
+            print(f"   Job ID {job_id} needs update. Reasons: {', '.join(update_reasons[job_id])}")
+            tasks.append((run_id, f'update:{job_id}', 'update', job_id, json.dumps(needs)))
+        tasks.append((run_id, 'discover', 'discover', None, None))
+        conn.executemany("INSERT OR IGNORE INTO scout_queue (run_id, task_key, task, job_id, needs) VALUES (?, ?, ?, ?, ?)", tasks)
+        conn.commit()
+        return run_id, False
+    except:
+        conn.rollback(); raise
+
+@metrics.timed()
+def claim_tasks(conn: sqlite3.Connection, run_id: str, task: str, limit: int, owner: str, needs: Optional[str] = None) -> List[sqlite3.Row]:
+    """Atomically leases up to `limit` pending (or lease-expired) tasks and commits the lease.
+
+    `needs` restricts the claim to tasks with exactly that needs JSON (see pending_needs_groups)."""
+    now = time.time(); now_iso = datetime.datetime.now().isoformat()
+    # Expired leases that already used every attempt are given up rather than retried forever
+    conn.execute("UPDATE scout_queue SET status = 'failed', last_error = COALESCE(last_error, 'lease expired'), lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE run_id = ? AND task = ? AND status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                 (now_iso, run_id, task, now, MAX_TASK_ATTEMPTS))
+    claimed = conn.execute('''
+        UPDATE scout_queue SET status = 'leased', lease_owner = :owner, lease_expires = :expires, attempts = attempts + 1, updated_at = :now_iso
+        WHERE id IN (
+            SELECT id FROM scout_queue
+            WHERE run_id = :run_id AND task = :task AND (status = 'pending' OR (status = 'leased' AND lease_expires < :now))
+              AND (:needs IS NULL OR needs = :needs)
+            ORDER BY id LIMIT :limit
+        )
+        RETURNING id, job_id, needs, attempts''',
+        {'owner': owner, 'expires': now + LEASE_SECONDS, 'now': now, 'now_iso': now_iso, 'run_id': run_id, 'task': task, 'limit': limit, 'needs': needs}).fetchall()
+    conn.commit()
+    return sorted(claimed, key=lambda row: row['id'])
+
+def pending_needs_groups(conn: sqlite3.Connection, run_id: str) -> List[Tuple[str, int]]:
+    """(needs JSON, claimable tasks) for each distinct needs map among the run's update tasks, largest first.
+
+    Needs maps are always serialized in the same key order, so equal needs compare equal as text."""
+    return [(row['needs'], row['cnt']) for row in conn.execute(
+        "SELECT needs, COUNT(*) AS cnt FROM scout_queue WHERE run_id = ? AND task = 'update' AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) GROUP BY needs ORDER BY cnt DESC, MIN(id)",
+        (run_id, time.time()))]
+
+def complete_task(conn: sqlite3.Connection, task_id: int, owner: str) -> bool:
+    """Marks a leased task done. Not committed here, so it lands atomically with the data writes."""
+    cursor = conn.execute("UPDATE scout_queue SET status = 'done', last_error = NULL, lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                          (datetime.datetime.now().isoformat(), task_id, owner))
+    return cursor.rowcount > 0
+
+def fail_task(conn: sqlite3.Connection, task_id: int, owner: str, error: str):
+    """Returns a task to the queue for another attempt, or marks it failed once attempts run out."""
+    conn.execute("UPDATE scout_queue SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, last_error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                 (MAX_TASK_ATTEMPTS, error, datetime.datetime.now().isoformat(), task_id, owner))
+
+def release_tasks(conn: sqlite3.Connection, task_ids: List[int], owner: str):
+    """Hands leased tasks back untouched (attempt not counted), e.g. when this worker stops early."""
+    conn.executemany("UPDATE scout_queue SET status = 'pending', attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                     [(task_id, owner) for task_id in task_ids])
+    conn.commit()
+
+def queue_progress(conn: sqlite3.Connection, run_id: str, task: str = 'update') -> Dict[str, int]:
+    counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+    for row in conn.execute("SELECT status, COUNT(*) AS cnt FROM scout_queue WHERE run_id = ? AND task = ? GROUP BY status", (run_id, task)):
+        counts[row['status']] = row['cnt']
+    return counts
+
+def publish_progress(conn: sqlite3.Connection, run_id: str, phase: str, **progress):
+    """Stores this worker's progress in meta for the dashboard's /events stream. The caller commits."""
+    write_meta(conn, 'scout_progress', json.dumps({'run_id': run_id, 'worker': worker_id(), 'phase': phase, **progress}))
+
+def export_metrics():
+    """Leaves the current metrics snapshot where the dashboard's /metrics picks it up."""
+    try: metrics.registry.write_prometheus(METRICS_PROM_PATH, METRICS_PREFIX)
+    except OSError as e: print(f"   ⚠️ Could not write {METRICS_PROM_PATH}: {e}")
+
+def finish_run_if_drained(conn: sqlite3.Connection, run_id: str) -> bool:
+    """Closes the run once no task is pending or leased. Returns True if the run is finished."""
+    conn.execute("UPDATE scout_runs SET status = 'finished', finished_at = ? WHERE id = ? AND status = 'running' AND NOT EXISTS (SELECT 1 FROM scout_queue WHERE run_id = ? AND status IN ('pending', 'leased'))",
+                 (datetime.datetime.now().isoformat(), run_id, run_id))
+    conn.commit()
+    return conn.execute("SELECT status FROM scout_runs WHERE id = ?", (run_id,)).fetchone()['status'] == 'finished'
+
 # --- Phase 1: Update Existing Jobs ---
-def update_existing_jobs(conn: sqlite3.Connection):
-    cursor = conn.cursor()
-    threshold_date = (datetime.datetime.now() - datetime.timedelta(days=UPDATE_THRESHOLD_DAYS)).isoformat()
-    all_jobs = cursor.execute("SELECT id, exam_name, last_updated FROM jobs").fetchall()
-    
-    print("--- Phase 1: Checking existing jobs for updates ---")
-    jobs_update_needs = {job['id']: check_update_needs(cursor, job['id'], threshold_date) for job in all_jobs}
-    jobs_to_fetch_for = [job for job in all_jobs if any(jobs_update_needs[job['id']].values())]
-    
-    print(f"\nFound {len(jobs_to_fetch_for)} existing jobs requiring updates.\n")
-    if not jobs_to_fetch_for: print("All existing jobs up-to-date!"); return True
-    
-    consecutive_errors = 0
-    for i in range(0, len(jobs_to_fetch_for), BATCH_SIZE):
-        batch = jobs_to_fetch_for[i:i + BATCH_SIZE]
-        exam_names_in_batch = [job['exam_name'] for job in batch]
-        print(f"📦 Processing update batch {i//BATCH_SIZE + 1}: {', '.join(exam_names_in_batch)}")
-        
-        batch_results = ask_gemini_batch(exam_names_in_batch, find_new=False)
-        if not batch_results:
-            print("   ❌ No valid data for batch. Skipping.\n"); consecutive_errors += 1
-            if consecutive_errors >= 2: print("🛑 Stopping..."); return False
-            time.sleep(30); continue
-            
-        batch_success = False
-        for job_row in batch:
-            job_id = job_row['id']; exam_name_db = job_row['exam_name']
-            update_needs = jobs_update_needs[job_id]
-            exam_data = find_best_match(exam_name_db, batch_results)
-            
-            if not exam_data: print(f"   ⚠️ No match for {exam_name_db}."); continue
-            print(f"\n   ✏️ Selectively Updating: {exam_name_db} (ID: {job_id})")
-            now_timestamp = datetime.datetime.now().isoformat(); updated_sections = []
-            
-            try:
-                if update_needs['main']:
-                    updates = {}; current_job_data = conn.execute("SELECT application_start, application_end, exam_date, official_website, application_fee, vacancies, vacancies_year, last_updated FROM jobs WHERE id = ?", (job_id,)).fetchone()
-                    # Check all fields
-                    if not is_valid_data(current_job_data['application_start']): updates['application_start'] = exam_data.get('application_start', 'TBA')
-                    if not is_valid_data(current_job_data['application_end']): updates['application_end'] = exam_data.get('application_end', 'TBA')
-                    if not is_valid_data(current_job_data['exam_date']): updates['exam_date'] = exam_data.get('exam_date', 'TBA')
-                    if not is_valid_data(current_job_data['official_website']): updates['official_website'] = exam_data.get('official_website', 'N/A')
-                    if not is_valid_data(current_job_data['application_fee']): updates['application_fee'] = exam_data.get('application_fee', 'N/A')
-                    if not is_valid_data(current_job_data['vacancies']): updates['vacancies'] = exam_data.get('vacancies', 'N/A')
-                    if not is_valid_data(current_job_data['vacancies_year']): updates['vacancies_year'] = exam_data.get('vacancies_year', exam_data.get('year', 'N/A'))
-                    
-                    if updates: 
-                        update_query = "UPDATE jobs SET " + ", ".join([f"{key} = ?" for key in updates.keys()]) + ", last_updated = ? WHERE id = ?"
-                        params = list(updates.values()) + [now_timestamp, job_id]
-                        cursor.execute(update_query, params); updated_sections.append("main")
-                    elif not current_job_data['last_updated'] or current_job_data['last_updated'] < threshold_date: 
-                        cursor.execute("UPDATE jobs SET last_updated = ? WHERE id = ?", (now_timestamp, job_id)); updated_sections.append("main_ts")
-                        
-                if update_needs['specs']:
-                    specs = exam_data.get('job_specs', {});
-                    if isinstance(specs, dict): cursor.execute("REPLACE INTO job_specs VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?)", (job_id, specs.get('nationality', 'N/A'), specs.get('age_limits', 'N/A'), specs.get('age_relax', 'N/A'), specs.get('edu_qual', 'N/A'), specs.get('attempts', 'N/A'), specs.get('physical_std', 'N/A'), now_timestamp)); updated_sections.append("specs")
-                    
-                if update_needs['pattern']:
-                    pattern = exam_data.get('exam_pattern', {});
-                    if isinstance(pattern, dict): cursor.execute("REPLACE INTO exam_pattern VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)", (job_id, pattern.get('stages', 'N/A'), pattern.get('num_papers', 'N/A'), pattern.get('q_type', 'N/A'), pattern.get('duration', 'N/A'), pattern.get('marking_scheme', 'N/A'), now_timestamp)); updated_sections.append("pattern")
-                    
-                if update_needs['cutoffs']:
-                    cutoffs = exam_data.get('cutoffs', [])
-                    if isinstance(cutoffs, list):
-                        cursor.execute("DELETE FROM job_cutoffs WHERE job_id = ?", (job_id,)); year = exam_data.get('year', 'N/A')
-                        for cutoff in cutoffs:
-                            if isinstance(cutoff, dict): cursor.execute("INSERT INTO job_cutoffs VALUES (NULL, ?, ?, ?, ?)", (job_id, cutoff.get('category', 'N/A'), cutoff.get('score', 'N/A'), year))
-                        updated_sections.append("cutoffs")
-                        
-                if updated_sections: print(f"      ✅ Updated sections: {', '.join(updated_sections)}"); batch_success = True
-                else: print(f"      No fields needed updating.")
-            except sqlite3.Error as e: print(f"      ❌ DB Error: {e}"); conn.rollback(); continue
-            
+# Main-table fields the scout fills in, with the fallback used when the API omits one
+JOB_DETAIL_DEFAULTS = {'application_start': 'TBA', 'application_end': 'TBA', 'exam_date': 'TBA', 'official_website': 'N/A', 'application_fee': 'N/A', 'vacancies': 'N/A', 'vacancies_year': 'N/A'}
+SPEC_FIELDS = DETAIL_COLUMNS['job_specs']
+PATTERN_FIELDS = DETAIL_COLUMNS['exam_pattern']
+
+def _same(stored: Any, new: Any) -> bool:
+    """Compares the way SQLite's TEXT affinity will store `new` (1050 and '1050' are equal)."""
+    return (None if stored is None else str(stored)) == (None if new is None else str(new))
+
+def _useful(value: Any) -> bool:
+    return value is not None and is_valid_data(str(value))
+
+def _upsert_sql(table: str, fields: Tuple[str, ...]) -> str:
+    columns = ('job_id',) + fields + ('last_updated',)
+    return (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(job_id) DO UPDATE SET {', '.join(f'{c} = excluded.{c}' for c in columns[1:])}")
+
+class UpsertWriter:
+    """Diffs API answers against the stored rows and writes only what actually changed.
+
+    `stage()` queues one job's field-level changes; `flush()` applies everything staged
+    with one executemany per statement (the caller commits). Sections whose content is
+    identical are skipped, except for a timestamp refresh once they have gone stale.
+    Each flush that writes anything bumps the data version with the ids of the jobs it touched.
+    `stats` counts rows written vs unchanged per table across the whole run, and
+    `fields_updated` the fields (and cutoff rows) that gained or changed real, non-placeholder data.
+    """
+    def __init__(self):
+        self.stats = {table: {'written': 0, 'unchanged': 0, 'deleted': 0} for table in ('jobs', 'job_specs', 'exam_pattern', 'job_cutoffs')}
+        self.fields_updated = 0
+        self._reset()
+
+    def _reset(self):
+        self.job_updates: Dict[Tuple[str, ...], List[tuple]] = {}  # Changed field set -> params
+        self.spec_rows: List[tuple] = []; self.pattern_rows: List[tuple] = []
+        self.cutoff_rows: List[tuple] = []; self.cutoff_deletes: List[tuple] = []
+        self.changed_jobs: set = set()
+
+    def load_current(self, conn: sqlite3.Connection, job_ids: List[int]) -> Dict[str, Dict[int, Any]]:
+        """Fetches the stored rows for a whole batch in four queries."""
+        with metrics.span('db.load_current') as span:
+            span.set(rows=len(job_ids))
+            return self._load_current(conn, job_ids)
+
+    def _load_current(self, conn: sqlite3.Connection, job_ids: List[int]) -> Dict[str, Dict[int, Any]]:
+        marks = ', '.join('?' * len(job_ids))
+        current = {
+            'jobs': {row['id']: row for row in conn.execute(f"SELECT id, {', '.join(JOB_DETAIL_DEFAULTS)}, last_updated FROM jobs WHERE id IN ({marks})", job_ids)},
+            'job_specs': {row['job_id']: row for row in conn.execute(f"SELECT job_id, {', '.join(SPEC_FIELDS)}, last_updated FROM job_specs WHERE job_id IN ({marks})", job_ids)},
+            'exam_pattern': {row['job_id']: row for row in conn.execute(f"SELECT job_id, {', '.join(PATTERN_FIELDS)}, last_updated FROM exam_pattern WHERE job_id IN ({marks})", job_ids)},
+            'job_cutoffs': {job_id: {} for job_id in job_ids},
+        }
+        for row in conn.execute(f"SELECT id, job_id, category, score, year FROM job_cutoffs WHERE job_id IN ({marks})", job_ids):
+            current['job_cutoffs'][row['job_id']][(row['category'], row['year'])] = (row['id'], row['score'])
+        return current
+
+    def _count(self, table: str, written: bool):
+        self.stats[table]['written' if written else 'unchanged'] += 1
+
+    def stage(self, current: Dict[str, Dict[int, Any]], job_id: int, exam_data: Dict[str, Any], update_needs: Dict[str, bool], threshold_date: str) -> List[str]:
+        """Queues the changes for one job and returns the names of the sections that will be written."""
+        now_timestamp = datetime.datetime.now().isoformat(); updated_sections = []
+        is_stale = lambda row: not row or not row['last_updated'] or row['last_updated'] < threshold_date
+
+        if update_needs['main']:
+            row = current['jobs'][job_id]; updates = {}
+            # Only placeholder fields are filled in; verified data is never overwritten
+            for field, default in JOB_DETAIL_DEFAULTS.items():
+                if is_valid_data(row[field]): continue
+                value = exam_data.get(field, exam_data.get('year', default) if field == 'vacancies_year' else default)
+                if not _same(row[field], value): updates[field] = value
+            self.fields_updated += sum(_useful(value) for value in updates.values())
+            if updates or is_stale(row):
+                fields = tuple(updates)
+                self.job_updates.setdefault(fields, []).append(tuple(updates.values()) + (now_timestamp, job_id)); self.changed_jobs.add(job_id)
+                updated_sections.append("main" if updates else "main_ts")
+            self._count('jobs', bool(updates) or is_stale(row))
+
+        for section, table, fields, rows in (('specs', 'job_specs', SPEC_FIELDS, self.spec_rows), ('pattern', 'exam_pattern', PATTERN_FIELDS, self.pattern_rows)):
+            payload = exam_data.get(table, {})
+            if not update_needs[section] or not isinstance(payload, dict): continue
+            row = current[table].get(job_id)
+            values = tuple(payload.get(field, 'N/A') for field in fields)
+            differing = [value for field, value in zip(fields, values) if row is None or not _same(row[field], value)]
+            changed = bool(differing); self.fields_updated += sum(_useful(value) for value in differing)
+            if changed or is_stale(row): rows.append((job_id,) + values + (now_timestamp,)); updated_sections.append(section); self.changed_jobs.add(job_id)
+            self._count(table, changed or is_stale(row))
+
+        cutoffs = exam_data.get('cutoffs', [])
+        if update_needs['cutoffs'] and isinstance(cutoffs, list):
+            year = exam_data.get('year', 'N/A'); stored = current['job_cutoffs'][job_id]
+            incoming = {}
+            for cutoff in cutoffs:
+                if isinstance(cutoff, dict): incoming[(str(cutoff.get('category', 'N/A')), str(year))] = cutoff.get('score', 'N/A')
+            for key, score in incoming.items():
+                if key in stored and _same(stored[key][1], score): self._count('job_cutoffs', False); continue
+                self.cutoff_rows.append((job_id, key[0], score, key[1], cutoff_category_rank(key[0]))); self._count('job_cutoffs', True); self.changed_jobs.add(job_id)
+                self.fields_updated += _useful(score)
+            # Rows the latest answer no longer lists are dropped so the details page matches it
+            gone = [(cutoff_id,) for key, (cutoff_id, _) in stored.items() if key not in incoming]
+            self.cutoff_deletes.extend(gone); self.stats['job_cutoffs']['deleted'] += len(gone)
+            if gone: self.changed_jobs.add(job_id)
+            updated_sections.append("cutoffs")
+        return updated_sections
+
+    def flush(self, conn: sqlite3.Connection) -> List[int]:
+        """Applies everything staged since the last flush and returns the ids of the jobs it
+        changed. The caller commits or rolls back."""
+        changed_jobs = sorted(self.changed_jobs)
+        try:
+            if changed_jobs:
+                with metrics.span('db.write', table='meta'): bump_data_version(conn, changed_jobs)
+            if self.job_updates:
+                with metrics.span('db.write', table='jobs') as span:
+                    for fields, params in self.job_updates.items():
+                        conn.executemany("UPDATE jobs SET " + "".join(f"{field} = ?, " for field in fields) + "last_updated = ? WHERE id = ?", params)
+                    span.set(rows=sum(len(params) for params in self.job_updates.values()))
+            for table, statement, rows in (('job_specs', _upsert_sql('job_specs', SPEC_FIELDS), self.spec_rows), ('exam_pattern', _upsert_sql('exam_pattern', PATTERN_FIELDS), self.pattern_rows),
+                                           ('job_cutoffs', "DELETE FROM job_cutoffs WHERE id = ?", self.cutoff_deletes),
+                                           ('job_cutoffs', "INSERT INTO job_cutoffs (job_id, category, score, year, category_rank) VALUES (?, ?, ?, ?, ?) ON CONFLICT(job_id, category, year) DO UPDATE SET score = excluded.score", self.cutoff_rows)):
+                if not rows: continue
+                with metrics.span('db.write', table=table) as span: conn.executemany(statement, rows); span.set(rows=len(rows))
+            if self.cutoff_rows:
+                # Deleted rows stay in the history; new and changed ones become its next versions
+                with metrics.span('db.write', table='cutoff_history') as span: span.set(rows=record_cutoffs(conn, self.cutoff_rows))
+        finally:
+            self._reset()
+        return changed_jobs
+
+    def summary(self) -> str:
+        return ", ".join(f"{table} {s['written']} written / {s['unchanged']} unchanged" + (f" / {s['deleted']} deleted" if s['deleted'] else "")
+                         for table, s in self.stats.items())
+
+def normalize_exam_name(exam_name: str) -> str:
+    return ' '.join(exam_name.lower().split())
+
+def batch_cache_key(model_name: str, exam_names: List[str], find_new=False, sections: Tuple[str, ...] = SECTIONS) -> str:
+    return make_cache_key('batch', model_name, PROMPT_VERSION, find_new, list(sections), sorted(normalize_exam_name(n) for n in exam_names))
+
+def exam_cache_key(model_name: str, exam_name: str, sections: Tuple[str, ...] = SECTIONS) -> str:
+    return make_cache_key('exam', model_name, PROMPT_VERSION, list(sections), normalize_exam_name(exam_name))
+
+def fetch_batch(exam_names: List[str], client=None, limiter: Optional[RateLimiter] = None, cache: Optional[ResponseCache] = None, find_new=False,
+                sections: Optional[Tuple[str, ...]] = None, planner: Optional[BatchPlanner] = None, on_item: Optional[Callable[[Any], None]] = None) -> Optional[List[Dict[str, Any]]]:
+    """Worker task: one rate-limited, backed-off model call for a batch. Never touches the jobs DB.
+
+    With a cache, a whole-batch hit is returned as-is. Otherwise phase 1 batches fan out to
+    per-exam entries so only exams without a cached answer are sent to the model, even when
+    batches are chunked differently from the run that filled the cache. Cache entries are
+    keyed by the sections asked for, since a trimmed answer cannot stand in for a full one.
+    Discovery answers are only reused for DISCOVERY_CACHE_TTL_HOURS.
+    Every item, cached or streamed, is also passed to `on_item` as soon as it is available.
+    """
+    sections = tuple(sections or SECTIONS); emit = on_item or (lambda item: None)
+    ask = lambda names: call_with_backoff(lambda: ask_gemini_batch(names, find_new=find_new, client=client, limiter=limiter, sections=sections, planner=planner, on_item=on_item), limiter)
+    if cache is None: return ask(exam_names)
+    model_name = model_name_of(client)
+    cached = cache.get(batch_cache_key(model_name, exam_names, find_new, sections), ttl_seconds=DISCOVERY_CACHE_TTL_HOURS * 3600 if find_new else None)
+    if cached is not None:
+        print(f"   💾 Cache hit for batch: {', '.join(exam_names[:3])}{'...' if len(exam_names) > 3 else ''}")
+        for item in cached: emit(item)
+        return cached
+
+    cached_items = [] if find_new else [item for item in (cache.get(exam_cache_key(model_name, name, sections), kind='exam_') for name in exam_names) if item is not None]
+    for item in cached_items: emit(item)
+    missing = exam_names if find_new else [match['name'] for match in match_many(exam_names, result_names(cached_items)) if match['index'] is None]
+    if not missing: print(f"   💾 All {len(exam_names)} exams served from per-exam cache."); return cached_items
+    if cache.cache_only: print(f"   💾 Cache-only mode: {len(missing)} exams not cached, skipping them."); return cached_items or None
+
+    results = ask(missing)
+    if results is None: return cached_items or None  # [] is a valid answer (e.g. no new exams)
+    matches = [] if find_new else match_many(missing, result_names(results))
+    for match in matches:
+        if match['index'] is not None: cache.put(exam_cache_key(model_name, match['name'], sections), results[match['index']])
+    # A salvaged, partial answer is only kept per exam, so a replay still asks for the rest
+    if all(match['index'] is not None for match in matches): cache.put(batch_cache_key(model_name, missing, find_new, sections), results)
+    return cached_items + results
+
+def apply_answers(conn: sqlite3.Connection, writer: UpsertWriter, pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]], owner: str, threshold_date: str) -> Optional[Tuple[bool, int]]:
+    """Writes (job, exam_data) pairs and completes their tasks in one commit.
+
+    Returns (any section updated, number of jobs changed), or None after a DB error (the tasks are failed)."""
+    current = writer.load_current(conn, [job['id'] for job, _ in pairs]); any_updated = False
+    for job, exam_data in pairs:
+        print(f"\n   ✏️ Selectively Updating: {job['exam_name']} (ID: {job['id']})")
+        updated_sections = writer.stage(current, job['id'], exam_data, job['needs'], threshold_date)
+        if updated_sections: print(f"      ✅ Updated sections: {', '.join(updated_sections)}"); any_updated = True
+        else: print(f"      No fields needed updating.")
+    try:
+        changed_jobs = writer.flush(conn)
+        for job, _ in pairs: complete_task(conn, job['task_id'], owner)
+        with metrics.span('db.commit'): conn.commit()
+        return any_updated, len(changed_jobs)
+    except sqlite3.Error as e:
+        print(f"      ❌ DB Error: {e}"); conn.rollback()
+        for job, _ in pairs: fail_task(conn, job['task_id'], owner, f"DB error: {e}")
         conn.commit()
-        if batch_success: consecutive_errors = 0
-        else: consecutive_errors += 1
-        if consecutive_errors >= 2: print("🛑 Stopping..."); return False
-        if i + BATCH_SIZE < len(jobs_to_fetch_for): print(f"\n...Pausing for 30 seconds..."); time.sleep(30)
+        return None
+
+def update_existing_jobs(conn: sqlite3.Connection, client=None, limiter: Optional[RateLimiter] = None, max_workers: int = MAX_CONCURRENT_BATCHES, cache: Optional[ResponseCache] = None, run_id: Optional[str] = None,
+                         planner: Optional[BatchPlanner] = None):
+    """Works through the run's 'update' tasks with several batches in flight.
+
+    Batches are claimed from scout_queue only as worker slots free up, one needs group at a
+    time and sized by `planner`, so each prompt asks only for the sections its exams need. Model calls run on a
+    thread pool behind `limiter` and stream their items back through a queue; results are
+    diffed and written back by an UpsertWriter on the calling thread only. An item whose
+    exam_name matches a job exactly is written the moment it arrives; the batch's other jobs
+    are matched (fuzzy/substring) once its answer is finished. Writes commit together with
+    their task completions, so a crash never loses or repeats finished work. Returns False if this worker stopped on repeated batch errors.
+    """
+    threshold_date = update_threshold_date()
+    print("--- Phase 1: Checking existing jobs for updates ---")
+    if run_id is None:
+        run_id, resumed = start_or_resume_run(conn, threshold_date)
+        print(f"{'♻️ Resuming' if resumed else '🆕 Started'} scout run {run_id}")
+
+    progress = queue_progress(conn, run_id)
+    remaining = progress['pending'] + progress['leased']
+    print(f"\nRun {run_id}: {remaining} existing jobs requiring updates ({progress['done']} done, {progress['failed']} failed).\n")
+    if not remaining: print("All existing jobs up-to-date!"); return True
+
+    limiter = limiter or RateLimiter(); planner = planner or BatchPlanner()
+    owner = worker_id()
+    groups = pending_needs_groups(conn, run_id)
+    total_batches = sum(-(-count // planner.batch_size(needed_sections(json.loads(needs)))) for needs, count in groups) or 1
+    print(f"🚚 Dispatching ~{total_batches} batches of {planner.describe()} in {len(groups)} needs groups ({max_workers} in flight, {limiter.describe()}) as worker {owner}")
+
+    consecutive_errors = 0; batch_number = 0; in_flight = {}
+    needs_group = None; sections = SECTIONS
+    batches_done = 0; jobs_updated = 0
+    events = queue.Queue()  # (batch number, item) per streamed item, then (batch number, BATCH_DONE)
+    publish_progress(conn, run_id, 'update', batch=0, batches=total_batches, jobs_updated=0); conn.commit()
+    writer = UpsertWriter()
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            while len(in_flight) < max_workers:
+                claimed = claim_tasks(conn, run_id, 'update', planner.batch_size(sections), owner, needs=needs_group) if needs_group else []
+                if not claimed:
+                    # Current group drained (or none picked yet): move on to the largest remaining one
+                    groups = pending_needs_groups(conn, run_id)
+                    if not groups: break
+                    needs_group = groups[0][0]; sections = needed_sections(json.loads(needs_group))
+                    continue
+                batch = []
+                for task in claimed:
+                    job = conn.execute("SELECT id, exam_name FROM jobs WHERE id = ?", (task['job_id'],)).fetchone()
+                    if job: batch.append({'task_id': task['id'], 'id': job['id'], 'exam_name': job['exam_name'], 'needs': json.loads(task['needs'])})
+                    else: complete_task(conn, task['id'], owner); conn.commit()  # Job deleted since the run was planned
+                if not batch: continue
+                batch_number += 1; total_batches = max(total_batches, batch_number)
+                on_item = lambda item, number=batch_number: events.put((number, item))
+                future = pool.submit(fetch_batch, [job['exam_name'] for job in batch], client, limiter, cache, False, sections, planner, on_item)
+                in_flight[batch_number] = {'future': future, 'batch': batch, 'sections': sections, 'items': [], 'success': False,
+                                           'open': {job['exam_name'].lower(): job for job in batch}}  # Jobs still waiting for their answer
+                future.add_done_callback(lambda _, number=batch_number: events.put((number, BATCH_DONE)))
+            if not in_flight: break
+
+            number, item = events.get()
+            state = in_flight[number]
+            if item is not BATCH_DONE:
+                state['items'].append(item)
+                job = state['open'].pop(str(item.get('exam_name', '')).lower(), None) if isinstance(item, dict) else None
+                if job:
+                    written = apply_answers(conn, writer, [(job, item)], owner, threshold_date)
+                    if written: state['success'] |= written[0]; jobs_updated += written[1]
+                continue
+
+            del in_flight[number]; batch, batch_sections = state['batch'], state['sections']
+            print(f"📦 Finished update batch {number}/~{total_batches} ({'+'.join(batch_sections)}): {', '.join(job['exam_name'] for job in batch)}")
+            batch_results = state['future'].result() or state['items']
+            oversized = len(batch) > planner.batch_size(batch_sections)  # Sized before the planner's last cut
+            if not batch_results and oversized:
+                # The planner has already shrunk batches since this one was sized: retry smaller, costing no attempt
+                print(f"   ↘️ No valid data for a batch of {len(batch)}; requeued for smaller batches ({planner.describe()}).\n")
+                release_tasks(conn, [job['task_id'] for job in batch], owner)
+            elif not batch_results:
+                print("   ❌ No valid data for batch. Returned to queue.\n"); consecutive_errors += 1
+                for job in batch: fail_task(conn, job['task_id'], owner, "no valid data for batch")
+                conn.commit()
+            else:
+                pairs = []; unmatched = []
+                result_index = NameIndex(result_names(batch_results))
+                for job in state['open'].values():
+                    exam_data = find_best_match(job['exam_name'], batch_results, index=result_index)
+                    if exam_data: pairs.append((job, exam_data))
+                    else: print(f"   ⚠️ No match for {job['exam_name']}."); unmatched.append(job)
+                if unmatched and oversized: release_tasks(conn, [job['task_id'] for job in unmatched], owner)  # Likely cut off: retry in a smaller batch
+                elif unmatched:
+                    for job in unmatched: fail_task(conn, job['task_id'], owner, "no match in API results")
+                    conn.commit()
+                written = apply_answers(conn, writer, pairs, owner, threshold_date) if pairs else (False, 0)
+                if written: state['success'] |= written[0]; jobs_updated += written[1]
+                else: state['success'] = False
+                if state['success']: consecutive_errors = 0
+                else: consecutive_errors += 1
+            batches_done += 1
+            print(f"   🧮 {planner.usage(writer.fields_updated)}; next batches {planner.describe()}")
+            publish_progress(conn, run_id, 'update', batch=batches_done, batches=total_batches, jobs_updated=jobs_updated); conn.commit()
+            export_metrics()
+            if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                print("🛑 Stopping this worker; unfinished tasks stay queued for the next run...")
+                release_tasks(conn, [job['task_id'] for state in in_flight.values() for job in state['batch']], owner)
+                return False
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        print(f"\n🧾 Rows: {writer.summary()}")
+        print(f"🧮 Tokens: {planner.usage(writer.fields_updated)}")
     print("\n--- Phase 1 Finished ---")
     return True
 
 # --- Phase 2: Find and Add New Jobs ---
-def find_and_add_new_jobs(conn: sqlite3.Connection):
-    # (Same logical flow as before)
+def find_and_add_new_jobs(conn: sqlite3.Connection, client=None, limiter: Optional[RateLimiter] = None, cache: Optional[ResponseCache] = None, run_id: Optional[str] = None):
+    # (Same logical flow as before, as a single 'discover' task of the run)
     cursor = conn.cursor()
     print("\n--- Phase 2: Searching for new job postings ---")
-    existing_exams = [row['exam_name'] for row in cursor.execute("SELECT DISTINCT exam_name FROM jobs").fetchall()]
-    new_jobs_results = ask_gemini_batch(existing_exams, find_new=True)
+    if run_id is None: run_id, _ = start_or_resume_run(conn, update_threshold_date())
+    owner = worker_id()
+    claimed = claim_tasks(conn, run_id, 'discover', 1, owner)
+    if not claimed: print("   Discovery already handled for this run."); return
+    task_id = claimed[0]['id']
+    publish_progress(conn, run_id, 'discover'); conn.commit()
+
+    existing_exams = [row['exam_name'] for row in cursor.execute("SELECT exam_name FROM jobs GROUP BY exam_name ORDER BY MAX(id) DESC").fetchall()]
+    existing_index = NameIndex(existing_exams)  # Case-insensitive lookups instead of a scan per candidate
+    # The prompt only hints at what we have (newest first, within a token budget); duplicates are still caught by existing_index
+    prompt_exams = pack_names(existing_exams, DISCOVERY_PROMPT_TOKENS)
+    if len(prompt_exams) < len(existing_exams): print(f"   Listing the {len(prompt_exams)} newest of {len(existing_exams)} known exams in the prompt.")
+    new_jobs_results = fetch_batch(prompt_exams, client, limiter, cache, find_new=True)
     
-    if not new_jobs_results: print("   No new job postings found."); return
+    if new_jobs_results is None: print("   ❌ No valid data from discovery. Returned to queue."); fail_task(conn, task_id, owner, "no valid data"); conn.commit(); return
     added_count = 0
     for new_job_data in new_jobs_results:
         if not isinstance(new_job_data, dict) or not new_job_data.get('exam_name'): continue
-        new_exam_name = new_job_data['exam_name']; is_truly_new = True
-        for existing in existing_exams:
-             if new_exam_name.lower() == existing.lower(): is_truly_new = False; break
-        if is_truly_new:
+        new_exam_name = new_job_data['exam_name']
+        if existing_index.find_exact(new_exam_name) is None:
             print(f"   ✨ Found: {new_job_data.get('post_name')} ({new_exam_name})")
             try:
-                cursor.execute(
-                    '''INSERT OR IGNORE INTO jobs (post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                    (new_job_data.get('post_name', 'N/A'), new_exam_name, new_job_data.get('conducting_body', 'N/A'), new_job_data.get('group', 'N/A'), new_job_data.get('gazetted_status', 'N/A'), new_job_data.get('pay_level', 0), new_job_data.get('salary', 'N/A'), new_job_data.get('eligibility', 'N/A'), new_job_data.get('age_limit', 'N/A'), new_job_data.get('pet_status', 'N/A'))
-                )
-                if cursor.rowcount > 0:
-                     added_count += 1; new_job_id = cursor.lastrowid
-                     cursor.execute("INSERT OR IGNORE INTO job_specs (job_id) VALUES (?)", (new_job_id,))
-                     cursor.execute("INSERT OR IGNORE INTO exam_pattern (job_id) VALUES (?)", (new_job_id,))
-                else: print(f"      (Skipped {new_exam_name})")
+                with metrics.span('db.write', table='jobs_new'):
+                    cursor.execute(
+                        '''INSERT OR IGNORE INTO jobs (post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                        (new_job_data.get('post_name', 'N/A'), new_exam_name, new_job_data.get('conducting_body', 'N/A'), new_job_data.get('group', 'N/A'), new_job_data.get('gazetted_status', 'N/A'), new_job_data.get('pay_level', 0), new_job_data.get('salary', 'N/A'), new_job_data.get('eligibility', 'N/A'), new_job_data.get('age_limit', 'N/A'), new_job_data.get('pet_status', 'N/A'))
+                    )
+                    if cursor.rowcount > 0:
+                         added_count += 1; new_job_id = cursor.lastrowid
+                         cursor.execute("INSERT OR IGNORE INTO job_specs (job_id) VALUES (?)", (new_job_id,))
+                         cursor.execute("INSERT OR IGNORE INTO exam_pattern (job_id) VALUES (?)", (new_job_id,))
+                    else: print(f"      (Skipped {new_exam_name})")
             except sqlite3.Error as e: print(f"      ❌ DB Error adding {new_exam_name}: {e}"); conn.rollback()
-    conn.commit()
+    if added_count > 0: bump_data_version(conn)  # New rows: dashboards reload their list
+    complete_task(conn, task_id, owner); publish_progress(conn, run_id, 'discover', jobs_added=added_count); conn.commit()
     if added_count > 0: print(f"\n   Added {added_count} new jobs!")
     else: print("   No new jobs added.")
     print("\n--- Phase 2 Finished ---")
 
 # --- Main Execution Logic ---
-if __name__ == '__main__':
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Gemini-powered data scout for GJ Terminal.")
+    parser.add_argument('--workers', type=int, default=MAX_CONCURRENT_BATCHES, help="Batches kept in flight at once.")
+    parser.add_argument('--rpm', type=float, default=REQUESTS_PER_MINUTE, help="Model requests per minute.")
+    parser.add_argument('--tpm', type=float, default=TOKENS_PER_MINUTE, help="Model tokens per minute (prompt + expected output).")
+    parser.add_argument('--model', default='gemini', help="'gemini', or 'package.module:factory[?key=value&...]' for another client, e.g. 'benchmarks.fake_model:FakeModel?latency=0.5' to run offline.")
+    parser.add_argument('--batch-tokens', type=int, default=BATCH_OUTPUT_TOKENS, help="Starting output-token budget per update batch (adapts during the run).")
+    parser.add_argument('--metrics-jsonl', default=METRICS_JSONL_PATH, help="Append one JSON line per timed span here ('' to disable).")
+    parser.add_argument('--profile', action='store_true', help=f"Run under cProfile, print the hottest paths and save the stats to {os.path.basename(PROFILE_PATH)}.")
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument('--no-cache', action='store_true', help="Ignore and don't fill the response cache.")
+    cache_mode.add_argument('--cache-only', action='store_true', help="Serve answers from the response cache only; never call the model.")
+    return parser.parse_args(argv)
+
+def run_scout(args: argparse.Namespace):
     open(STATUS_FLAG_FILE, 'w').close()
     print("🚀 Starting Smart Data Scout...\n")
+    if args.metrics_jsonl: metrics.registry.open_jsonl(args.metrics_jsonl, worker=worker_id())
+    if args.model != 'gemini': set_model(load_model(args.model)); print(f"🧪 Using model {args.model}\n")
     conn_main = get_db_connection()
+    limiter = RateLimiter(args.rpm, args.tpm)
+    cache = None if args.no_cache else ResponseCache(CACHE_DB_PATH, CACHE_TTL_HOURS * 3600, CACHE_MAX_MB * 1024 * 1024, cache_only=args.cache_only)
     try:
-        update_success = update_existing_jobs(conn_main)
+        ensure_schema(conn_main)
+        run_id, resumed = start_or_resume_run(conn_main, update_threshold_date())
+        metrics.registry.sink_fields['run_id'] = run_id
+        print(f"{'♻️ Resuming' if resumed else '🆕 Started'} scout run {run_id}\n")
+        update_success = update_existing_jobs(conn_main, limiter=limiter, max_workers=args.workers, cache=cache, run_id=run_id, planner=BatchPlanner(args.batch_tokens))
         if update_success:
-            find_and_add_new_jobs(conn_main)
+            find_and_add_new_jobs(conn_main, limiter=limiter, cache=cache, run_id=run_id)
+        if finish_run_if_drained(conn_main, run_id): print(f"🏁 Run {run_id} finished.")
+        else: print(f"⏸️ Run {run_id} still has queued tasks; the next scout run will resume it.")
     except Exception as e:
          print(f"🚨 An unexpected error occurred: {e}")
     finally:
         conn_main.close()
+        if cache: print(f"\n📊 Response cache: {cache.summary()}"); cache.close()
+        export_metrics(); metrics.registry.close_jsonl()
+        print(f"\n⏱️ Time by span:\n{metrics.registry.summary()}")
         if os.path.exists(STATUS_FLAG_FILE): os.remove(STATUS_FLAG_FILE)
         print("\nMission Complete! 'update_in_progress.flag' removed. ✅")
+
+def profile_scout(args: argparse.Namespace):
+    """run_scout() under cProfile. Only the main thread is profiled (planning, parsing handoff,
+    matching, DB writes); model calls run on worker threads and are covered by the spans."""
+    profiler = cProfile.Profile()
+    try: profiler.runcall(run_scout, args)
+    finally:
+        profiler.dump_stats(PROFILE_PATH)
+        stats = pstats.Stats(profiler)
+        print(f"\n🔬 Hottest paths by cumulative time:"); stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+        print(f"🔬 Hottest functions by own time:"); stats.sort_stats('tottime').print_stats(PROFILE_TOP // 2)
+        print(f"🔬 Full profile saved to {PROFILE_PATH} (browse with: python -m pstats {PROFILE_PATH})")
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.profile: profile_scout(args)
+    else: run_scout(args)
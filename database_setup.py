@@ -4,84 +4,294 @@
 
 import sqlite3
 import os
+import time
+
+from cutoff_trends import backfill as backfill_cutoff_history, refresh_trends
 
 # --- Find the project directory and DB path ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'jobs.db')
 
-# --- Connect to DB (creates if not exists) ---
-conn = sqlite3.connect(DB_PATH)
-cursor = conn.cursor()
+# --- Sort keys for the dashboard's /api/jobs listing ---
+# Each expression gets a matching (expression, id) index below; app.py must use the exact
+# same text for SQLite to pick the index, so both read it from here.
+JOB_SORT_EXPRESSIONS = {
+    'id': 'id',
+    'post_name': "IFNULL(post_name, '') COLLATE NOCASE",
+    'exam_name': "IFNULL(exam_name, '') COLLATE NOCASE",
+    'conducting_body': "IFNULL(conducting_body, '') COLLATE NOCASE",
+    'group': "IFNULL(\"group\", '') COLLATE NOCASE",
+    'gazetted_status': "IFNULL(gazetted_status, '') COLLATE NOCASE",
+    'pay_level': "IFNULL(pay_level, 0)",
+    'salary': "IFNULL(salary, '') COLLATE NOCASE",
+    'eligibility': "IFNULL(eligibility, '') COLLATE NOCASE",
+    'age_limit': "IFNULL(age_limit, '') COLLATE NOCASE",
+    'pet_status': "IFNULL(pet_status, '') COLLATE NOCASE",
+}
+
+# --- Full-text search document ---
+# One FTS5 row per job (rowid = jobs.id) combining the job, its specs and its exam pattern.
+# Triggers below rebuild a job's row whenever any searchable column changes.
+SEARCH_COLUMNS = ('post_name', 'exam_name', 'conducting_body', 'eligibility', 'specs', 'pattern')
+SEARCH_RANK_WEIGHTS = (10.0, 10.0, 4.0, 2.0, 1.0, 1.0)  # bm25 weight per SEARCH_COLUMNS entry: names weigh most
+SEARCH_DOC_SELECT = '''
+    SELECT j.id, j.post_name, j.exam_name, j.conducting_body, IFNULL(j.eligibility, '') || ' ' || IFNULL(j.salary, ''),
+           IFNULL(s.edu_qual, '') || ' ' || IFNULL(s.nationality, '') || ' ' || IFNULL(s.age_limits, '') || ' ' || IFNULL(s.physical_std, ''),
+           IFNULL(p.stages, '') || ' ' || IFNULL(p.q_type, '') || ' ' || IFNULL(p.marking_scheme, '') || ' ' || IFNULL(p.num_papers, '')
+    FROM jobs j LEFT JOIN job_specs s ON s.job_id = j.id LEFT JOIN exam_pattern p ON p.job_id = j.id'''
+SEARCH_TRIGGERS = {
+    # trigger name -> (event, job id expression)
+    'jobs_search_ai': ("AFTER INSERT ON jobs", "NEW.id"),
+    'jobs_search_au': ("AFTER UPDATE OF post_name, exam_name, conducting_body, eligibility, salary ON jobs", "NEW.id"),
+    'jobs_search_ad': ("AFTER DELETE ON jobs", "OLD.id"),
+    'job_specs_search_ai': ("AFTER INSERT ON job_specs", "NEW.job_id"),
+    'job_specs_search_au': ("AFTER UPDATE OF edu_qual, nationality, age_limits, physical_std ON job_specs", "NEW.job_id"),
+    'job_specs_search_ad': ("AFTER DELETE ON job_specs", "OLD.job_id"),
+    'exam_pattern_search_ai': ("AFTER INSERT ON exam_pattern", "NEW.job_id"),
+    'exam_pattern_search_au': ("AFTER UPDATE OF stages, q_type, marking_scheme, num_papers ON exam_pattern", "NEW.job_id"),
+    'exam_pattern_search_ad': ("AFTER DELETE ON exam_pattern", "OLD.job_id"),
+}
+
+# --- Detail sections (column order of the specs/pattern cards) ---
+DETAIL_COLUMNS = {
+    'job_specs': ('nationality', 'age_limits', 'age_relax', 'edu_qual', 'attempts', 'physical_std'),
+    'exam_pattern': ('stages', 'num_papers', 'q_type', 'duration', 'marking_scheme'),
+}
+
+# --- Cutoff category order on the details page ---
+# Stored per row as job_cutoffs.category_rank when the cutoff is written, so the page reads
+# cutoffs in index order instead of re-running a LIKE '%UR%'-style CASE on every view.
+CUTOFF_CATEGORY_ORDER = (('UR', 'GENERAL'), ('EWS',), ('OBC',), ('SC',), ('ST',))
+
+def cutoff_category_rank(category) -> int:
+    """1-based position of the first CUTOFF_CATEGORY_ORDER group found in `category` (case-insensitive substring); others rank last."""
+    text = str(category or '').upper()
+    return next((rank for rank, keys in enumerate(CUTOFF_CATEGORY_ORDER, 1) if any(key in text for key in keys)), len(CUTOFF_CATEGORY_ORDER) + 1)
+
+# --- Data version ---
+# Every writer of job data bumps meta.data_version in the same transaction; the app keys its
+# rendered-response cache and ETags on it, so a bump is what makes new data visible.
+# data_changes remembers which jobs each version touched so open dashboards can refresh
+# just those rows (job_id ALL_JOBS = anything may have changed, e.g. new jobs were added).
+ALL_JOBS = 0
+DATA_CHANGES_KEEP = 1000  # Versions of change records kept for clients catching up
 
-print("Ensuring database schema is up-to-date...")
+def bump_data_version(conn: sqlite3.Connection, job_ids=None) -> int:
+    """Bumps the data version, recording `job_ids` (None: any job) as changed. Returns the new version."""
+    version = conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version' RETURNING value").fetchone()[0]
+    conn.execute("UPDATE meta SET value = ? WHERE key = 'data_updated_at'", (time.time(),))
+    conn.executemany("INSERT OR IGNORE INTO data_changes (version, job_id) VALUES (?, ?)", [(version, job_id) for job_id in (job_ids if job_ids is not None else [ALL_JOBS])])
+    conn.execute("DELETE FROM data_changes WHERE version <= ?", (version - DATA_CHANGES_KEEP,))
+    return version
+
+def changed_jobs_since(conn: sqlite3.Connection, since_version: int, version: int):
+    """Sorted ids of the jobs changed in versions (since_version, version], or None if that is unknown."""
+    if version - since_version > DATA_CHANGES_KEEP: return None
+    job_ids = {row[0] for row in conn.execute("SELECT job_id FROM data_changes WHERE version > ? AND version <= ?", (since_version, version))}
+    return None if ALL_JOBS in job_ids else sorted(job_ids)
+
+def read_meta(conn: sqlite3.Connection, *keys) -> dict:
+    return dict(conn.execute(f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(keys))})", keys).fetchall())
+
+def write_meta(conn: sqlite3.Connection, key: str, value):
+    conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+def read_data_version(conn: sqlite3.Connection) -> tuple:
+    """Returns (version, updated_at unix time)."""
+    meta = read_meta(conn, 'data_version', 'data_updated_at')
+    return int(meta.get('data_version', 0)), float(meta.get('data_updated_at', 0))
 
 # --- Create tables IF NOT EXISTS ---
 # We use IF NOT EXISTS to prevent overwriting existing tables and data.
 # The 'exam_name' is set to UNIQUE to prevent duplicate entries for the same exam.
+def ensure_schema(conn: sqlite3.Connection):
+    """Creates all tables on `conn` if missing. Safe to call on any existing DB."""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        post_name TEXT,
+        exam_name TEXT UNIQUE NOT NULL,
+        conducting_body TEXT, "group" TEXT, gazetted_status TEXT,
+        pay_level INTEGER, salary TEXT, eligibility TEXT, age_limit TEXT, pet_status TEXT,
+        application_start TEXT, application_end TEXT, exam_date TEXT,
+        official_website TEXT, application_fee TEXT,
+        vacancies TEXT,          -- Column for vacancy details
+        vacancies_year TEXT,   -- Column for the year of vacancy data
+        last_updated TEXT
+    )''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_specs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER UNIQUE NOT NULL,
+        nationality TEXT, age_limits TEXT, age_relax TEXT, edu_qual TEXT,
+        attempts TEXT, physical_std TEXT, last_updated TEXT,
+        FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    )''')
 
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS jobs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    post_name TEXT,
-    exam_name TEXT UNIQUE NOT NULL,
-    conducting_body TEXT, "group" TEXT, gazetted_status TEXT,
-    pay_level INTEGER, salary TEXT, eligibility TEXT, age_limit TEXT, pet_status TEXT,
-    application_start TEXT, application_end TEXT, exam_date TEXT,
-    official_website TEXT, application_fee TEXT,
-    vacancies TEXT,          -- Column for vacancy details
-    vacancies_year TEXT,   -- Column for the year of vacancy data
-    last_updated TEXT
-)''')
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS job_specs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    job_id INTEGER UNIQUE NOT NULL,
-    nationality TEXT, age_limits TEXT, age_relax TEXT, edu_qual TEXT,
-    attempts TEXT, physical_std TEXT, last_updated TEXT,
-    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
-)''')
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS exam_pattern (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    job_id INTEGER UNIQUE NOT NULL,
-    stages TEXT, num_papers TEXT, q_type TEXT, duration TEXT,
-    marking_scheme TEXT, last_updated TEXT,
-    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
-)''')
-
-cursor.execute('''
-CREATE TABLE IF NOT EXISTS job_cutoffs (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    job_id INTEGER, category TEXT, score TEXT, year TEXT,
-    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
-)''')
-
-print("   Tables verified/created with correct schema.")
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS exam_pattern (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER UNIQUE NOT NULL,
+        stages TEXT, num_papers TEXT, q_type TEXT, duration TEXT,
+        marking_scheme TEXT, last_updated TEXT,
+        FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    )''')
+
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS job_cutoffs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER, category TEXT, score TEXT, year TEXT,
+        category_rank INTEGER,   -- cutoff_category_rank(category)
+        FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    )''')
+    if 'category_rank' not in [row[1] for row in cursor.execute("PRAGMA table_info(job_cutoffs)")]:
+        conn.create_function('cutoff_category_rank', 1, cutoff_category_rank, deterministic=True)
+        cursor.execute("ALTER TABLE job_cutoffs ADD COLUMN category_rank INTEGER")
+        cursor.execute("UPDATE job_cutoffs SET category_rank = cutoff_category_rank(category)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_job_cutoffs_rank ON job_cutoffs (job_id, category_rank)")
+
+    # The scout upserts cutoffs on (job_id, category, year). Older DBs could hold duplicates
+    # from the delete/reinsert writer, so keep the newest row of each key before indexing.
+    # The index also lets the planner and the details page find a job's cutoffs without a scan.
+    if not cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_job_cutoffs_key'").fetchone():
+        cursor.execute("DELETE FROM job_cutoffs WHERE id NOT IN (SELECT MAX(id) FROM job_cutoffs GROUP BY job_id, category, year)")
+        cursor.execute("DROP INDEX IF EXISTS idx_job_cutoffs_job_id")
+        cursor.execute("CREATE UNIQUE INDEX idx_job_cutoffs_key ON job_cutoffs (job_id, category, year)")
+
+    # --- Cutoff history and trend aggregates (maintained by cutoff_trends.record_cutoffs) ---
+    # Append-only: every value the scout stored for a (job, category, year), numbered per key,
+    # with score/year parsed to numbers. Each write updates the aggregates of the series it touched.
+    history_exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'cutoff_history'").fetchone()
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS cutoff_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_id INTEGER NOT NULL, category TEXT NOT NULL, category_rank INTEGER,
+        year_text TEXT NOT NULL, score_text TEXT,   -- As stored in job_cutoffs
+        year INTEGER, score REAL,                   -- Parsed; NULL when the text holds no year/number
+        version INTEGER NOT NULL,                   -- 1, 2, ... per (job_id, category, year_text)
+        recorded_at TEXT NOT NULL,
+        FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+    )''')
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_cutoff_history_key ON cutoff_history (job_id, category, year_text, version)")
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS cutoff_trend_points (
+        job_id INTEGER NOT NULL, category TEXT NOT NULL, year INTEGER NOT NULL,
+        score REAL NOT NULL,   -- Latest numeric version for the year
+        yoy_delta REAL,        -- Change from the year before (NULL if that year is missing)
+        moving_avg REAL,       -- Mean over this year and the two before it (those on record)
+        PRIMARY KEY (job_id, category, year)
+    ) WITHOUT ROWID''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS cutoff_trends (
+        job_id INTEGER NOT NULL, category TEXT NOT NULL, category_rank INTEGER,
+        years INTEGER, first_year INTEGER, last_year INTEGER,
+        latest_score REAL, latest_delta REAL, moving_avg REAL,
+        min_score REAL, min_year INTEGER, max_score REAL, max_year INTEGER, mean_score REAL,
+        versions INTEGER,      -- History rows behind the series
+        updated_at TEXT,
+        points TEXT,           -- JSON copy of the series' cutoff_trend_points, what the trend endpoint serves
+        PRIMARY KEY (job_id, category)
+    ) WITHOUT ROWID''')
+    if not history_exists: backfill_cutoff_history(conn)
+    elif 'points' not in [row[1] for row in cursor.execute("PRAGMA table_info(cutoff_trends)")]:
+        cursor.execute("ALTER TABLE cutoff_trends ADD COLUMN points TEXT")
+        refresh_trends(conn)
+
+    # Keyset pagination/sorting and the dashboard filters
+    for key, expression in JOB_SORT_EXPRESSIONS.items():
+        if key != 'id': cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_sort_{key} ON jobs ({expression}, id)")
+    for column in ('conducting_body', '"group"', 'gazetted_status', 'pay_level'):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_jobs_{column.strip(chr(34))} ON jobs ({column})")
+
+    # --- Full-text search index (kept in sync by triggers) ---
+    search_index_exists = cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'job_search'").fetchone()
+    cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5({', '.join(SEARCH_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')")
+    for name, (event, job_id) in SEARCH_TRIGGERS.items():
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN
+            DELETE FROM job_search WHERE rowid = {job_id};
+            INSERT INTO job_search (rowid, {', '.join(SEARCH_COLUMNS)}) {SEARCH_DOC_SELECT} WHERE j.id = {job_id};
+        END''')
+    if not search_index_exists:
+        # Exam and post names weigh most when ranking; then rebuild from whatever is already stored
+        cursor.execute("INSERT INTO job_search (job_search, rank) VALUES ('rank', ?)", (f"bm25({', '.join(map(str, SEARCH_RANK_WEIGHTS))})",))
+        cursor.execute(f"INSERT INTO job_search (rowid, {', '.join(SEARCH_COLUMNS)}) {SEARCH_DOC_SELECT}")
+
+    # --- Key/value metadata (data version, scout progress) and per-version change records ---
+    cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+    cursor.executemany("INSERT OR IGNORE INTO meta (key, value) VALUES (?, ?)", [('data_version', 1), ('data_updated_at', time.time())])
+    cursor.execute("CREATE TABLE IF NOT EXISTS data_changes (version INTEGER NOT NULL, job_id INTEGER NOT NULL, PRIMARY KEY (version, job_id)) WITHOUT ROWID")
+
+    # --- Scout run state ---
+    # One row per scout run; a run stays 'running' until its queue is drained, so an
+    # interrupted run is resumed by the next scout process instead of re-planned.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scout_runs (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL DEFAULT 'running',   -- running | finished
+        started_at TEXT, finished_at TEXT
+    )''')
+
+    # Per-job work items of a run. Workers lease tasks, and expired leases are re-claimable.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS scout_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,
+        task_key TEXT NOT NULL,                    -- 'update:<job_id>' or 'discover'
+        task TEXT NOT NULL,                        -- update | discover
+        job_id INTEGER,
+        needs TEXT,                                -- JSON needs map from the planner
+        status TEXT NOT NULL DEFAULT 'pending',    -- pending | leased | done | failed
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        lease_owner TEXT, lease_expires REAL,
+        updated_at TEXT,
+        UNIQUE (run_id, task_key),
+        FOREIGN KEY (run_id) REFERENCES scout_runs(id) ON DELETE CASCADE
+    )''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_scout_queue_claim ON scout_queue (run_id, task, status)")
+    conn.commit()
 
 # --- Insert base jobs (using INSERT OR IGNORE) ---
 # This list contains the initial 12 jobs. They will only be added if they don't already exist.
 jobs_data = [('IAS Officer','UPSC CSE','UPSC','A','Gazetted',10,'₹56,100+','Any Graduation','21-32','No PET'), ('IPS Officer','UPSC CSE','UPSC','A','Gazetted',10,'₹56,100+','Any Graduation','21-32','PET Required'), ('IFS Officer','UPSC CSE','UPSC','A','Gazetted',10,'₹60,000+','Any Graduation','21-32','No PET'), ('RBI Grade B','RBI Grade B Exam','RBI','A','Gazetted',10,'₹70,000+','Graduation (50%+)','21-30','No PET'), ('SBI PO','SBI PO Exam','SBI','A','Gazetted',7,'₹40,000+','Any Graduation','21-30','No PET'), ('IBPS PO','IBPS PO Exam','IBPS','A','Gazetted',7,'₹35,000+','Any Graduation','20-30','No PET'), ('SSC CGL (AAO)','SSC CGL','SSC','B','Non-Gazetted',8,'₹45,000+','Any Graduation','18-32','No PET'), ('NDA Officer','NDA Exam','UPSC','A','Gazetted',10,'₹56,100+','10+2 (PCM)','16.5-19.5','PET Required'), ('ISRO Scientist','ISRO ICRB','ISRO','A','Gazetted',10,'₹60,000+','B.Tech/B.E (60%+)','21-35','No PET'), ('DRDO Scientist','DRDO Entry Test','DRDO','A','Gazetted',10,'₹60,000+','B.Tech/B.E (First Class)','21-28','No PET'), ('Railway Group A','UPSC ESE','UPSC','A','Gazetted',10,'₹56,100+','B.Tech/B.E','21-30','No PET'), ('LIC AAO','LIC AAO Exam','LIC','B','Non-Gazetted',8,'₹40,000+','Any Graduation','21-30','No PET')]
 
-inserted_count = 0
-for job in jobs_data:
-    try:
-        # Use INSERT OR IGNORE based on the UNIQUE exam_name
-        cursor.execute(
-            '''INSERT OR IGNORE INTO jobs (post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', job
-        )
-        if cursor.rowcount > 0:
-            inserted_count += 1
-            new_job_id = cursor.lastrowid
-            # Add empty rows to related tables only for brand new jobs so the scout knows to fill them later
-            cursor.execute("INSERT OR IGNORE INTO job_specs (job_id) VALUES (?)", (new_job_id,))
-            cursor.execute("INSERT OR IGNORE INTO exam_pattern (job_id) VALUES (?)", (new_job_id,))
-    except sqlite3.Error as e: print(f"DB Error inserting {job[1]}: {e}")
-
-if inserted_count > 0: print(f"Inserted {inserted_count} new base jobs.")
-else: print("Base jobs already exist.")
-
-conn.commit()
-conn.close()
-print("✅ Database setup complete. Schema verified/updated.")
+def seed_base_jobs(conn: sqlite3.Connection) -> int:
+    """Adds any missing base jobs (plus empty specs/pattern rows) and returns how many were inserted."""
+    cursor = conn.cursor()
+    inserted_count = 0
+    for job in jobs_data:
+        try:
+            # Use INSERT OR IGNORE based on the UNIQUE exam_name
+            cursor.execute(
+                '''INSERT OR IGNORE INTO jobs (post_name, exam_name, conducting_body, "group", gazetted_status, pay_level, salary, eligibility, age_limit, pet_status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', job
+            )
+            if cursor.rowcount > 0:
+                inserted_count += 1
+                new_job_id = cursor.lastrowid
+                # Add empty rows to related tables only for brand new jobs so the scout knows to fill them later
+                cursor.execute("INSERT OR IGNORE INTO job_specs (job_id) VALUES (?)", (new_job_id,))
+                cursor.execute("INSERT OR IGNORE INTO exam_pattern (job_id) VALUES (?)", (new_job_id,))
+        except sqlite3.Error as e: print(f"DB Error inserting {job[1]}: {e}")
+    if inserted_count: bump_data_version(conn)
+    conn.commit()
+    return inserted_count
+
+if __name__ == '__main__':
+    # --- Connect to DB (creates if not exists; switches it to WAL mode) ---
+    import db
+    conn = db.connect(DB_PATH)
+
+    print("Ensuring database schema is up-to-date...")
+    ensure_schema(conn)
+    print("   Tables verified/created with correct schema.")
+
+    inserted_count = seed_base_jobs(conn)
+    if inserted_count > 0: print(f"Inserted {inserted_count} new base jobs.")
+    else: print("Base jobs already exist.")
+
+    conn.close()
+    print("✅ Database setup complete. Schema verified/updated.")
@@ -0,0 +1,79 @@
+# db.py
+# --- Shared SQLite connection layer for the Flask app and the data scout ---
+# Every connection runs in WAL mode so a scout write never blocks dashboard reads, and the
+# app keeps a small pool so connections (and their prepared-statement caches) are reused.
+
+import queue
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+# --- Tuning ---
+BUSY_TIMEOUT_SECONDS = 30
+SYNCHRONOUS = 'NORMAL'             # Safe with WAL; fsyncs only at checkpoints
+MMAP_SIZE = 256 * 1024 * 1024      # Read pages straight from the OS page cache
+CACHE_SIZE_KIB = 16 * 1024         # Per connection page cache
+STATEMENT_CACHE_SIZE = 256         # Prepared statements kept per connection
+POOL_SIZE = 8
+
+def connect(path: str, readonly: bool = False, tuned: bool = True) -> sqlite3.Connection:
+    """Opens a connection with Row access and the WAL/read-optimized pragmas.
+
+    `readonly` sets query_only for connections that must never write (the dashboard).
+    `tuned=False` gives a plain sqlite3 connection, kept for before/after benchmarks.
+    """
+    if not tuned:
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode = WAL")  # Persistent: stored in the DB file after the first call
+    conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if readonly: conn.execute("PRAGMA query_only = ON")
+    return conn
+
+class ConnectionPool:
+    """Thread-safe pool of reusable connections to one database.
+
+    `acquire()` hands out an idle connection or opens a new one; `release()` keeps up to
+    `size` idle connections and closes the rest. A connection is only ever used by one
+    thread at a time, so it may move between the web server's threads.
+    """
+    def __init__(self, path: str, size: int = POOL_SIZE, readonly: bool = True, tuned: bool = True):
+        self.path = path; self.size = size; self.readonly = readonly; self.tuned = tuned
+        self.idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+
+    def acquire(self) -> sqlite3.Connection:
+        try: return self.idle.get_nowait()
+        except queue.Empty: return connect(self.path, readonly=self.readonly, tuned=self.tuned)
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction: conn.rollback()
+        if self.idle.qsize() < self.size: self.idle.put(conn)
+        else: conn.close()
+
+    def close(self):
+        while True:
+            try: self.idle.get_nowait().close()
+            except queue.Empty: return
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_pool(path: str) -> ConnectionPool:
+    """The shared pool for `path`, created with default settings on first use."""
+    with _pools_lock:
+        if path not in _pools: _pools[path] = ConnectionPool(path)
+        return _pools[path]
+
+def configure_pool(path: str, **options) -> ConnectionPool:
+    """Replaces the pool for `path` (closing the old one), e.g. configure_pool(path, size=0, tuned=False)."""
+    with _pools_lock:
+        old: Optional[ConnectionPool] = _pools.pop(path, None)
+        if old: old.close()
+        _pools[path] = ConnectionPool(path, **options)
+        return _pools[path]
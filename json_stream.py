@@ -0,0 +1,87 @@
+# json_stream.py
+# --- Incremental parser for the JSON arrays the model streams back ---
+# Text is fed in as it arrives and every top-level array element is returned the moment its
+# closing brace does, so the scout can write one exam while the rest are still generating.
+# Elements are parsed independently: a malformed one is skipped and counted instead of
+# failing the whole answer, and an answer cut off mid-element keeps every element before it.
+# Anything before the first '[' (prose, ```json fences, a {"exams": ...} wrapper) is ignored.
+
+import json
+from typing import Any, List, Tuple
+
+WHITESPACE = ' \t\r\n'
+
+class JsonArrayStream:
+    """Feed text with `feed()`, which returns the elements completed by that text.
+
+    After the last chunk: `started` is False if no array was ever opened, `complete` is True
+    once the closing ']' arrived, `skipped` counts elements that failed to parse and
+    `truncated` is True when the text ended inside an element.
+    """
+    def __init__(self):
+        self.buffer = ''; self.pos = 0
+        self.started = False; self.complete = False
+        self.depth = 0; self.in_string = False; self.escape = False
+        self.item_start = None  # Buffer offset of the element being read, if any
+        self.parsed = 0; self.skipped = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.started and not self.complete and self.item_start is not None
+
+    def _finish(self, end: int, items: List[Any]):
+        text = self.buffer[self.item_start:end].strip(); self.item_start = None
+        if not text: return  # e.g. the empty slot of a trailing comma
+        try: items.append(json.loads(text)); self.parsed += 1; return
+        except ValueError: pass
+        # Text stuck in front of an object (a "// comment", a stray label) costs only that text
+        brace = text.find('{')
+        try:
+            if brace <= 0: raise ValueError(text)
+            items.append(json.loads(text[brace:])); self.parsed += 1
+        except ValueError: self.skipped += 1
+
+    def feed(self, text: str) -> List[Any]:
+        items = []
+        if self.complete: return items
+        self.buffer += text
+        if not self.started:
+            opening = self.buffer.find('[', self.pos)
+            if opening < 0: self.pos = len(self.buffer); return items
+            self.started = True; self.depth = 1; self.pos = opening + 1
+
+        buffer = self.buffer; i = self.pos; n = len(buffer)
+        while i < n:
+            char = buffer[i]
+            if self.in_string:
+                if self.escape: self.escape = False
+                elif char == '\\': self.escape = True
+                elif char == '"': self.in_string = False
+            elif char == '"':
+                self.in_string = True
+                if self.depth == 1 and self.item_start is None: self.item_start = i
+            elif char in '{[':
+                if self.depth == 1 and self.item_start is None: self.item_start = i
+                self.depth += 1
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:  # End of the top-level array
+                    if self.item_start is not None: self._finish(i, items)
+                    self.complete = True; i += 1; break
+                if self.depth == 1 and self.item_start is not None and buffer[self.item_start] in '{[': self._finish(i + 1, items)
+            elif char == ',' and self.depth == 1:
+                if self.item_start is not None: self._finish(i, items)
+            elif self.depth == 1 and self.item_start is None and char not in WHITESPACE:
+                self.item_start = i  # Number, literal or stray text
+            i += 1
+
+        # Drop what has been consumed so the buffer only ever holds the element in progress
+        keep = self.item_start if self.item_start is not None else i
+        self.buffer = buffer[keep:]; self.pos = i - keep
+        if self.item_start is not None: self.item_start = 0
+        return items
+
+def parse_array(text: str) -> Tuple[List[Any], JsonArrayStream]:
+    """Parses a whole response at once: (elements, the stream for its skipped/complete flags)."""
+    stream = JsonArrayStream()
+    return stream.feed(text), stream
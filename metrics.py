@@ -0,0 +1,165 @@
+# metrics.py
+# --- Timing spans, counters and histograms shared by the scout and the web server ---
+# One in-process registry per process. A span times a block (or a @timed function) into the
+# `span_seconds` histogram and adds its numeric attributes (bytes, items, rows) to
+# `span_<attr>_total` counters. When a JSON-lines sink is open, every span and every direct
+# observe() is also written as one line.
+# `render()` produces the Prometheus text format; the web server serves it at /metrics and the
+# scout, a separate process, leaves the same text in a snapshot file that /metrics appends.
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DEFAULT_PREFIX = 'gjt_'
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _label_text(labels: Labels, extra: str = '') -> str:
+    escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    parts = [f'{key}="{escape(value)}"' for key, value in labels] + ([extra] if extra else [])
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets; self.counts = [0] * len(buckets); self.sum = 0.0; self.count = 0
+
+    def observe(self, value: float):
+        self.sum += value; self.count += 1
+        for n, bound in enumerate(self.buckets):
+            if value <= bound: self.counts[n] += 1; break
+
+class Span:
+    """A timed block; `set()` attaches attributes (numbers also feed span_<attr>_total counters)."""
+    __slots__ = ('registry', 'name', 'labels', 'attrs', 'start')
+
+    def __init__(self, registry: 'Registry', name: str, labels: Dict[str, Any]):
+        self.registry = registry; self.name = name; self.labels = labels; self.attrs = {}; self.start = 0.0
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> 'Span':
+        self.start = time.perf_counter(); return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.finish(self, time.perf_counter() - self.start, exc_type is not None)
+        return False
+
+class Registry:
+    """Thread-safe store of histograms and counters, keyed by metric name and label set."""
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.help: Dict[str, str] = {}
+        self.sink = None; self.sink_fields: Dict[str, Any] = {}
+
+    def observe(self, name: str, value: float, help: str = '', **labels):
+        """Adds `value` to a histogram (and logs it when a JSON-lines sink is open)."""
+        self._observe(name, value, help, labels)
+        if self.sink is not None: self._log({'metric': name, **labels, 'value': round(value, 6)})
+
+    def _observe(self, name: str, value: float, help: str, labels: Dict[str, Any]):
+        with self.lock:
+            if help: self.help.setdefault(name, help)
+            series = self.histograms.setdefault(name, {}); key = _labels(labels)
+            if key not in series: series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+
+    def _log(self, record: Dict[str, Any]):
+        line = json.dumps({'ts': round(time.time(), 6), **self.sink_fields, **record}, default=str)
+        with self.lock:
+            if self.sink is not None: self.sink.write(line + '\n')
+
+    def inc(self, name: str, value: float = 1, help: str = '', **labels):
+        with self.lock:
+            if help: self.help.setdefault(name, help)
+            series = self.counters.setdefault(name, {}); key = _labels(labels)
+            series[key] = series.get(key, 0) + value
+
+    def span(self, name: str, **labels) -> Span:
+        return Span(self, name, labels)
+
+    def timed(self, name: Optional[str] = None, **labels):
+        """Decorator form of span() (defaults to the function's name)."""
+        def decorate(fn):
+            span_name = name or fn.__name__
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with Span(self, span_name, labels): return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def finish(self, span: Span, seconds: float, error: bool):
+        labels = {'span': span.name, **span.labels}
+        self._observe('span_seconds', seconds, "Duration of instrumented code paths.", labels)
+        for key, value in span.attrs.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool): self.inc(f'span_{key}_total', value, f"Sum of the '{key}' attribute over spans.", span=span.name)
+        if error: self.inc('span_errors_total', 1, "Spans that ended in an exception.", span=span.name)
+        if self.sink is not None: self._log({**labels, 'seconds': round(seconds, 6), **span.attrs, **({'error': True} if error else {})})
+
+    # --- Export ---
+    def open_jsonl(self, path: str, **fields):
+        """Appends one JSON line per finished span to `path`; `fields` go on every line."""
+        self.close_jsonl()
+        with self.lock: self.sink = open(path, 'a', buffering=1, encoding='utf-8'); self.sink_fields = dict(fields)
+
+    def close_jsonl(self):
+        with self.lock:
+            if self.sink is not None: self.sink.close(); self.sink = None
+
+    def render(self, prefix: str = DEFAULT_PREFIX) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        lines = []
+        with self.lock:
+            for name, series in sorted(self.histograms.items()):
+                metric = prefix + name
+                if name in self.help: lines.append(f"# HELP {metric} {self.help[name]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for labels, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count; lines.append(f"{metric}_bucket{_label_text(labels, 'le=' + json.dumps(_number(bound)))} {cumulative}")
+                    lines.append(f"{metric}_bucket{_label_text(labels, 'le=' + json.dumps('+Inf'))} {histogram.count}")
+                    lines.append(f"{metric}_sum{_label_text(labels)} {histogram.sum!r}")
+                    lines.append(f"{metric}_count{_label_text(labels)} {histogram.count}")
+            for name, series in sorted(self.counters.items()):
+                metric = prefix + name
+                if name in self.help: lines.append(f"# HELP {metric} {self.help[name]}")
+                lines.append(f"# TYPE {metric} counter")
+                for labels, value in sorted(series.items()): lines.append(f"{metric}{_label_text(labels)} {_number(value)}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def write_prometheus(self, path: str, prefix: str = DEFAULT_PREFIX):
+        """Writes render() to `path` atomically, for readers in another process."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f: f.write(self.render(prefix))
+        os.replace(tmp_path, path)
+
+    def summary(self, limit: int = 10) -> str:
+        """The `limit` spans with the most total time: name, calls, total and mean seconds."""
+        with self.lock:
+            rows = [(dict(labels)['span'], h.count, h.sum) for labels, h in self.histograms.get('span_seconds', {}).items()]
+        totals: Dict[str, list] = {}
+        for name, count, total in rows:
+            entry = totals.setdefault(name, [0, 0.0]); entry[0] += count; entry[1] += total
+        top = sorted(totals.items(), key=lambda item: item[1][1], reverse=True)[:limit]
+        return '\n'.join(f"   {name:<24} {count:>7} calls {total:9.3f}s total {total / count * 1000:9.2f} ms avg" for name, (count, total) in top)
+
+registry = Registry()
+span = registry.span
+timed = registry.timed
+observe = registry.observe
+inc = registry.inc
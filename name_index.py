@@ -0,0 +1,118 @@
+# name_index.py
+# --- Indexed exam-name matching for the data scout ---
+# Gives the same answers as the original find_best_match() scans (exact, then difflib at a
+# 0.8 cutoff, then a unique substring), but each tier is an index lookup built once:
+#   exact      hash map of lower-cased names
+#   fuzzy      difflib's ratio() never exceeds quick_ratio(), the share of characters two
+#              names have in common. Characters are indexed as (char, occurrence) tokens per
+#              name length, so counting shared tokens *is* quick_ratio. A name of length b
+#              must share c*(a+b)/2 tokens to reach the cutoff, so only the query's rarest
+#              tokens beyond that are probed (prefix filtering); ratio() then runs
+#              best-bound-first on the few candidates that survive.
+#   substring  trigram postings: a name containing the query contains all of its trigrams
+
+import difflib
+import itertools
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+FUZZY_CUTOFF = 0.8
+COUNT_WINDOW = 2  # Tokens counted per candidate, as a multiple of the probed prefix
+
+def char_tokens(text: str) -> List[Tuple[str, int]]:
+    """(char, n) for the n-th occurrence of each character: multiset overlap becomes set overlap."""
+    seen = Counter(); tokens = []
+    for char in text: seen[char] += 1; tokens.append((char, seen[char]))
+    return tokens
+
+def trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class NameIndex:
+    """Match index over a list of candidate names (e.g. the exam names in one API answer).
+
+    `match(name)` returns {'name', 'index', 'candidate', 'score', 'reason'} where reason is
+    'exact', 'fuzzy', 'substring' or 'none'; `index` points into the original list and, as
+    before, is the first candidate with the winning name.
+    """
+    def __init__(self, candidates: List[str], cutoff: float = FUZZY_CUTOFF):
+        self.candidates = [str(name or '') for name in candidates]; self.cutoff = cutoff
+        self.lowered = [name.lower() for name in self.candidates]
+        self.exact: Dict[str, int] = {}
+        self.first_index: Dict[str, int] = {}
+        for i, (name, lowered) in enumerate(zip(self.candidates, self.lowered)):
+            self.exact.setdefault(lowered, i); self.first_index.setdefault(name, i)
+
+        # Fuzzy tier works on distinct original-case names, like difflib does
+        self.names = list(self.first_index)
+        self.lengths = [len(name) for name in self.names]
+        self.token_ids: Dict[Tuple[str, int], int] = {}  # Small ints hash far faster than tuples
+        self.token_sets = [frozenset(self.token_ids.setdefault(token, len(self.token_ids)) for token in char_tokens(name)) for name in self.names]
+        self.char_postings: Dict[int, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))  # length -> token -> names
+        self.token_frequency = Counter()
+        for n, tokens in enumerate(self.token_sets):
+            for token in tokens: self.char_postings[self.lengths[n]][token].append(n)
+            self.token_frequency.update(tokens)
+
+        self.trigram_postings: Dict[str, List[int]] = defaultdict(list)
+        for i, lowered in enumerate(self.lowered):
+            for gram in trigrams(lowered): self.trigram_postings[gram].append(i)
+
+    def find_exact(self, name: str) -> Optional[int]:
+        return self.exact.get(name.lower())
+
+    def find_fuzzy(self, name: str) -> Optional[Tuple[int, float]]:
+        """(index, ratio) of the candidate difflib.get_close_matches(name, candidates, n=1, cutoff) picks, or None."""
+        a = len(name); cutoff = self.cutoff
+        if not a or not self.names: return None
+        # Rarest first; tokens no candidate has (id -1) are shared by nobody and sort first
+        tokens = sorted((self.token_ids.get(token, -1) for token in char_tokens(name)), key=self.token_frequency.__getitem__)
+
+        bounded = []  # (quick_ratio, n) of names passing difflib's two cheap filters
+        for b, postings in self.char_postings.items():
+            if 2.0 * (a if a < b else b) / (a + b) < cutoff: continue  # real_quick_ratio
+            # Rounded down so float edge cases only ever probe more, never less
+            must_share = max(0, math.floor(cutoff * (a + b) / 2 - 1e-6))
+            split = a - must_share + 1; window = min(a, split * COUNT_WINDOW)
+            candidates = Counter(itertools.chain.from_iterable(postings.get(token, ()) for token in tokens[:split]))
+            # Hits over the next few rare tokens too, so most candidates fail the bound without a set intersection
+            more = Counter(itertools.chain.from_iterable(postings.get(token, ()) for token in tokens[split:window])); rest = tokens[window:]
+            for n, probe_hits in candidates.items():
+                counted = probe_hits + more[n]
+                if 2.0 * (counted + len(rest)) / (a + b) < cutoff: continue
+                quick = 2.0 * (counted + len(self.token_sets[n].intersection(rest))) / (a + b)
+                if quick >= cutoff: bounded.append((quick, n))
+
+        matcher = difflib.SequenceMatcher(); matcher.set_seq2(name); best = None
+        for quick, n in sorted(bounded, reverse=True):
+            if best and quick < best[0]: break  # quick_ratio bounds ratio: nothing left can win
+            matcher.set_seq1(self.names[n]); ratio = matcher.ratio()
+            if ratio >= cutoff and (best is None or (ratio, self.names[n]) > best): best = (ratio, self.names[n])
+        return (self.first_index[best[1]], best[0]) if best else None
+
+    def find_substring(self, name: str) -> Optional[int]:
+        """Index of the only candidate containing `name` (case-insensitive), or None if none or several do."""
+        lowered = name.lower(); grams = trigrams(lowered)
+        if grams:
+            rarest = min(grams, key=lambda gram: len(self.trigram_postings.get(gram, ())))
+            pool = self.trigram_postings.get(rarest, ())
+        else: pool = range(len(self.lowered))  # Under three characters: nothing to index on
+        found = list(itertools.islice((i for i in pool if lowered in self.lowered[i]), 2))
+        return found[0] if len(found) == 1 else None
+
+    def match(self, name: str) -> Dict[str, object]:
+        index, score, reason = self.find_exact(name), 1.0, 'exact'
+        if index is None:
+            fuzzy = self.find_fuzzy(name)
+            if fuzzy: (index, score), reason = fuzzy, 'fuzzy'
+        if index is None:
+            index = self.find_substring(name)
+            if index is not None: score, reason = len(name) / max(len(self.candidates[index]), 1), 'substring'
+        if index is None: score, reason = 0.0, 'none'
+        return {'name': name, 'index': index, 'candidate': self.candidates[index] if index is not None else None, 'score': score, 'reason': reason}
+
+def match_many(names: List[str], candidates: List[str], cutoff: float = FUZZY_CUTOFF) -> List[Dict[str, object]]:
+    """Matches every name against `candidates` with one shared NameIndex; results are in `names` order."""
+    index = NameIndex(candidates, cutoff)
+    return [index.match(name) for name in names]
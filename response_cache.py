@@ -0,0 +1,85 @@
+# response_cache.py
+# --- Persistent on-disk cache for Gemini responses (TTL + size-bounded LRU) ---
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key over any JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed key/value store for model answers.
+
+    Entries older than `ttl_seconds` are treated as misses and removed. When the stored
+    payloads exceed `max_bytes`, the least recently read entries are evicted first.
+    Safe to share between the scout's worker threads.
+    """
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int, cache_only: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.cache_only = cache_only  # Never call the model; serve what the cache has
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'exam_hits': 0, 'exam_misses': 0, 'writes': 0, 'expired': 0, 'evicted': 0}
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+        self.conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - ttl_seconds,))
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str, kind: str = '', ttl_seconds: Optional[float] = None) -> Optional[Any]:
+        """Returns the decoded value or None. `kind` ('' or 'exam_') picks which counters to bump;
+        `ttl_seconds` overrides the cache-wide TTL for entries that go stale sooner."""
+        now = time.time(); ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self.lock:
+            row = self.conn.execute("SELECT value, size, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row and row[2] < now - ttl_seconds:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,)); self.conn.commit()
+                self.total_bytes -= row[1]; self.stats['expired'] += 1; row = None
+            if not row: self.stats[f'{kind}misses'] += 1; return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)); self.conn.commit()
+            self.stats[f'{kind}hits'] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode('utf-8')); now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self.conn.execute('''INSERT INTO responses (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, created_at = excluded.created_at, accessed_at = excluded.accessed_at''',
+                (key, payload, size, now, now))
+            self.total_bytes += size - (old[0] if old else 0); self.stats['writes'] += 1
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drops least recently read entries until the cache fits in `max_bytes`. Caller holds the lock."""
+        while self.total_bytes > self.max_bytes:
+            victims = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 50").fetchall()
+            if not victims: self.total_bytes = 0; break
+            for key, size in victims:
+                if self.total_bytes <= self.max_bytes: break
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size; self.stats['evicted'] += 1
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"{s['hits']} batch hits / {s['misses']} misses, {s['exam_hits']} per-exam hits / {s['exam_misses']} misses, "
+                f"{s['writes']} writes, {s['expired']} expired, {s['evicted']} evicted ({self.total_bytes / 1024:.0f} KiB stored)")
+
+    def close(self):
+        with self.lock: self.conn.close()